@@ -0,0 +1,287 @@
+# batch_evaluate.py
+"""
+저장된 배치(JSONL)를 pygame 없이 일괄 평가합니다 (점수 보정용).
+
+입력 한 줄 = 배치 1개:
+    {"id": "a1", "request_text": "...", "wishlist": ["책장", "화분"], "persona": "이름(선택)",
+     "room": [10, 8], "door": [0, 3],
+     "placements": [{"name": "책장", "size": [1, 2], "grid_pos": [0, 0], "rotation": 0}, ...]}
+
+- 사실 데이터 / 규칙 기반 점수: 프로세스 풀에서 계산
+- LLM 단계(describe / judge / feedback): 동시 요청 수를 제한해 ModelManager로 호출
+- 결과는 끝나는 대로 출력 JSONL에 한 줄씩 기록하며, 다시 실행하면 이미 기록된 id는 건너뜁니다 (이어하기)
+
+    python -m bench.batch_evaluate layouts.jsonl results.jsonl --concurrency 8
+    python -m bench.batch_evaluate layouts.jsonl --make-sample 200   # 무작위 입력 생성
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+import config
+from modules import client, evaluation
+from modules.design_facts import DesignFacts
+from modules.model import ModelManager
+from templates.personas import PERSONAS
+
+STAGES = ["describe", "judge", "feedback"]
+
+# --- 입력 / 이어하기 ---
+def read_records(path: str) -> list:
+    """입력 JSONL을 읽습니다. id가 없으면 줄 번호를 id로 사용합니다."""
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            record.setdefault('id', str(line_no))
+            records.append(record)
+    return records
+
+def read_done_ids(path: str) -> set:
+    """출력 JSONL에 이미 기록된 id (중간에 끊긴 마지막 줄은 무시)."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                done.add(str(json.loads(line)['id']))
+            except (json.JSONDecodeError, KeyError):
+                continue
+    return done
+
+def to_placed_furniture(record: dict) -> list:
+    """입력의 placements를 게임과 같은 placed_furniture 형식으로 바꿉니다."""
+    placed = []
+    for p in record.get('placements', []):
+        item = {"name": p['name'], "size": tuple(p.get('size', (1, 1)))}
+        if 'base_size' in p:
+            item['base_size'] = tuple(p['base_size'])
+        placed.append({"item": item, "grid_pos": tuple(p['grid_pos']), "rotation": p.get('rotation', 0)})
+    return placed
+
+# --- 1단계: 사실 데이터 (프로세스 풀 작업자) ---
+def compute_facts(record: dict) -> dict:
+    """(작업자 프로세스) 사실 데이터, 위시리스트 누락, 규칙 기반 점수를 계산합니다."""
+    start = time.perf_counter()
+    room_width, room_height = record.get('room', (config.ROOM_WIDTH_GRID, config.ROOM_HEIGHT_GRID))
+    placed = to_placed_furniture(record)
+    wishlist = record.get('wishlist', [])
+
+    facts = DesignFacts.from_layout(placed, room_width, room_height).report()
+    penalty, missing = evaluation._wishlist_penalty(wishlist, placed)
+    rule_score = evaluation.rule_based_score(wishlist, placed, room_width, room_height)
+
+    return {
+        "record": record,
+        "facts": facts,
+        "penalty": penalty,
+        "missing": missing,
+        "rule_score": rule_score,
+        "facts_ms": (time.perf_counter() - start) * 1000.0,
+    }
+
+# --- 2단계: LLM ---
+def find_persona(record: dict) -> dict:
+    name = record.get('persona')
+    for persona in PERSONAS:
+        if persona['name'] == name:
+            return persona
+    return random.Random(str(record['id'])).choice(PERSONAS)
+
+def evaluate_record(model_manager: ModelManager, prepared: dict, stages: list) -> dict:
+    """(LLM 스레드) 요청한 단계를 실행하고 출력 레코드를 만듭니다."""
+    record = prepared['record']
+    request_text = record.get('request_text', "")
+    wishlist = record.get('wishlist', [])
+    latency = {"facts": prepared['facts_ms']}
+    output = {"id": record['id'], "rule_score": prepared['rule_score'], "missing": prepared['missing']}
+
+    def timed(stage, fn):
+        start = time.perf_counter()
+        value = fn()
+        latency[stage] = (time.perf_counter() - start) * 1000.0
+        return value
+
+    judge = None
+    if "judge" in stages:
+        judge = timed("judge", lambda: evaluation.judge_design(model_manager, request_text, wishlist, prepared['facts']))
+    if judge is not None:
+        output.update(judge_score=judge.score, judge_variance=judge.variance, judge_samples=judge.samples,
+                      judge_missing=judge.missing, notes=judge.notes)
+        output['score'] = max(0.0, judge.score - prepared['penalty'])
+    else:
+        output['score'] = prepared['rule_score']
+    output['fallback'] = judge is None
+
+    if "describe" in stages:
+        room_width, room_height = record.get('room', (config.ROOM_WIDTH_GRID, config.ROOM_HEIGHT_GRID))
+        output['description'] = timed("describe", lambda: evaluation.describe_design(
+            model_manager, to_placed_furniture(record), room_width, room_height, design_facts=prepared['facts'],
+            request_text=request_text
+        ))
+    if "feedback" in stages:
+        output['feedback'] = timed("feedback", lambda: client.generate_feedback(
+            model_manager, find_persona(record), request_text, wishlist, prepared['facts'], output['score']
+        ))
+
+    output['latency_ms'] = latency
+    return output
+
+# --- 실행 ---
+def run_batch(model_manager, records: list, output_path: str, stages: list, concurrency: int, workers: int, chunksize: int = 16) -> dict:
+    """
+    사실 데이터를 프로세스 풀에서 계산하는 대로 LLM 단계에 넘기고 (동시 concurrency개),
+    끝난 결과를 출력 파일에 바로 기록합니다. 처리량 / 단계별 지연 통계를 반환합니다.
+    """
+    write_lock = threading.Lock()
+    in_flight = threading.BoundedSemaphore(concurrency * 2) # 사실 데이터가 LLM보다 너무 앞서 쌓이지 않도록
+    latencies = {stage: [] for stage in ["facts"] + STAGES}
+    counts = {"done": 0, "errors": 0, "fallback": 0}
+    wall_start = time.perf_counter()
+
+    def finish(future):
+        in_flight.release()
+        try:
+            output = future.result()
+        except Exception as e:
+            print(f"🚨 평가 실패: {e}", file=sys.stderr)
+            with write_lock:
+                counts['errors'] += 1
+            return
+        with write_lock:
+            out_file.write(json.dumps(output, ensure_ascii=False) + "\n")
+            out_file.flush()
+            counts['done'] += 1
+            counts['fallback'] += output['fallback']
+            for stage, ms in output['latency_ms'].items():
+                latencies[stage].append(ms)
+            if counts['done'] % 50 == 0:
+                elapsed = time.perf_counter() - wall_start
+                print(f"  {counts['done']}/{len(records)} ({counts['done'] / elapsed:.1f}개/초)", file=sys.stderr)
+
+    with open(output_path, 'a', encoding='utf-8') as out_file, \
+         ProcessPoolExecutor(max_workers=workers) as facts_pool, \
+         ThreadPoolExecutor(max_workers=concurrency) as llm_pool:
+        for prepared in facts_pool.map(compute_facts, records, chunksize=chunksize):
+            in_flight.acquire()
+            llm_pool.submit(evaluate_record, model_manager, prepared, stages).add_done_callback(finish)
+        llm_pool.shutdown(wait=True)
+
+    wall = time.perf_counter() - wall_start
+    llm_seconds = sum(sum(latencies[stage]) for stage in STAGES) / 1000.0
+    return {
+        "layouts": len(records),
+        "done": counts['done'],
+        "errors": counts['errors'],
+        "fallback": counts['fallback'],
+        "wall_seconds": wall,
+        "layouts_per_sec": counts['done'] / wall if wall > 0 else 0.0,
+        # LLM 슬롯(동시 요청 수) 중 실제로 요청을 기다리며 쓰인 비율
+        "llm_slot_utilization": llm_seconds / (wall * concurrency) if wall > 0 else 0.0,
+        "stage_latency_ms": {
+            stage: {
+                "n": len(samples),
+                "p50": float(np.percentile(samples, 50)),
+                "p95": float(np.percentile(samples, 95)),
+                "mean": float(np.mean(samples)),
+            }
+            for stage, samples in latencies.items() if samples
+        },
+    }
+
+def make_sample(path: str, count: int, seed: int = 0):
+    """무작위 배치 count개를 입력 형식으로 저장합니다."""
+    from .benchmark import random_layout # 벤치마크와 같은 무작위 배치 생성기
+
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            layout = random_layout(rng, rng.randint(1, 10))
+            record = {
+                "id": f"sample-{i}",
+                "request_text": "편안히 쉴 수 있는 공간이 필요해요.",
+                "wishlist": rng.sample(client.FURNITURE_LIST_AS_LIST, rng.randint(3, 5)),
+                "persona": rng.choice(PERSONAS)['name'],
+                "placements": [
+                    {"name": p['item']['name'], "size": list(p['item']['size']), "base_size": list(p['item']['base_size']),
+                     "grid_pos": list(p['grid_pos']), "rotation": p['rotation']}
+                    for p in layout
+                ],
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"샘플 입력 {count}개 저장: {path}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="저장된 배치 일괄 평가 (pygame 없이)")
+    parser.add_argument('input', help="입력 JSONL (배치 + 의뢰서 + 위시리스트)")
+    parser.add_argument('output', nargs='?', help="결과 JSONL (이미 있으면 이어서 기록)")
+    parser.add_argument('--stages', default="judge", help=f"실행할 LLM 단계, 쉼표로 구분 ({', '.join(STAGES)})")
+    parser.add_argument('--concurrency', type=int, default=4, help="동시 LLM 평가 수")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help="사실 데이터 계산 프로세스 수")
+    parser.add_argument('--host', help="Ollama 서버 URL, 쉼표로 여러 개 (기본: 환경 변수 설정)")
+    parser.add_argument('--limit', type=int, help="앞에서부터 이 개수만 평가")
+    parser.add_argument('--judge-samples', type=int, help="AI 평가자 자기 일관성 샘플 수 (기본: config.JUDGE_SAMPLES)")
+    parser.add_argument('--no-cache', action='store_true', help="LLM 응답 캐시 끄기")
+    parser.add_argument('--verbose', action='store_true', help="평가 함수의 로그 출력 표시")
+    parser.add_argument('--make-sample', type=int, metavar='N', help="무작위 입력 N개를 input 경로에 만들고 종료")
+    parser.add_argument('--json', help="요약 통계를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    if args.make_sample:
+        make_sample(args.input, args.make_sample)
+        return 0
+    if not args.output:
+        parser.error("output 경로가 필요합니다.")
+
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"알 수 없는 단계: {', '.join(sorted(unknown))}")
+    if args.no_cache:
+        config.RESPONSE_CACHE_ENABLED = False
+    if args.judge_samples:
+        config.JUDGE_SAMPLES = args.judge_samples
+
+    records = read_records(args.input)[:args.limit]
+    done_ids = read_done_ids(args.output)
+    pending = [r for r in records if str(r['id']) not in done_ids]
+    print(f"입력 {len(records)}개 중 {len(records) - len(pending)}개는 이미 완료, {len(pending)}개 평가", file=sys.stderr)
+    if not pending:
+        return 0
+
+    hosts = [h.strip() for h in args.host.split(',')] if args.host else None
+    with contextlib.redirect_stdout(io.StringIO()):
+        model_manager = ModelManager(hosts=hosts)
+    if not model_manager.is_ready:
+        print("🚨 모델 서버에 연결하지 못했습니다. 규칙 기반 점수만 기록합니다.", file=sys.stderr)
+
+    log_target = sys.stdout if args.verbose else io.StringIO()
+    with contextlib.redirect_stdout(log_target):
+        summary = run_batch(model_manager, pending, args.output, stages, args.concurrency, args.workers)
+    summary["endpoints"] = model_manager.endpoint_stats()
+    if model_manager.cache:
+        summary["response_cache"] = model_manager.cache_stats()
+
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    model_manager.close()
+    return 0 if summary['errors'] == 0 else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,212 @@
+# benchmark.py
+"""
+평가 파이프라인 지연 시간 벤치마크.
+로컬 Ollama 스텁 서버(또는 --host로 지정한 실제 서버)를 대상으로
+ModelManager 호출, generate_request, 평가->피드백 전체 경로를 반복 실행하고
+p50/p95/p99 지연 시간과 처리량을 보고합니다.
+
+    python -m bench.benchmark --iterations 50 --concurrency 4
+    python -m bench.benchmark --host http://localhost:11434 --scenarios evaluate
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import config
+from modules import client, evaluation
+from modules.model import ModelManager
+from templates.personas import PERSONAS
+from .stub_server import StubConfig, start_stub_server
+
+SCENARIOS = ["chat", "embed", "request", "evaluate", "evaluate_dag", "evaluate_single"]
+
+def random_layout(rng: random.Random, count: int) -> list:
+    """pygame 없이 평가에 필요한 필드만 가진 무작위 가구 배치를 만듭니다."""
+    layout = []
+    for _ in range(count):
+        size = rng.choice([(1, 1), (2, 1), (1, 2), (2, 2), (2, 3)])
+        layout.append({
+            "item": {"name": rng.choice(client.FURNITURE_LIST_AS_LIST), "size": size, "base_size": (size[0], 1)},
+            "grid_pos": (rng.randrange(config.ROOM_WIDTH_GRID), rng.randrange(config.ROOM_HEIGHT_GRID)),
+            "rotation": rng.choice([0, 1]),
+        })
+    return layout
+
+def make_scenario(name: str, model_manager: ModelManager, seed: int):
+    """시나리오 이름에 해당하는 '1회 실행' 함수를 반환합니다."""
+    rng = random.Random(seed)
+
+    if name == "chat":
+        return lambda i: model_manager.get_chat_response("당신은 고객입니다.", f"의뢰서를 작성하세요. #{i}")
+
+    if name == "embed":
+        return lambda i: model_manager.get_embedding(f"책 읽는 걸 좋아해요 #{i}")
+
+    if name == "request":
+        return lambda i: client.generate_request(model_manager)
+
+    if name == "evaluate":
+        # 직렬 기준 경로: 단계를 하나씩 실행하고 피드백은 평가가 끝난 뒤 생성 (evaluate_dag와 비교용)
+        def run_evaluate(i):
+            persona = rng.choice(PERSONAS)
+            wishlist = rng.sample(client.FURNITURE_LIST_AS_LIST, 3)
+            request_text = f"편안히 쉴 수 있는 공간이 필요해요. #{i}"
+            layout = random_layout(rng, rng.randint(1, 8))
+            eval_data = evaluation.evaluate_design(
+                model_manager, request_text, wishlist, layout,
+                config.ROOM_WIDTH_GRID, config.ROOM_HEIGHT_GRID, parallel=False
+            )
+            return client.generate_feedback(
+                model_manager, persona, request_text, wishlist,
+                eval_data['description'], eval_data['score']
+            )
+        return run_evaluate
+
+    if name == "evaluate_dag":
+        # 묘사 || (점수 -> 피드백) 단계 그래프 (게임에서 사용하는 경로)
+        def run_evaluate_dag(i):
+            persona = rng.choice(PERSONAS)
+            wishlist = rng.sample(client.FURNITURE_LIST_AS_LIST, 3)
+            request_text = f"편안히 쉴 수 있는 공간이 필요해요. #{i}"
+            layout = random_layout(rng, rng.randint(1, 8))
+            eval_data = evaluation.evaluate_with_feedback(
+                model_manager, persona, request_text, wishlist, layout,
+                config.ROOM_WIDTH_GRID, config.ROOM_HEIGHT_GRID
+            )
+            return eval_data['description'], eval_data['feedback']
+        return run_evaluate_dag
+
+    if name == "evaluate_single":
+        # 묘사/점수/피드백 단일 호출 (evaluate 시나리오와 비교용)
+        def run_evaluate_single(i):
+            persona = rng.choice(PERSONAS)
+            wishlist = rng.sample(client.FURNITURE_LIST_AS_LIST, 3)
+            request_text = f"편안히 쉴 수 있는 공간이 필요해요. #{i}"
+            layout = random_layout(rng, rng.randint(1, 8))
+            return evaluation.evaluate_design_single_pass(
+                model_manager, persona, request_text, wishlist, layout,
+                config.ROOM_WIDTH_GRID, config.ROOM_HEIGHT_GRID
+            )
+        return run_evaluate_single
+
+    raise ValueError(f"알 수 없는 시나리오: {name}")
+
+def _is_success(result) -> bool:
+    """ModelManager는 오류를 예외 대신 '🚨' 문자열 / 빈 리스트 / None 으로 돌려줍니다."""
+    if isinstance(result, tuple):
+        return all(_is_success(r) for r in result)
+    if isinstance(result, str):
+        return "🚨" not in result
+    return bool(result)
+
+def run_scenario(run_once, iterations: int, concurrency: int) -> dict:
+    """run_once를 iterations번 실행(동시 concurrency개)하고 지연 시간 통계를 반환합니다."""
+    latencies = []
+    errors = 0
+
+    def timed(i):
+        start = time.perf_counter()
+        try:
+            result = run_once(i)
+            error = None if _is_success(result) else "failed"
+            return time.perf_counter() - start, error
+        except Exception as e:
+            return time.perf_counter() - start, e
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for latency, error in pool.map(timed, range(iterations)):
+            latencies.append(latency)
+            if error is not None:
+                errors += 1
+    wall = time.perf_counter() - wall_start
+
+    samples = np.array(latencies) * 1000.0
+    return {
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "errors": errors,
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p95_ms": float(np.percentile(samples, 95)),
+        "p99_ms": float(np.percentile(samples, 99)),
+        "mean_ms": float(samples.mean()),
+        "throughput_per_sec": iterations / wall if wall > 0 else 0.0,
+    }
+
+def print_report(results: dict):
+    print(f"{'scenario':<16} {'n':>5} {'conc':>5} {'err':>4} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'ops/s':>8}")
+    for name, r in results.items():
+        print(f"{name:<16} {r['iterations']:>5} {r['concurrency']:>5} {r['errors']:>4} "
+              f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['throughput_per_sec']:>8.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="평가 파이프라인 지연 시간 벤치마크")
+    parser.add_argument('--host', help="실제 Ollama 서버 URL, 쉼표로 여러 개 (지정하지 않으면 로컬 스텁 서버 사용)")
+    parser.add_argument('--scenarios', default=",".join(SCENARIOS), help=f"쉼표로 구분 ({', '.join(SCENARIOS)})")
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--latency', type=float, default=0.2, help="(스텁) 첫 토큰까지 지연 (초)")
+    parser.add_argument('--jitter', type=float, default=0.05, help="(스텁) 지연 무작위 편차 (초)")
+    parser.add_argument('--tokens-per-sec', type=float, default=50.0, help="(스텁) 생성 속도")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="(스텁) 500 오류 확률")
+    parser.add_argument('--stubs', type=int, default=1, help="(스텁) 띄울 스텁 서버(엔드포인트) 수")
+    parser.add_argument('--slow-factor', type=float, default=1.0, help="(스텁) 마지막 스텁 서버의 지연 배율 (느린 파드 재현)")
+    parser.add_argument('--cache', action='store_true', help="응답 캐시 사용 (기본: 끔)")
+    parser.add_argument('--async-client', action='store_true', help="AsyncClient 모드 사용")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    # 측정이 캐시 히트로 왜곡되지 않도록 기본은 캐시를 끔
+    config.RESPONSE_CACHE_ENABLED = args.cache
+
+    servers = []
+    hosts = [h.strip() for h in args.host.split(',')] if args.host else []
+    if not hosts:
+        for i in range(args.stubs):
+            factor = args.slow_factor if i == args.stubs - 1 else 1.0
+            stub = StubConfig(args.latency * factor, args.jitter, args.tokens_per_sec / factor, args.failure_rate, seed=args.seed + i)
+            server, host = start_stub_server(stub)
+            servers.append(server)
+            hosts.append(host)
+            print(f"로컬 스텁 서버 시작: {host} (지연 x{factor})")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        model_manager = ModelManager(hosts=hosts, use_async=args.async_client)
+    if not model_manager.is_ready:
+        print("🚨 모델 서버에 연결하지 못했습니다.", file=sys.stderr)
+        return 1
+
+    results = {}
+    for name in [s.strip() for s in args.scenarios.split(',') if s.strip()]:
+        run_once = make_scenario(name, model_manager, args.seed)
+        print(f"▶ {name} 실행 중... ({args.iterations}회, 동시 {args.concurrency})")
+        # 게임 코드의 print 출력을 숨기고 측정
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[name] = run_scenario(run_once, args.iterations, args.concurrency)
+
+    print()
+    print_report(results)
+    if model_manager.cache:
+        print(f"\n[응답 캐시] {model_manager.cache_stats()}")
+    print(f"\n[엔드포인트] {json.dumps(model_manager.endpoint_stats(), ensure_ascii=False)}")
+    print(f"\n[프롬프트 토큰] {json.dumps(model_manager.prompt_stats(), ensure_ascii=False)}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    model_manager.close()
+    for server in servers:
+        server.shutdown()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+# build_request_pool.py
+"""
+게임 시작 시 LLM을 기다리지 않도록 (페르소나, 위시리스트, 의뢰서) 풀을 미리 생성합니다.
+PERSONAS 30명 모두에 대해 페르소나당 --per-persona개씩, 동시 요청 수를 제한해 생성하고
+(--batch-size개씩 client.generate_requests_batch로 한 번에, 1이면 client.generate_request로 1개씩)
+modules.request_pool 형식(압축된 색인 JSON)으로 저장합니다. 기존 풀 파일이 있으면 뒤에 덧붙입니다.
+
+    python -m bench.build_request_pool --per-persona 10 --concurrency 8
+    python -m bench.build_request_pool --host http://127.0.0.1:11434 --output .cache/request_pool.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import config
+from modules import client
+from modules.model import ModelManager
+from modules.request_pool import load_pool, save_pool
+from templates.personas import PERSONAS
+
+def _generate_chunk(model_manager, chunk: list) -> list:
+    """(persona, wishlist) 묶음 하나를 생성합니다. 실패한 자리는 None."""
+    if len(chunk) == 1:
+        persona, wishlist = chunk[0]
+        result = client.generate_request(model_manager, persona=persona, wishlist=wishlist)
+        return [result if result[0] is not None and result[2] else None]
+    return client.generate_requests_batch(model_manager, chunk)
+
+def build_pool(model_manager, per_persona: int, concurrency: int, batch_size: int = 1, seed: int = None) -> tuple:
+    """
+    모든 페르소나에 대해 per_persona개씩 의뢰서를 생성합니다.
+    (생성된 [(persona, wishlist, request_text), ...], 실패 수)를 반환합니다.
+    """
+    rng = random.Random(seed)
+    jobs = [(persona, client.pick_wishlist(rng)) for persona in PERSONAS for _ in range(per_persona)]
+    rng.shuffle(jobs) # 한 묶음에 여러 페르소나가 섞이도록
+    chunks = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+    entries, failures, done = [], 0, 0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(_generate_chunk, model_manager, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                print(f"🚨 의뢰서 생성 실패: {e}", file=sys.stderr)
+                results = []
+            done += len(results)
+            entries.extend(result for result in results if result)
+            failures += sum(1 for result in results if not result)
+            print(f"  {done}/{len(jobs)}", file=sys.stderr)
+    failures += len(jobs) - done
+    return entries, failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오프라인 고객 의뢰서 풀 생성")
+    parser.add_argument('--output', default=config.REQUEST_POOL_PATH, help="풀 파일 경로 (있으면 덧붙임)")
+    parser.add_argument('--per-persona', type=int, default=5, help="페르소나당 생성할 의뢰서 수")
+    parser.add_argument('--concurrency', type=int, default=4, help="동시 LLM 요청 수")
+    parser.add_argument('--batch-size', type=int, default=config.REQUEST_BATCH_SIZE, help="LLM 호출 1번에 생성할 의뢰서 수 (1이면 1개씩)")
+    parser.add_argument('--host', help="Ollama 서버 URL, 쉼표로 여러 개 (기본: 환경 변수 설정)")
+    parser.add_argument('--seed', type=int, help="위시리스트 선정 시드")
+    parser.add_argument('--no-cache', action='store_true', help="LLM 응답 캐시 끄기")
+    parser.add_argument('--verbose', action='store_true', help="생성 함수의 로그 출력 표시")
+    args = parser.parse_args(argv)
+
+    if args.no_cache:
+        config.RESPONSE_CACHE_ENABLED = False
+
+    hosts = [h.strip() for h in args.host.split(',')] if args.host else None
+    with contextlib.redirect_stdout(io.StringIO()):
+        model_manager = ModelManager(hosts=hosts)
+    if not model_manager.is_ready:
+        print("🚨 모델 서버에 연결하지 못했습니다.", file=sys.stderr)
+        return 1
+
+    existing = load_pool(args.output) if os.path.exists(args.output) else []
+    start = time.perf_counter()
+    log_target = sys.stdout if args.verbose else io.StringIO()
+    with contextlib.redirect_stdout(log_target):
+        entries, failures = build_pool(model_manager, args.per_persona, args.concurrency, args.batch_size, args.seed)
+    elapsed = time.perf_counter() - start
+
+    save_pool(args.output, existing + entries)
+    summary = {
+        "output": args.output,
+        "generated": len(entries),
+        "failures": failures,
+        "total": len(existing) + len(entries),
+        "personas": len({persona['id'] for persona, _, _ in existing + entries}),
+        "seconds": elapsed,
+        "requests_per_sec": len(entries) / elapsed if elapsed > 0 else 0.0,
+        "endpoints": model_manager.endpoint_stats(),
+        "file_bytes": os.path.getsize(args.output),
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+    model_manager.close()
+    return 0 if failures == 0 else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
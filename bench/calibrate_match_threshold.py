@@ -0,0 +1,96 @@
+# calibrate_match_threshold.py
+"""
+config.WISHLIST_MATCH_THRESHOLD(카탈로그 밖 위시리스트 이름의 유사도 매칭 기준)를 실제 임베딩으로 보정합니다.
+
+- 양성 쌍: 같은 가구를 가리키는 (카탈로그 밖 이름, 카탈로그 이름) 예: ("램프", "전등")
+- 음성 쌍: 서로 다른 카탈로그 가구 전부 (예: "작은 소파" / "큰 소파", "테이블" / "탁자")
+           + 양성 쌍의 카탈로그 밖 이름과 나머지 카탈로그 이름
+음성 쌍을 하나도 충족으로 보지 않는 가장 낮은 기준(음성 최대 유사도 + margin)을 추천하고,
+그 기준에서의 양성 재현율을 함께 출력합니다. 재현율이 낮으면 유사도 매칭을 끄는(None) 편이 낫습니다.
+
+    python -m bench.calibrate_match_threshold
+    python -m bench.calibrate_match_threshold --pairs pairs.jsonl   # {"a": "...", "b": "...", "match": true}
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import sys
+
+import numpy as np
+
+from modules import client
+from modules.furniture_index import FurnitureIndex
+from modules.model import ModelManager
+
+# 같은 가구를 가리키는 카탈로그 밖 표현 (위시리스트 / 의뢰서 풀에 섞여 들어올 수 있는 이름)
+DEFAULT_POSITIVE_PAIRS = [
+    ("소파", "작은 소파"), ("쇼파", "큰 소파"), ("침대", "1인 침대"), ("더블 침대", "2인 침대"),
+    ("싱글 침대", "1인 침대"), ("램프", "전등"), ("스탠드", "전등"), ("책꽂이", "책장"),
+    ("식사 테이블", "식탁"), ("화초", "화분"), ("옷 행거", "옷걸이"), ("전신 거울", "거울"),
+    ("가스레인지", "스토브"), ("데스크톱", "컴퓨터"), ("수납 선반", "선반"), ("벽시계", "시계"),
+]
+
+def read_pairs(path: str) -> tuple:
+    """JSONL 쌍 파일을 (양성 목록, 음성 목록)으로 읽습니다."""
+    positives, negatives = [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                (positives if record['match'] else negatives).append((record['a'], record['b']))
+    return positives, negatives
+
+def default_pairs(catalog: list) -> tuple:
+    """기본 양성 쌍과, 카탈로그에서 만든 음성 쌍을 반환합니다."""
+    positives = [(a, b) for a, b in DEFAULT_POSITIVE_PAIRS if b in catalog]
+    negatives = list(itertools.combinations(catalog, 2))
+    negatives += [(a, other) for a, b in positives for other in catalog if other != b]
+    return positives, negatives
+
+def calibrate(index: FurnitureIndex, positives: list, negatives: list, margin: float) -> dict:
+    """쌍별 유사도를 계산해 추천 기준과 그때의 재현율 / 오탐을 반환합니다."""
+    def scores(pairs):
+        return np.array([float(index.similarity([a], [b])[0, 0]) for a, b in pairs], dtype=np.float32)
+
+    pos, neg = scores(positives), scores(negatives)
+    threshold = float(neg.max()) + margin if len(neg) else None
+    worst = [{"a": a, "b": b, "similarity": round(float(s), 4)}
+             for (a, b), s in sorted(zip(negatives, neg), key=lambda item: -item[1])[:5]]
+    return {
+        "recommended_threshold": round(threshold, 4) if threshold is not None else None,
+        "recall_at_threshold": float((pos >= threshold).mean()) if len(pos) and threshold is not None else 0.0,
+        "positive": {"count": len(pos), "min": float(pos.min()) if len(pos) else None, "mean": float(pos.mean()) if len(pos) else None},
+        "negative": {"count": len(neg), "max": float(neg.max()) if len(neg) else None, "mean": float(neg.mean()) if len(neg) else None},
+        "closest_negatives": worst,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="위시리스트 유사도 매칭 기준 보정")
+    parser.add_argument('--pairs', help="라벨링된 쌍 JSONL (없으면 기본 쌍 사용)")
+    parser.add_argument('--margin', type=float, default=0.005, help="음성 최대 유사도에 더할 여유")
+    parser.add_argument('--host', help="Ollama 서버 URL, 쉼표로 여러 개 (기본: 환경 변수 설정)")
+    args = parser.parse_args(argv)
+
+    hosts = [h.strip() for h in args.host.split(',')] if args.host else None
+    with contextlib.redirect_stdout(io.StringIO()):
+        model_manager = ModelManager(hosts=hosts)
+    if not model_manager.is_ready:
+        print("🚨 모델 서버에 연결하지 못했습니다.", file=sys.stderr)
+        return 1
+
+    catalog = client.FURNITURE_LIST_AS_LIST
+    positives, negatives = read_pairs(args.pairs) if args.pairs else default_pairs(catalog)
+    names = list(dict.fromkeys(name for pair in positives + negatives for name in pair))
+    index = FurnitureIndex.build(model_manager, names)
+    if index is None:
+        print("🚨 임베딩 생성에 실패했습니다.", file=sys.stderr)
+        return 1
+
+    print(json.dumps(calibrate(index, positives, negatives, args.margin), ensure_ascii=False, indent=2))
+    model_manager.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,299 @@
+# stub_server.py
+"""
+Ollama 호환 로컬 스텁 서버.
+RunPod 없이 ModelManager / 평가 파이프라인의 지연 시간을 측정하기 위해 사용합니다.
+
+    python -m bench.stub_server --port 11434 --latency 0.3 --tokens-per-sec 40
+
+지원 엔드포인트: /api/chat (stream 포함), /api/generate, /api/embed, /api/embeddings, /api/tags (client.list()), /api/pull
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 프롬프트에 특정 문구가 있으면 그에 맞는 응답을 돌려줌 (위에서부터 먼저 맞는 것)
+DEFAULT_RESPONSES = [
+    ("--- 작업: [평가] ---", "3.5"),
+    ("--- 작업: [묘사] ---", "가구들이 벽을 따라 가지런히 놓여 있고, 방의 중앙은 시원하게 비어 있네요."),
+    ("--- 작업: [피드백] ---", "원하던 책장이 없어서 조금 아쉽지만, 중앙이 넓어서 답답하지 않네요."),
+    ("", "조용히 책을 읽으며 쉴 수 있는 아늑한 공간이 있으면 좋겠어요."),
+]
+
+EMBEDDING_DIM = 64
+
+class StubConfig:
+    """스텁 서버 동작 설정 (모든 요청 핸들러가 공유)."""
+    def __init__(self, latency=0.2, jitter=0.05, tokens_per_sec=50.0, failure_rate=0.0,
+                 models=('EEVE-Korean-10.8B:latest', 'llama3:latest'), responses=None, seed=None,
+                 prompt_cache_slots=4, prompt_eval_ms_per_token=0.2):
+        self.latency = latency               # 첫 토큰까지의 기본 지연 (초)
+        self.jitter = jitter                 # 지연에 더해지는 무작위 편차 (초)
+        self.tokens_per_sec = tokens_per_sec # 생성 속도, 0 이하이면 즉시
+        self.failure_rate = failure_rate     # 500 오류를 돌려줄 확률 (0~1)
+        self.models = list(models)
+        self.responses = responses or DEFAULT_RESPONSES
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.disconnects = 0                 # 응답을 다 받기 전에 클라이언트가 끊은 요청 수 (취소된 요청)
+        # 서버 프롬프트 캐시 흉내: 최근 프롬프트와 겹치는 접두부는 다시 계산하지 않음
+        self.prompt_cache = deque(maxlen=prompt_cache_slots) if prompt_cache_slots > 0 else None
+        self.prompt_eval_ms_per_token = prompt_eval_ms_per_token # 프롬프트 토큰당 평가 시간 (첫 토큰 지연에 더해짐)
+
+    def wait_first_token(self):
+        with self.lock:
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+        time.sleep(max(0.0, delay))
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            self.request_count += 1
+            return self.rng.random() < self.failure_rate
+
+    def pick_response(self, messages: list) -> str:
+        prompt = "\n".join(m.get('content', '') for m in messages)
+        for marker, text in self.responses:
+            if marker in prompt:
+                return text
+        return self.responses[-1][1]
+
+    def prompt_eval(self, messages: list) -> tuple:
+        """
+        (prompt_eval_count, prompt_eval_duration(ns))를 계산합니다 (2글자 = 1토큰).
+        최근 prompt_cache_slots개의 프롬프트 중 가장 길게 겹치는 접두부는 계산에서 뺍니다.
+        """
+        prompt = "".join(f"<{m.get('role')}>{m.get('content', '')}" for m in messages)
+        reused = 0
+        if self.prompt_cache is not None:
+            with self.lock:
+                for cached in self.prompt_cache:
+                    reused = max(reused, len(os.path.commonprefix([cached, prompt])))
+                self.prompt_cache.append(prompt)
+        count = max(1, (len(prompt) - reused) // 2)
+        return count, int(count * self.prompt_eval_ms_per_token * 1e6)
+
+def _fake_embedding(text: str) -> list:
+    """텍스트 해시로 만든 결정적 정규화 벡터 (같은 입력 -> 같은 벡터)."""
+    digest = hashlib.sha256(text.encode('utf-8')).digest()
+    rng = random.Random(digest)
+    vector = [rng.gauss(0, 1) for _ in range(EMBEDDING_DIM)]
+    norm = sum(v * v for v in vector) ** 0.5 or 1.0
+    return [v / norm for v in vector]
+
+def _fill_schema(schema) -> object:
+    """format(JSON 스키마)에 맞는 고정 값을 만듭니다 (숫자 3.5, 문자열 짧은 문장, 배열은 minItems개)."""
+    if not isinstance(schema, dict):
+        return {} # format="json"
+    kind = schema.get('type')
+    if kind == 'object':
+        return {name: _fill_schema(prop) for name, prop in schema.get('properties', {}).items()}
+    if kind == 'array':
+        return [_fill_schema(schema.get('items')) for _ in range(schema.get('minItems', 0))]
+    if kind in ('number', 'integer'):
+        return 3.5 if kind == 'number' else 3
+    if kind == 'boolean':
+        return True
+    return "중앙이 넓어 답답하지 않아요."
+
+def _tokenize(text: str) -> list:
+    """응답을 토큰 비슷한 조각으로 나눕니다 (공백 단위, 공백 유지)."""
+    words = text.split(' ')
+    return [w if i == len(words) - 1 else w + ' ' for i, w in enumerate(words)]
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def make_handler(stub: StubConfig):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True # 헤더/본문 분할 전송 시 지연 ACK로 인한 ~40ms 지연 방지
+
+        def log_message(self, format, *args):
+            pass # 벤치마크 출력이 섞이지 않도록 접근 로그 생략
+
+        # --- 공통 ---
+        def _read_json(self) -> dict:
+            length = int(self.headers.get('Content-Length') or 0)
+            return json.loads(self.rfile.read(length) or b'{}')
+
+        def _send_json(self, payload: dict, status: int = 200):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_failure(self):
+            self._send_json({"error": "stub: injected failure"}, status=500)
+
+        # --- 라우팅 ---
+        def do_GET(self):
+            if self.path == '/api/tags':
+                self._handle_list()
+            else:
+                self._send_json({"error": "not found"}, status=404)
+
+        def do_POST(self):
+            routes = {
+                '/api/chat': self._handle_chat,
+                '/api/generate': self._handle_generate,
+                '/api/embed': self._handle_embed,
+                '/api/embeddings': self._handle_embeddings,
+                '/api/pull': self._handle_pull,
+            }
+            handler = routes.get(self.path)
+            if handler is None:
+                self._send_json({"error": "not found"}, status=404)
+                return
+            request = self._read_json()
+            if stub.should_fail():
+                self._send_failure()
+                return
+            try:
+                handler(request)
+            except (BrokenPipeError, ConnectionResetError):
+                # 클라이언트가 요청을 취소함 (실제 서버는 여기서 생성을 멈춤)
+                with stub.lock:
+                    stub.disconnects += 1
+
+        # --- 엔드포인트 ---
+        def _handle_list(self):
+            models = [{"model": name, "name": name, "modified_at": _now(), "size": 0, "digest": ""} for name in stub.models]
+            self._send_json({"models": models})
+
+        def _handle_pull(self, request):
+            self._send_json({"status": "success"})
+
+        def _handle_embed(self, request):
+            inputs = request.get('input', [])
+            if isinstance(inputs, str):
+                inputs = [inputs]
+            stub.wait_first_token()
+            self._send_json({
+                "model": request.get('model'),
+                "embeddings": [_fake_embedding(text) for text in inputs],
+                "prompt_eval_count": sum(len(text) for text in inputs),
+            })
+
+        def _handle_generate(self, request):
+            # 예열/keep_alive 갱신용: 짧은 응답만 돌려줌
+            stub.wait_first_token()
+            self._send_json({
+                "model": request.get('model'),
+                "created_at": _now(),
+                "response": "" if not request.get('prompt') else "네",
+                "done": True,
+                "done_reason": "stop",
+            })
+
+        def _handle_embeddings(self, request):
+            stub.wait_first_token()
+            self._send_json({"embedding": _fake_embedding(request.get('prompt', ''))})
+
+        def _handle_chat(self, request):
+            messages = request.get('messages', [])
+            if request.get('format'):
+                text = json.dumps(_fill_schema(request['format']), ensure_ascii=False)
+            else:
+                text = stub.pick_response(messages)
+            tokens = _tokenize(text)
+            # num_predict 상한을 넘는 응답은 잘라서 done_reason="length"로 보냄 (실제 서버와 같이)
+            num_predict = (request.get('options') or {}).get('num_predict')
+            truncated = bool(num_predict) and 0 < num_predict < len(tokens)
+            if truncated:
+                tokens = tokens[:num_predict]
+                text = "".join(tokens)
+            token_delay = 1.0 / stub.tokens_per_sec if stub.tokens_per_sec > 0 else 0.0
+            prompt_tokens, prompt_eval_duration = stub.prompt_eval(messages)
+            started = time.perf_counter()
+
+            stub.wait_first_token()
+            time.sleep(prompt_eval_duration / 1e9) # 재사용하지 못한 프롬프트 토큰만큼 추가 지연
+
+            final = {
+                "model": request.get('model'),
+                "created_at": _now(),
+                "done": True,
+                "done_reason": "length" if truncated else "stop",
+                "prompt_eval_count": prompt_tokens,
+                "prompt_eval_duration": prompt_eval_duration,
+                "eval_count": len(tokens),
+            }
+
+            if not request.get('stream', True):
+                time.sleep(token_delay * len(tokens))
+                final["message"] = {"role": "assistant", "content": text}
+                final["total_duration"] = int((time.perf_counter() - started) * 1e9)
+                self._send_json(final)
+                return
+
+            # NDJSON 스트리밍 (chunked)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for token in tokens:
+                self._write_chunk({"model": request.get('model'), "created_at": _now(), "done": False,
+                                   "message": {"role": "assistant", "content": token}})
+                time.sleep(token_delay)
+            final["message"] = {"role": "assistant", "content": ""}
+            final["total_duration"] = int((time.perf_counter() - started) * 1e9)
+            self._write_chunk(final)
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _write_chunk(self, payload: dict):
+            line = (json.dumps(payload, ensure_ascii=False) + "\n").encode('utf-8')
+            self.wfile.write(f"{len(line):X}\r\n".encode('ascii') + line + b"\r\n")
+            self.wfile.flush()
+
+    return StubHandler
+
+def start_stub_server(stub: StubConfig = None, host: str = '127.0.0.1', port: int = 0):
+    """
+    스텁 서버를 데몬 스레드에서 시작하고 (server, base_url)을 반환합니다.
+    port=0이면 빈 포트를 자동으로 고릅니다. 종료는 server.shutdown().
+    """
+    stub = stub or StubConfig()
+    server = ThreadingHTTPServer((host, port), make_handler(stub))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Ollama 호환 로컬 스텁 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=11434)
+    parser.add_argument('--latency', type=float, default=0.2, help="첫 토큰까지 지연 (초)")
+    parser.add_argument('--jitter', type=float, default=0.05, help="지연 무작위 편차 (초)")
+    parser.add_argument('--tokens-per-sec', type=float, default=50.0, help="생성 속도")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="500 오류 확률 (0~1)")
+    parser.add_argument('--responses', help="[[프롬프트 포함 문구, 응답], ...] 형식의 JSON 파일")
+    parser.add_argument('--prompt-cache-slots', type=int, default=4, help="접두부를 재사용할 최근 프롬프트 수 (0이면 끔)")
+    args = parser.parse_args()
+
+    responses = None
+    if args.responses:
+        with open(args.responses, 'r', encoding='utf-8') as f:
+            responses = [tuple(pair) for pair in json.load(f)]
+
+    stub = StubConfig(args.latency, args.jitter, args.tokens_per_sec, args.failure_rate, responses=responses,
+                      prompt_cache_slots=args.prompt_cache_slots)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(stub))
+    print(f"🦙 Ollama 스텁 서버 실행 중: http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -56,4 +56,102 @@ STAR_SIZE = (28, 28)
 POPUP_TOGGLE_BTN_COLOR = (100, 100, 100)
 POPUP_TOGGLE_BTN_HOVER_COLOR = (130, 130, 130)
 POPUP_CLOSE_BTN_COLOR = (150, 0, 0)
-POPUP_CLOSE_BTN_HOVER_COLOR = (180, 0, 0)
\ No newline at end of file
+POPUP_CLOSE_BTN_HOVER_COLOR = (180, 0, 0)
+
+# ========= Ollama 연결 (HTTP 커넥션 풀) =========
+OLLAMA_USE_ASYNC = False          # True: AsyncClient + 백그라운드 이벤트 루프 사용
+OLLAMA_POOL_SIZE = 8              # 최대 동시 연결 수 (평가/로딩/다시 받기 스레드가 공유)
+OLLAMA_KEEPALIVE_EXPIRY = 60.0    # 유휴 연결 유지 시간 (초)
+OLLAMA_HTTP2 = True               # h2 패키지가 설치되어 있을 때만 HTTP/2 멀티플렉싱 사용
+OLLAMA_CONNECT_TIMEOUT = 10.0     # 연결 타임아웃 (초)
+OLLAMA_READ_TIMEOUT = 120.0       # 응답 대기 타임아웃 (초, 생성 시간 포함)
+
+# ========= LLM 응답 캐시 =========
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_MAX_ENTRIES = 256          # 메모리 LRU 최대 항목 수
+RESPONSE_CACHE_TTL = 24 * 60 * 60         # 만료 시간 (초), None이면 만료 없음
+RESPONSE_CACHE_DIR = ".cache/responses"   # 디스크 캐시 경로, None이면 메모리만 사용
+RESPONSE_CACHE_MAX_DISK_ENTRIES = 2000    # 디스크 캐시 최대 항목 수
+
+# ========= 가구 이름 임베딩 인덱스 =========
+FURNITURE_INDEX_DIR = ".cache/furniture_index"  # embeddings.npy + manifest.json 저장 경로
+# 카탈로그 밖의 위시리스트 이름을 배치된 가구와 유사도로 맞출 때의 최소 코사인 유사도
+# None이면 정확히 일치할 때만 충족 (python -m bench.calibrate_match_threshold 결과로 설정)
+WISHLIST_MATCH_THRESHOLD = None
+
+# ========= 다중 엔드포인트 (POD_IDS / OLLAMA_HOST_URL에 쉼표로 여러 개 지정) =========
+OLLAMA_HEDGE_JUDGE = True         # AI 평가자 점수 호출에 헤지 요청 사용
+OLLAMA_HEDGE_DEFAULT_DELAY = 3.0  # 지연 통계가 쌓이기 전 헤지 대기 시간 (초)
+OLLAMA_HEDGE_MIN_DELAY = 0.2      # p95 기반 헤지 대기 시간의 하한 (초)
+
+# ========= 모델 예열 (cold load 방지) =========
+OLLAMA_WARMUP_ON_START = True     # 시작 시 모든 모델에 짧은 예열 요청
+OLLAMA_KEEP_ALIVE = "30m"         # 요청마다 서버에 전달하는 모델 메모리 유지 시간
+OLLAMA_KEEP_ALIVE_REFRESH = 600   # 유휴 상태가 이 시간(초) 지속되면 keep_alive 갱신, 0이면 끔
+
+# ========= AI 평가자 (LLM-as-Judge) =========
+JUDGE_NUM_PREDICT = 192       # JSON {score, missing(최대 5개), notes(JUDGE_NOTES_MAX_CHARS자 이내)} 응답 토큰 상한
+JUDGE_NOTES_MAX_CHARS = 20    # 평가 근거(notes) 최대 글자 수 (평가자 프롬프트와 JSON 스키마에 같이 사용)
+JUDGE_TEMPERATURE = 0.2       # 점수 변동을 줄이기 위한 낮은 온도
+JUDGE_FALLBACK_SCORE = 2.5    # 평가자 호출이 실패했을 때 사용할 중립 점수 (배치 정보가 없을 때)
+JUDGE_DEADLINE = 20.0         # 평가 중 평가자 응답을 기다리는 최대 시간 (초), 넘으면 규칙 기반 점수 사용
+JUDGE_SAMPLES = 1             # 자기 일관성 샘플 수, 1이면 단일 호출
+JUDGE_SAMPLE_CONCURRENCY = 2  # 동시에 보내는 샘플 수 (조기 종료 / 시간 초과 시 진행 중인 샘플은 취소, 남은 샘플은 보내지 않음)
+JUDGE_SAMPLE_MIN = 2          # 조기 종료 판단 전 최소 샘플 수
+JUDGE_SAMPLE_SPREAD = 0.5     # 샘플 점수 범위(최대-최소)가 이 값 이하이면 남은 샘플을 기다리지 않음
+JUDGE_SAMPLE_TEMPERATURE = 0.7 # 샘플링 온도 (샘플마다 seed를 달리함)
+
+# ========= 생성 프로필 (호출 위치별 생성 옵션) =========
+# num_ctx는 아래 CHAT_NUM_CTX 하나로 고정되므로 여기서 지정하지 않습니다.
+GENERATION_PROFILES = {
+    "default":  {"temperature": 0.7, "top_p": 1, "num_predict": 1000, "stop": []},
+    "request":  {"temperature": 0.9, "top_p": 1, "num_predict": 160, "stop": ["\n\n"]},
+    "request_batch": {"temperature": 0.9, "top_p": 1, "num_predict": 600, "stop": []}, # num_predict는 고객 수에 맞춰 덮어씀
+    "describe": {"temperature": 0.6, "top_p": 1, "num_predict": 320, "stop": ["---"]},
+    "judge":    {"temperature": JUDGE_TEMPERATURE, "top_p": 1, "num_predict": JUDGE_NUM_PREDICT, "stop": []},
+    "feedback": {"temperature": 0.8, "top_p": 1, "num_predict": 200, "stop": ["Translation", "\n\n"]},
+    "single_pass": {"temperature": 0.6, "top_p": 1, "num_predict": 520, "stop": []},
+}
+
+# 채팅 모델 컨텍스트 크기 (Ollama는 num_ctx가 바뀌면 모델을 다시 올리므로 예열 포함 모든 호출에서 같은 값)
+CHAT_NUM_CTX = 4096             # 가장 긴 프로필(describe / feedback / single_pass)의 프롬프트 + num_predict가 들어가는 크기
+CHAT_NUM_CTX_AUTO_GROW = True   # 추정치가 넘치면 2배씩 한 번 늘리고 유지 (줄이지 않음)
+NUM_CTX_MAX = 8192              # 모델/서버가 허용하는 최대 컨텍스트 크기
+PROMPT_TOKENS_PER_CHAR = 1.0    # 측정값이 쌓이기 전 사용할 '글자당 토큰 수' (한국어 기준 보수적 값)
+PROMPT_TOKEN_MARGIN = 1.15      # 추정 오차를 흡수하기 위한 여유 배율
+
+# ========= 평가 방식 =========
+EVALUATION_SINGLE_PASS = False  # True: 묘사/점수/피드백을 LLM 호출 1번으로 생성 (실패 시 기존 3단계 방식)
+PIPELINE_WORKERS = 8            # 평가 단계 그래프를 실행하는 공유 작업자 스레드 수
+
+# ========= 추측 사전 평가 (배치를 멈추면 미리 평가) =========
+SPECULATIVE_EVAL_ENABLED = True   # 배치가 잠시 그대로면 묘사(와 평가자 점수)를 미리 계산
+SPECULATIVE_IDLE_SECONDS = 1.5    # 마지막 배치 변경 후 이 시간(초)이 지나면 시작
+SPECULATIVE_JUDGE = True          # AI 평가자 점수도 미리 계산 (False면 묘사만)
+
+# ========= 평가 결과 캐시 (같은/동등한 배치는 LLM 호출 생략) =========
+EVALUATION_CACHE_ENABLED = True
+EVALUATION_CACHE_LEVEL = "exact"            # "exact": 좌표/회전/문까지 같아야 재사용, "facts": 회전이나 놓은 순서만 다른 배치도 재사용 (좌표는 같아야 함)
+EVALUATION_CACHE_DIR = ".cache/evaluations" # 디스크 캐시 경로, None이면 메모리만 사용
+EVALUATION_CACHE_MAX_ENTRIES = 128          # 메모리 LRU 최대 항목 수
+EVALUATION_CACHE_MAX_DISK_ENTRIES = 1000    # 디스크 캐시 최대 항목 수
+EVALUATION_CACHE_TTL = 7 * 24 * 60 * 60     # 만료 시간 (초), None이면 만료 없음
+
+# ========= 고객 선반입 큐 (다시 받기 / 초기화 시 즉시 표시) =========
+CUSTOMER_QUEUE_ENABLED = True
+REQUEST_POOL_PATH = ".cache/request_pool.json" # 미리 생성한 의뢰서 풀 (python -m bench.build_request_pool), 없으면 실시간 생성
+CUSTOMER_QUEUE_DEPTH = 3                 # 미리 만들어 둘 고객 수 (최대)
+CUSTOMER_QUEUE_REFILL_AT = 1             # 남은 고객이 이 수 이하가 되면 DEPTH까지 다시 채움
+CUSTOMER_QUEUE_PREFETCH_EMBEDDING = False # True면 의뢰서 임베딩도 미리 계산
+CUSTOMER_QUEUE_RETRY_BASE = 2.0          # 생성 실패 시 첫 재시도 대기 (초), 연속 실패마다 2배
+CUSTOMER_QUEUE_RETRY_MAX = 30.0          # 재시도 대기 최대 (초)
+REQUEST_BATCH_SIZE = 5                   # 고객 의뢰서를 한 번의 LLM 호출로 생성할 최대 수
+REQUEST_BATCH_RETRIES = 2                # 검증에 실패한 항목만 다시 요청하는 최대 횟수
+REQUEST_BATCH_TOKENS_PER_ITEM = 96       # 일괄 생성 시 고객 1명당 응답 토큰 상한
+
+# ========= 의뢰서 생성 프롬프트 =========
+REQUEST_EXAMPLES_PER_ITEM = 2  # 위시리스트 가구 1개당 넣을 예시 수 (templates/request_examples.py)
+REQUEST_EXAMPLES_EXTRA = 2     # 위시리스트와 무관한 예시 수 (표현 다양성 유지용)
+
+# ========= 시작 로딩 =========
+LOADING_WORKERS = 4  # 시작 시 동시에 실행할 로딩 작업 수 (에셋 / 모델 연결 / 의뢰서 풀 등)
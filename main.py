@@ -2,9 +2,15 @@ import pygame
 import sys
 import math
 import threading
+import time
 
 import config
-from modules import evaluation, client, loading, utils
+from modules import evaluation, client, loading, utils, model
+from modules.design_facts import DesignFacts
+from modules.occupancy import OccupancyGrid
+from modules.speculation import SpeculativeEvaluator
+from modules.result_cache import EvaluationResultCache
+from modules.customer_queue import CustomerQueue
 
 # ========= pygame 초기화 =========
 pygame.init()
@@ -33,10 +39,12 @@ loaded_resources = loading.run_loading_screen(screen, clock, font_L, font_M)
 FURNITURE_LIST = loaded_resources.get('FURNITURE_LIST')
 global_background_image = loaded_resources.get('background_image')
 model_manager = loaded_resources.get('model_manager')
+furniture_index = loaded_resources.get('furniture_index')
 current_persona = loaded_resources.get('current_persona') 
 internal_wishlist = loaded_resources.get('internal_wishlist')
 current_request_text = loaded_resources.get('request_text')
 request_embedding = loaded_resources.get('request_embedding')
+request_pool = loaded_resources.get('request_pool') # (신규) 미리 생성한 의뢰서 풀
 door_position = None # 문 위치 변수
 
 # ========= 별점 및 종이 이미지 애셋 로드 =========
@@ -109,56 +117,183 @@ def draw_star_rating(surface, score, pos, star_full, star_half, star_empty):
 # --- 게임 로직 함수 ---
 def trigger_evaluation():
     """'E' 키 또는 '디자인 완료' 버튼 클릭 시 평가를 실행합니다."""
-    global evaluation_result, is_evaluating, show_feedback_popup
+    global evaluation_result, is_evaluating, show_feedback_popup, streaming_stage, streaming_text
     
     print("평가 스레드 시작")
-    # utils.py로 이동하지 않음. evaluation 모듈 사용
-    eval_data = evaluation.evaluate_design(
+    streaming_stage = "디자인 분석 중..."
+    streaming_text = ""
+
+    def on_description_token(partial_text):
+        global streaming_text
+        streaming_text = partial_text
+
+    # (신규) 배치할 때마다 갱신된 사실 데이터를 그대로 사용 (재집계 없음)
+    facts_report = design_facts.report()
+
+    # (신규) 같거나 동등한 디자인을 이미 평가했다면 LLM 호출 없이 바로 결과 표시
+    # (수정) 키는 지금 한 번만 만듦 (팝업을 닫아 게임이 초기화된 뒤 저장해도 평가한 배치의 키를 사용)
+    cache_key = result_cache.key(
+        placed_furniture, door_position, config.ROOM_WIDTH_GRID, config.ROOM_HEIGHT_GRID,
+        current_request_text, internal_wishlist, design_facts=design_facts
+    ) if result_cache else None
+    if result_cache:
+        cached_result = result_cache.get(cache_key)
+        if cached_result is not None:
+            print(f"[평가 결과 캐시] 재사용 {result_cache.stats()}")
+            evaluation_result = cached_result
+            is_evaluating = False
+            show_feedback_popup = True
+            print("평가 스레드 완료")
+            return
+    eval_start = time.perf_counter()
+
+    # (신규) 같은 배치로 미리 시작해 둔 묘사/평가자 작업이 있으면 넘겨받음
+    precomputed = speculator.take(facts_report, current_request_text, internal_wishlist) if speculator else {}
+
+    # (신규) 단일 호출 모드: 묘사/점수/피드백을 한 번에 받음 (실패하면 아래 3단계 방식으로 진행)
+    if config.EVALUATION_SINGLE_PASS:
+        streaming_stage = "고객이 평가하는 중..."
+        single_result = evaluation.evaluate_design_single_pass(
+            model_manager,
+            current_persona,
+            current_request_text,
+            internal_wishlist,
+            placed_furniture,
+            config.ROOM_WIDTH_GRID,
+            config.ROOM_HEIGHT_GRID,
+            furniture_index=furniture_index,
+            design_facts=facts_report
+        )
+        if single_result is not None:
+            evaluation_result = single_result
+            is_evaluating = False
+            show_feedback_popup = True
+            if result_cache:
+                result_cache.put(cache_key, single_result, time.perf_counter() - eval_start)
+            if model_manager:
+                print(f"[응답 캐시] {model_manager.cache_stats()}")
+            print("평가 스레드 완료")
+            return
+        streaming_stage = "디자인 분석 중..."
+
+    # (신규) 점수가 나오면 바로 팝업을 띄우고, 피드백은 생성되는 대로 채워 넣음
+    result = {
+        "score": 0.0,
+        "description": "",
+        "feedback": ""
+    }
+
+    def on_score(score):
+        global evaluation_result, is_evaluating, show_feedback_popup
+        result['score'] = score
+        evaluation_result = result
+        is_evaluating = False
+        show_feedback_popup = True
+
+    def on_feedback_token(partial_text):
+        result['feedback'] = partial_text
+
+    # (수정) 묘사 / AI 평가자 / 피드백을 단계 그래프로 실행 (묘사와 점수·피드백이 동시에 진행)
+    eval_data = evaluation.evaluate_with_feedback(
         model_manager, 
+        current_persona,
         current_request_text,
         internal_wishlist,
         placed_furniture,
         config.ROOM_WIDTH_GRID,
-        config.ROOM_HEIGHT_GRID
-    )
-    
-    feedback_text = client.generate_feedback(
-        model_manager,
-        current_persona,
-        current_request_text,
-        internal_wishlist,
-        eval_data['description'],
-        eval_data['score']
+        config.ROOM_HEIGHT_GRID,
+        on_token=on_description_token,
+        on_score=on_score,
+        on_feedback_token=on_feedback_token,
+        furniture_index=furniture_index,
+        design_facts=facts_report,
+        precomputed=precomputed
     )
     
-    # 평가 완료 후 메인 스레드에서 팝업을 띄우도록 상태 변경
-    evaluation_result = {
-        "score": eval_data['score'],
-        "description": eval_data['description'],
-        "feedback": feedback_text
-    }
-    is_evaluating = False
-    show_feedback_popup = True
+    # 최종 (후처리된) 묘사 / 피드백으로 교체
+    result['description'] = eval_data['description']
+    result['feedback'] = eval_data['feedback']
+    if result_cache:
+        result_cache.put(cache_key, eval_data, time.perf_counter() - eval_start)
+        print(f"[평가 결과 캐시] {result_cache.stats()}")
+    if model_manager:
+        print(f"[응답 캐시] {model_manager.cache_stats()}")
     print("평가 스레드 완료")
 
 # --- 게임 로직 함수 ---
 def run_evaluation_thread():
     """'trigger_evaluation'을 별도 스레드에서 실행하고 상태를 업데이트합니다."""
     # 전역 변수 사용
-    global evaluation_result, is_evaluating, show_feedback_popup
+    global evaluation_result, is_evaluating, show_feedback_popup, provisional_score
     
-    eval_thread = threading.Thread(target=trigger_evaluation, daemon=True)
+    # (신규) 규칙 기반 잠정 점수는 즉시 계산해 평가 화면에 바로 표시 (AI 평가자 점수가 나오면 팝업에서 교체)
+    provisional_score = evaluation.rule_based_score(
+        internal_wishlist or [], placed_furniture, config.ROOM_WIDTH_GRID, config.ROOM_HEIGHT_GRID, furniture_index
+    )
+    print(f"예상 점수 (규칙 기반): {provisional_score:.1f}")
+
+    def evaluation_job():
+        # (신규) 평가 중에는 고객 선반입을 멈춰 평가 요청이 LLM을 먼저 쓰도록 함
+        if customer_queue:
+            customer_queue.pause()
+        try:
+            trigger_evaluation()
+        finally:
+            if customer_queue:
+                customer_queue.resume()
+
+    eval_thread = threading.Thread(target=evaluation_job, daemon=True)
     eval_thread.start()
 
 
+# --- 게임 로직 함수 ---
+def generate_new_customer():
+    """(백그라운드 스레드) 새 고객 의뢰서를 스트리밍으로 생성해 포스트잇에 바로 표시합니다."""
+    global current_persona, current_request_text, request_embedding, internal_wishlist, is_generating_request
+
+    def on_request_token(partial_text):
+        global current_request_text
+        current_request_text = partial_text
+
+    # 4. 새 고객 생성
+    persona, wishlist, request_text = client.generate_request(model_manager, on_token=on_request_token)
+    if persona is None:
+        # (수정) 생성 실패 시 페르소나가 None으로 남지 않도록 테스트 고객으로 대체
+        persona, wishlist, request_text = client.generate_request(None)
+    current_persona, internal_wishlist, current_request_text = persona, wishlist, request_text
+
+    # 5. 새 임베딩 (지연 계산: 실제로 읽힐 때만 요청)
+    request_embedding = model.LazyEmbedding(model_manager, current_request_text, fallback=[0.1] * 128)
+
+    is_generating_request = False
+    if current_persona:
+        print(f"새로운 고객: {current_persona['name']}")
+    print(f"[요구 가구]: {internal_wishlist}")
+    print(f"새로운 의뢰서: {current_request_text}")
+
+def apply_customer(customer):
+    """(신규) 선반입 큐에서 꺼낸 고객을 현재 고객으로 설정합니다."""
+    global current_persona, current_request_text, request_embedding, internal_wishlist
+    current_persona = customer['persona']
+    internal_wishlist = customer['wishlist']
+    current_request_text = customer['request_text']
+    request_embedding = customer['embedding']
+    print(f"새로운 고객 (선반입): {current_persona['name']} / 남은 고객 {customer_queue.stats()}")
+    print(f"[요구 가구]: {internal_wishlist}")
+    print(f"새로운 의뢰서: {current_request_text}")
+
 # --- 게임 로직 함수 ---
 def reset_game(eval=False):
     """'초기화' 버튼 클릭 시 게임 상태를 리셋합니다."""
-    global current_persona, current_request_text, request_embedding, placed_furniture, evaluation_result, internal_wishlist, door_position, is_evaluating, show_feedback_popup, is_feedback_hidden
+    global current_request_text, placed_furniture, evaluation_result, door_position, is_evaluating, show_feedback_popup, is_feedback_hidden, is_generating_request
     print("--- 게임 초기화 ---")
     
     # 1. 가구 배치 초기화
     placed_furniture = []
+    design_facts.clear()
+    occupancy.clear()
+    if speculator:
+        speculator.invalidate()
 
     if eval:
         # 2. 평가 결과 초기화
@@ -170,22 +305,37 @@ def reset_game(eval=False):
         # 3. 새 문 생성 (수정: utils 사용)
         # --- (수정) config 모듈 자체를 전달 ---
         door_position = utils.create_new_door(config)
+        occupancy.set_door(door_position)
         
-        # 4. 새 고객 생성
-        current_persona, internal_wishlist, current_request_text = client.generate_request(model_manager)
-
-        # 5. 새 임베딩 생성
-        if model_manager and model_manager.is_ready:
-            request_embedding = model_manager.get_embedding(current_request_text)
-        else:
-            request_embedding = [0.1] * 128
-            
-        print(f"새로운 고객: {current_persona['name']}")
-        print(f"[요구 가구]: {internal_wishlist}")
-        print(f"새로운 의뢰서: {current_request_text}")
+        # 4~5. (수정) 미리 준비된 고객이 있으면 즉시 교체
+        customer = customer_queue.pop() if customer_queue else None
+        if customer:
+            apply_customer(customer)
+            return
+
+        # 큐가 비어 있으면 새 고객 생성 (별도 스레드, 의뢰서는 생성되는 대로 표시)
+        is_generating_request = True
+        current_request_text = ""
+        request_thread = threading.Thread(target=generate_new_customer, daemon=True)
+        request_thread.start()
 
 # ========= 변수 초기화 (게임 루프 전) =========
 placed_furniture = []
+design_facts = DesignFacts(config.ROOM_WIDTH_GRID, config.ROOM_HEIGHT_GRID) # (신규) 배치/제거 시 O(1)로 갱신되는 사실 데이터
+occupancy = OccupancyGrid(config.ROOM_WIDTH_GRID, config.ROOM_HEIGHT_GRID)    # (신규) 충돌 판정 / 클릭한 가구 찾기용 격자
+
+# (신규) 배치를 잠시 멈추면 묘사/평가자 점수를 미리 계산 (단일 호출 평가 모드에서는 사용하지 않음)
+speculator = None
+if config.SPECULATIVE_EVAL_ENABLED and not config.EVALUATION_SINGLE_PASS:
+    speculator = SpeculativeEvaluator(model_manager, config.ROOM_WIDTH_GRID, config.ROOM_HEIGHT_GRID)
+
+# (신규) 평가 결과 캐시 (배치 지문 + 의뢰서 + 위시리스트 -> 묘사/점수/피드백)
+result_cache = EvaluationResultCache() if config.EVALUATION_CACHE_ENABLED else None
+
+# (신규) 다시 받기 / 초기화 때 바로 꺼내 쓸 고객을 백그라운드에서 미리 생성
+customer_queue = None
+if config.CUSTOMER_QUEUE_ENABLED and model_manager and model_manager.is_ready:
+    customer_queue = CustomerQueue(model_manager, request_pool=request_pool).start()
 selected_furniture_index = 0
 selected_furniture_rotation = 0 # 0: 기본, 1: 90도
 ui_buttons = []
@@ -211,9 +361,16 @@ is_feedback_hidden = False
 popup_close_button_rect = None
 popup_toggle_button_rect = None
 
+# (신규) 스트리밍 상태 변수
+streaming_stage = ""            # 평가 오버레이에 표시할 현재 단계
+streaming_text = ""             # 평가 오버레이에 표시할 부분 텍스트
+provisional_score = None        # (신규) AI 평가자 점수가 나오기 전 표시할 규칙 기반 점수
+is_generating_request = False   # 새 고객 의뢰서 생성(스트리밍) 중 여부
+
 eval = False
 # utils 사용
 door_position = utils.create_new_door(config)
+occupancy.set_door(door_position)
 
 running = True
 
@@ -237,9 +394,14 @@ while running:
                 (mouse_grid_x, mouse_grid_y), 
                 selected_furniture_rotation, 
                 placed_furniture,
-                door_position
+                door_position,
+                occupancy=occupancy
             )
 
+        # (신규) 배치가 충분히 오래 그대로면 추측 사전 평가 시작
+        if speculator and placed_furniture and not is_generating_request and speculator.should_start():
+            speculator.start(design_facts.report(), current_request_text, internal_wishlist, placed_furniture)
+
     # ========= 이벤트 처리 =========
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -266,7 +428,7 @@ while running:
                 selected_furniture_rotation = (selected_furniture_rotation + 1) % 2
             
             if event.key == pygame.K_e: # 'E' 키로 평가
-                if not evaluation_result and not is_evaluating:
+                if not evaluation_result and not is_evaluating and not is_generating_request:
                     is_evaluating = True
                     run_evaluation_thread() # 함수 호출
         
@@ -297,22 +459,28 @@ while running:
                 # 3. 게임 영역(배치) 클릭
                 elif game_area_rect.collidepoint(mouse_pos):
                     if is_placeable:
-                        placed_furniture.append({
+                        new_furniture = {
                             "item": current_item,
                             "grid_pos": (mouse_grid_x, mouse_grid_y),
                             "rotation": selected_furniture_rotation
-                        })
+                        }
+                        placed_furniture.append(new_furniture)
+                        design_facts.add(new_furniture)
+                        occupancy.add(new_furniture)
+                        if speculator:
+                            speculator.invalidate()
                 # 4. 오른쪽 UI 버튼 클릭
                 elif right_ui_rect.collidepoint(mouse_pos):
                     if exit_button_rect and exit_button_rect.collidepoint(mouse_pos):
                         running = False
 
                     elif reroll_customer_button_rect and reroll_customer_button_rect.collidepoint(mouse_pos):
-                        print("--- 고객 다시 받기 ---")
-                        reset_game(eval=True)
+                        if not is_generating_request:
+                            print("--- 고객 다시 받기 ---")
+                            reset_game(eval=True)
 
                     elif evaluate_button_rect and evaluate_button_rect.collidepoint(mouse_pos):
-                        if not evaluation_result and not is_evaluating:
+                        if not evaluation_result and not is_evaluating and not is_generating_request:
                             is_evaluating = True
                             run_evaluation_thread() # 함수 호출
 
@@ -322,16 +490,14 @@ while running:
             if event.button == 3: # 우클릭: 가구 제거
                 if not is_evaluating and not show_feedback_popup:
                     if game_area_rect.collidepoint(mouse_pos):
-                        sorted_for_click = sorted(placed_furniture, key=lambda f: (f['grid_pos'][1], f['grid_pos'][0]), reverse=True)
-                        
-                        for f in sorted_for_click:
-                            # utils 사용
-                            f_size_visual = utils.get_rotated_size(f['item'], f['rotation'])
-                            f_rect_base = pygame.Rect(f['grid_pos'][0], f['grid_pos'][1], f_size_visual[0], 1)
-                            
-                            if f_rect_base.collidepoint(mouse_grid_x, mouse_grid_y):
-                                placed_furniture.remove(f)
-                                break 
+                        # (수정) 커서 아래 바닥 격자를 차지한 가구를 격자에서 바로 조회
+                        f = occupancy.piece_at(mouse_grid_x, mouse_grid_y)
+                        if f is not None:
+                            placed_furniture.remove(f)
+                            design_facts.remove(f)
+                            occupancy.remove(f)
+                            if speculator:
+                                speculator.invalidate()
 
     # ========= 그리기 =========
     
@@ -420,7 +586,10 @@ while running:
         text_x = post_it_rect.x + 20
         text_y = post_it_rect.y + 25
         
-        persona_name_text = font_Pencil_M.render(current_persona['name'], True, (30,30,30))
+        # (신규) 의뢰서 생성 중에는 이전 고객 대신 자리 표시 텍스트를 보여줌
+        show_persona = current_persona and not is_generating_request
+        persona_name_str = current_persona['name'] if show_persona else "새 고객"
+        persona_name_text = font_Pencil_M.render(persona_name_str, True, (30,30,30))
         screen.blit(persona_name_text, (text_x, text_y))
 
         # 고객 다시 받기 버튼
@@ -439,7 +608,7 @@ while running:
         reroll_text_rect = reroll_text.get_rect(center=reroll_customer_button_rect.center)
         screen.blit(reroll_text, reroll_text_rect)
 
-        persona_info_str = f"{current_persona['job']}"
+        persona_info_str = f"{current_persona['job']}" if show_persona else "의뢰서 작성 중..."
         persona_info_text = font_Pencil_M.render(persona_info_str, True, (80, 80, 80))
         screen.blit(persona_info_text, (text_x, text_y + 30))
 
@@ -451,7 +620,7 @@ while running:
         
         ui_y_offset = draw_text_multiline(
             screen, 
-            current_request_text, 
+            current_request_text or "", 
             (text_x, request_y_start + 30),
             font_Pencil_M,
             post_it_rect.width - 40,
@@ -476,7 +645,7 @@ while running:
         evaluate_button_rect = pygame.Rect(config.GAME_AREA_WIDTH + 10, ui_y_offset, config.RIGHT_UI_MARGIN - 20, 50)
         mouse_over_button = evaluate_button_rect.collidepoint(mouse_pos)
         
-        if is_evaluating:
+        if is_evaluating or is_generating_request:
             button_color = config.EVAL_BTN_DISABLED_COLOR
         else:
             button_color = config.EVAL_BTN_HOVER_COLOR if mouse_over_button else config.EVAL_BTN_COLOR
@@ -531,9 +700,39 @@ while running:
 
     if is_evaluating:
         center_x, center_y = config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2
-        loading_text = font_L.render("피드백 생성 중...", True, (255, 255, 255))
+        loading_text = font_L.render(streaming_stage or "피드백 생성 중...", True, (255, 255, 255))
         loading_rect = loading_text.get_rect(center=(center_x, center_y))
         screen.blit(loading_text, loading_rect)
+
+        # (신규) 규칙 기반 잠정 점수 (AI 평가자 점수가 나오면 팝업에서 교체됨)
+        if provisional_score is not None:
+            if star_full_img and star_half_img and star_empty_img:
+                stars_width = 5 * star_full_img.get_width() + 4 * 4
+                stars_y = center_y - 50 - star_full_img.get_height()
+                draw_star_rating(
+                    screen,
+                    provisional_score,
+                    (center_x - stars_width // 2, stars_y),
+                    star_full_img, star_half_img, star_empty_img
+                )
+            else:
+                stars_y = center_y - 80
+                score_text = font_L.render(f"Score: {provisional_score:.1f} / 5.0", True, (255, 255, 255))
+                screen.blit(score_text, score_text.get_rect(center=(center_x, stars_y + 15)))
+            hint_text = font_M.render("예상 점수 (고객이 평가하는 중...)", True, (220, 220, 220))
+            screen.blit(hint_text, hint_text.get_rect(center=(center_x, stars_y - 20)))
+
+        # (신규) 스트리밍 중인 부분 텍스트를 진행 상황으로 표시
+        if streaming_text:
+            stream_width = config.SCREEN_WIDTH // 2
+            draw_text_multiline(
+                screen,
+                streaming_text,
+                (center_x - stream_width // 2, center_y + 40),
+                font_Pencil_M,
+                stream_width,
+                (230, 230, 230)
+            )
         
     elif show_feedback_popup:
         if evaluation_result:
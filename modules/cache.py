@@ -0,0 +1,226 @@
+# cache.py
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+class _Flight:
+    """(내부 헬퍼 클래스) 진행 중인 백엔드 요청 1건. 같은 키의 호출자들이 결과를 공유합니다."""
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+class ResponseCache:
+    """
+    LLM 응답(채팅/임베딩)용 2단 캐시입니다.
+    - 메모리: 크기 제한 LRU
+    - 디스크(선택): 키마다 JSON 파일 1개, 재시작 후에도 유지
+    두 계층 모두 TTL이 지나면 만료되고, 같은 키로 동시에 들어온 요청은
+    백엔드 호출 1번을 공유합니다 (singleflight).
+    """
+    def __init__(self, max_entries=256, ttl=None, disk_dir=None, max_disk_entries=2048):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+
+        self._memory = OrderedDict() # key -> (created, cost, value)
+        self._inflight = {}          # key -> _Flight
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.saved_seconds = 0.0     # 캐시 덕분에 아낀 백엔드 시간 (원래 호출에 걸린 시간의 합)
+
+        self._disk_count = 0         # (신규) 디스크 항목 수 (쓰기마다 디렉터리를 훑지 않도록 메모리에서 셈)
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._disk_count = len(self._list_disk())
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """(model, messages, options) 등 JSON으로 표현 가능한 값들로 캐시 키를 만듭니다."""
+        raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _is_expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def get(self, key: str):
+        """
+        캐시를 조회합니다. (found, value) 튜플을 반환합니다.
+        메모리에 없으면 디스크를 확인하고, 찾으면 메모리로 올립니다.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, cost, value = entry
+                if not self._is_expired(created):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.saved_seconds += cost
+                    return True, value
+                del self._memory[key]
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            created, cost, value = entry
+            with self._lock:
+                self._store_memory(key, entry)
+                self.hits += 1
+                self.disk_hits += 1
+                self.saved_seconds += cost
+            return True, value
+
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def put(self, key: str, value, cost: float = 0.0):
+        """값을 메모리(와 디스크)에 저장합니다. cost는 백엔드 호출에 걸린 시간(초)입니다."""
+        entry = (time.time(), cost, value)
+        with self._lock:
+            self._store_memory(key, entry)
+        self._write_disk(key, entry)
+
+    def get_or_compute(self, key: str, compute):
+        """
+        캐시에 있으면 바로 반환하고, 없으면 compute()를 호출해 저장합니다.
+        같은 키로 이미 계산 중인 호출이 있으면 그 결과를 기다려 공유합니다.
+        compute()가 예외를 던지면 캐시하지 않고 모든 대기자에게 예외를 전달합니다.
+        """
+        found, value = self.get(key)
+        if found:
+            return value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+            else:
+                self.coalesced += 1
+
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            start = time.perf_counter()
+            flight.value = compute()
+            self.put(key, flight.value, time.perf_counter() - start)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def stats(self) -> dict:
+        """히트/미스 카운터와 절약한 시간을 반환합니다."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "saved_seconds": self.saved_seconds,
+                "memory_entries": len(self._memory),
+            }
+
+    def clear(self):
+        """메모리와 디스크의 모든 항목을 삭제합니다."""
+        with self._lock:
+            self._memory.clear()
+        if self.disk_dir:
+            for path in self._list_disk():
+                self._remove_disk(path)
+
+    # --- 내부 헬퍼 (메모리) ---
+    def _store_memory(self, key: str, entry: tuple):
+        """(lock을 잡은 상태에서 호출) LRU에 넣고 크기를 넘으면 가장 오래된 항목을 버립니다."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # --- 내부 헬퍼 (디스크) ---
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _list_disk(self) -> list:
+        return [os.path.join(self.disk_dir, n) for n in os.listdir(self.disk_dir) if n.endswith('.json')]
+
+    def _read_disk(self, key: str):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"캐시 파일 읽기 실패 ({path}): {e}", file=sys.stderr)
+            return None
+
+        if self._is_expired(data['created']):
+            self._remove_disk(path)
+            return None
+
+        os.utime(path) # 최근 사용 시각 갱신 (디스크 LRU 기준)
+        return data['created'], data['cost'], data['value']
+
+    def _write_disk(self, key: str, entry: tuple):
+        if not self.disk_dir:
+            return
+        created, cost, value = entry
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            is_new = not os.path.exists(path)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"created": created, "cost": cost, "value": value}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            if is_new:
+                with self._lock:
+                    self._disk_count += 1
+                    overflow = self._disk_count > self.max_disk_entries
+                if overflow:
+                    self._evict_disk()
+        except Exception as e:
+            print(f"캐시 파일 쓰기 실패 ({path}): {e}", file=sys.stderr)
+
+    def _evict_disk(self):
+        """
+        (수정) 항목 수(_disk_count)가 한도를 넘었을 때만 호출됩니다.
+        가장 오래 사용되지 않은 파일부터 삭제하고, 디렉터리를 훑은 김에 실제 항목 수로 다시 맞춥니다.
+        """
+        entries = self._list_disk()
+        entries.sort(key=lambda p: os.path.getmtime(p))
+        overflow = len(entries) - self.max_disk_entries
+        with self._lock:
+            self._disk_count = len(entries)
+        for path in entries[:max(0, overflow)]:
+            self._remove_disk(path)
+
+    def _remove_disk(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._disk_count -= 1
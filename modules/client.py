@@ -1,8 +1,11 @@
 # client.py
 import random
 
+import config
+from . import prompts
 from .model import ModelManager
 from templates.personas import PERSONAS
+from templates.request_examples import REQUEST_EXAMPLE_BANK
 
 DEFAULT_PERSONA = PERSONAS[0] 
 
@@ -11,12 +14,63 @@ FURNITURE_NAMES_LIST = "작은 소파, 큰 소파, 테이블, 1인 침대, 2인
 
 FURNITURE_LIST_AS_LIST = [item.strip() for item in FURNITURE_NAMES_LIST.split(',') if item.strip()]
 
+# (신규) 의뢰서 예시 색인: 가구 이름(핵심 명사) -> 예시 번호 목록
+_EXAMPLES_BY_NAME = {}
+for _number, (_names, _) in enumerate(REQUEST_EXAMPLE_BANK):
+    for _name in _names:
+        _EXAMPLES_BY_NAME.setdefault(_name, []).append(_number)
+
+def select_request_examples(wishlist: list, per_item: int = None, extra: int = None) -> str:
+    """
+    (신규) 위시리스트 가구와 관련된 예시(가구당 최대 per_item개)와
+    다른 가구의 예시 extra개(다양성 유지용)만 골라 프롬프트용 텍스트로 만듭니다.
+    같은 위시리스트에는 항상 같은 예시를 고릅니다 (프롬프트가 바뀌지 않도록 무작위 선택 없음).
+    """
+    per_item = config.REQUEST_EXAMPLES_PER_ITEM if per_item is None else per_item
+    extra = config.REQUEST_EXAMPLES_EXTRA if extra is None else extra
+
+    selected, related = [], set()
+    for name in wishlist:
+        matches = _EXAMPLES_BY_NAME.get(name) or _EXAMPLES_BY_NAME.get(name.split()[-1], [])
+        related.update(matches)
+        selected.extend(number for number in matches[:per_item] if number not in selected)
+
+    others = [number for number in range(len(REQUEST_EXAMPLE_BANK)) if number not in related]
+    if extra > 0 and others:
+        step = max(1, len(others) // extra)
+        selected.extend(others[::step][:extra])
+
+    lines = []
+    for number in sorted(selected):
+        names, phrase = REQUEST_EXAMPLE_BANK[number]
+        lines.append(f"   (예: {', '.join(repr(n) for n in names)} -> '{phrase}')\n")
+    return "".join(lines)
+
+# (신규) 의뢰서 생성 프롬프트의 고정 접두부 (고객/위시리스트/예시는 사용자 프롬프트에)
+REQUEST_SYSTEM_PROMPT = (
+    "당신은 인테리어 디자인 게임의 고객을 연기합니다. 고객은 지금 디자이너에게 방을 의뢰할 것입니다.\n"
+    "고객의 상세 정보와 고객이 **마음 속으로 원하는 가구**([비밀 위시리스트])는 사용자 메시지로 주어집니다.\n\n"
+    "**당신의 임무:**\n"
+    "1. 이 [비밀 위시리스트]의 **가구 이름을 절대 직접 말하지 마세요.**\n"
+    "2. 대신, 그 가구들이 왜 필요한지 '목적'이나 '행위'를 암시하는 방식으로 **매우 모호하게** 1-2 문장으로 묘사하세요.\n"
+    "3. 고객의 말투를 완벽하게 반영하세요.\n"
+    "4. **다른 말은 절대 하지 마세요.** 오직 고객의 말투로 된 '모호한 의뢰서' 텍스트만 반환하세요.\n"
+    "   [예시]의 '가구 -> 표현'처럼 가구를 드러내지 않고 암시하세요.\n"
+)
+
 # --- 1. 동적 의뢰서 생성 ---
-def generate_request(model_manager: ModelManager) -> str:
+def pick_wishlist(rng=random) -> list:
+    """(신규) '비밀 위시리스트' (가구 3~5개)를 무작위로 선정합니다."""
+    k = rng.randint(3, 5) # 3~5개
+    return rng.sample(FURNITURE_LIST_AS_LIST, k)
+
+def generate_request(model_manager: ModelManager, on_token=None, persona: dict = None, wishlist: list = None) -> str:
     """
     (수정) 2단계 순서 변경. 위시리스트를 먼저 뽑고, 그에 맞는 의뢰서를 생성합니다.
     1. [사실] '비밀 위시리스트' (가구 3~5개)를 무작위로 선정합니다.
     2. [창의] 페르소나에 몰입해, 이 위시리스트를 '암시'하는 '모호한 의뢰서'를 생성합니다.
+    (신규) on_token이 주어지면 의뢰서가 생성되는 동안 부분 텍스트를 on_token(text)으로 전달합니다.
+    (신규) persona / wishlist를 주면 무작위 선정 대신 그 값을 사용합니다 (오프라인 의뢰서 풀 생성용).
     """
     print("고객 요구사항 생성 중... (위시리스트 우선 생성)\n")
     
@@ -32,57 +86,31 @@ def generate_request(model_manager: ModelManager) -> str:
 
     try:
         # --- 1단계: (신규) 비밀 위시리스트 무작위 선정 ---
-        k = random.randint(3, 5) # 3~5개
-        internal_wishlist = random.sample(FURNITURE_LIST_AS_LIST, k)
+        internal_wishlist = list(wishlist) if wishlist else pick_wishlist()
         print(f"  [1단계] 비밀 위시리스트 생성: {internal_wishlist}")
 
         # --- 2단계: (신규) 위시리스트 기반 '모호한 의뢰서' 생성 ---
         print("  [2단계] 위시리스트 기반 의뢰서 생성 중...")
-        selected_persona = random.choice(PERSONAS)
+        selected_persona = persona or random.choice(PERSONAS)
         
-        system_prompt = (
+        # (수정) 임무 설명은 모든 고객에게 같은 고정 접두부(시스템 프롬프트), 고객별 정보는 그 뒤에 배치
+        system_prompt = REQUEST_SYSTEM_PROMPT
+        user_prompt = (
             f"당신은 고객 '{selected_persona['name']}'입니다. 당신의 상세 정보는 다음과 같습니다:\n"
             f"- 취향: {selected_persona['taste']}\n"
             f"- 성향: {selected_persona['tendency']}\n"
             f"- 말투: {selected_persona['tone']}\n\n"
-            "당신은 지금 디자이너에게 방을 의뢰할 것입니다. 당신이 **마음 속으로 원하는 가구**는 다음과 같습니다.\n"
             f"[비밀 위시리스트]: {', '.join(internal_wishlist)}\n\n"
-            "**당신의 임무:**\n"
-            "1. 이 [비밀 위시리스트]의 **가구 이름을 절대 직접 말하지 마세요.**\n"
-            "2. 대신, 그 가구들이 왜 필요한지 '목적'이나 '행위'를 암시하는 방식으로 **매우 모호하게** 1-2 문장으로 묘사하세요.\n"
-            "3. 당신의 페르소나 말투({selected_persona['tone']})를 완벽하게 반영하세요.\n"
-            "4. **다른 말은 절대 하지 마세요.** 오직 당신의 말투로 된 '모호한 의뢰서' 텍스트만 반환하세요.\n\n"
-            "   (예: '소파' -> '편안히 기댈 곳이 필요해요.')\n"
-            "   (예: '소파' -> '편안한 느낌이 좋아요.')\n"
-            "   (예: '소파' -> '앉을 곳이 있으면 좋겠어요.')\n"
-            "   (예: '스토브' -> '집에서 요리하는 것을 좋아합니다.')\n"
-            "   (예: '스토브' -> '가족이 모여 식사할 수 있는 곳')\n"
-            "   (예: '냉장고' -> '부엌이 중요합니다.')\n"
-            "   (예: '냉장고' -> '사람은 먹어야 하니까요.')\n"
-            "   (예: '옷걸이' -> '옷을 정리할 수 있는 공간이 필요해요.')\n"
-            "   (예: '옷장' -> '저는 옷이 많기 때문에 정리 공간이 필요해요.')\n"
-            "   (예: '욕조' -> '저는 물에 들어가 멍때리는 것을 좋아해요.')\n"
-            "   (예: '벽난로' -> '따뜻하고 편안해야 해요.')\n"
-            "   (예: '식탁' -> '가족들이 모여 대화할 수 있는 공간이 필요해요.')\n"
-            "   (예: '시계' -> '고급적인 장식이 있으면 좋아요.')\n"
-            "   (예: '시계' -> '나는 시간이 중요한 사람이에요.')\n"
-            "   (예: '다리미판' -> '저는 패션에 관심이 많아요.')\n"
-            "   (예: '다리미판' -> '매일 옷 입는 것을 걱정해요.')\n"
-            "   (예: '거울' -> '저는 패션에 관심이 많아요.')\n"
-            "   (예: '거울' -> '매일 옷 입는 것을 걱정해요.')\n"
-            "   (예: '화분' -> '마음을 진정시켜줄 친구가 필요해요.')\n"
-            "   (예: '화분' -> '저는 평화로운 느낌이 좋아요.')\n"
-            "   (예: '선반' -> '제 물건이 많아서 이걸 정리해야 해요.')\n"
-            "   (예: '선반' -> '여러 물건을 올릴 수 있으면 좋겠다.')\n"
-            "   (예: '컴퓨터', '책장' -> '밤에 조용히 작업할 공간이 필요해요.')\n"
-            "   (예: '책장' -> '나의 지식을 보관할 장소가 있으면 좋겠어요.')\n\n"
+            "[예시]\n" + select_request_examples(internal_wishlist) + "\n"
+            "당신의 페르소나와 [비밀 위시리스트]에 100% 몰입하여, 지금 바로 '모호한 의뢰서' 텍스트만 작성하세요."
         )
-        
-        user_prompt = "당신의 페르소나와 [비밀 위시리스트]에 100% 몰입하여, 지금 바로 '모호한 의뢰서' 텍스트만 작성하세요."
 
         # (신규) LLM 호출 (1회)
-        request_text = model_manager.get_chat_response(system_prompt, user_prompt)
-        request_text = request_text.strip().replace('"', '') # 따옴표 제거
+        stream_callback = None
+        if on_token:
+            stream_callback = lambda partial: on_token(_clean_request_text(partial))
+        request_text = model_manager.get_chat_response(system_prompt, user_prompt, on_token=stream_callback, profile="request")
+        request_text = _clean_request_text(request_text) # 따옴표 제거
         
         if not request_text or "🚨" in request_text:
              raise Exception("2단계 의뢰서 텍스트 생성 실패")
@@ -97,40 +125,131 @@ def generate_request(model_manager: ModelManager) -> str:
         print(f"LLM 의뢰서 생성 실패 ({e}). 재시도를 위해 None을 반환합니다.")
         return None, None, None # main.py의 재시도 로직이 처리
 
+# --- 1-1. (신규) 여러 고객 의뢰서를 한 번에 생성 ---
+
+def _leaked_names(text: str, wishlist: list) -> list:
+    """의뢰서에 그대로 드러난 위시리스트 가구 이름 (예: '작은 소파'는 '소파'만 나와도 누출로 봄)."""
+    leaked = []
+    for name in wishlist:
+        if name in text or name.split()[-1] in text:
+            leaked.append(name)
+    return leaked
+
+def _batch_request_schema(count: int) -> dict:
+    """고객 count명의 의뢰서를 순서대로 담은 JSON 배열 스키마."""
+    return {
+        "type": "object",
+        "properties": {
+            "requests": {"type": "array", "items": {"type": "string"}, "minItems": count, "maxItems": count}
+        },
+        "required": ["requests"],
+    }
+
+def generate_requests_batch(model_manager: ModelManager, jobs: list, max_retries: int = None) -> list:
+    """
+    (신규) 여러 (persona, wishlist) 쌍의 '모호한 의뢰서'를 LLM 호출 1번으로 생성합니다.
+    공통 지시문/예시는 시스템 프롬프트에 한 번만 넣고, 고객별 정보만 사용자 프롬프트에 나열해 JSON 배열로 받습니다.
+    위시리스트 가구 이름이 드러났거나 비어 있는 항목만 골라 최대 max_retries번 다시 요청합니다.
+    jobs와 같은 순서로 (persona, wishlist, request_text) 또는 실패한 자리에는 None을 담은 리스트를 반환합니다.
+    """
+    max_retries = config.REQUEST_BATCH_RETRIES if max_retries is None else max_retries
+    results = [None] * len(jobs)
+    if not jobs or not model_manager or not model_manager.is_ready:
+        return results
+
+    # (수정) 고정 접두부(시스템 프롬프트)는 단일 생성과 공유, 예시는 재시도해도 바뀌지 않도록 고객 목록 앞에 배치
+    system_prompt = REQUEST_SYSTEM_PROMPT
+    examples = "[예시]\n" + select_request_examples(sorted({name for _, wishlist in jobs for name in wishlist})) + "\n"
+
+    pending = list(range(len(jobs)))
+    for attempt in range(max_retries + 1):
+        customers = []
+        for number, index in enumerate(pending, 1):
+            persona, wishlist = jobs[index]
+            customers.append(
+                f"[고객 {number}] {persona['name']}\n"
+                f"- 취향: {persona['taste']}\n"
+                f"- 성향: {persona['tendency']}\n"
+                f"- 말투: {persona['tone']}\n"
+                f"- [비밀 위시리스트]: {', '.join(wishlist)}"
+            )
+        user_prompt = (
+            examples + "\n\n".join(customers)
+            + f"\n\n여러 고객을 동시에 연기하여, 위 고객 {len(pending)}명의 '모호한 의뢰서'를 "
+            "고객 순서대로 requests 배열에 담아 JSON으로 반환하세요."
+        )
+
+        # 재시도마다 seed를 바꿔 응답 캐시에서 같은 (실패한) 결과를 다시 받지 않도록 함
+        options = {"num_predict": config.REQUEST_BATCH_TOKENS_PER_ITEM * len(pending) + 32, "seed": attempt}
+        print(f"고객 의뢰서 {len(pending)}개 일괄 생성 중... (시도 {attempt + 1})")
+        data = model_manager.get_json_response(
+            system_prompt, user_prompt, _batch_request_schema(len(pending)), options=options, profile="request_batch"
+        )
+        texts = data.get('requests') if isinstance(data, dict) else None
+        if not isinstance(texts, list):
+            # 문자열 등 배열이 아닌 응답은 글자 단위로 잘못 나뉘지 않도록 이번 시도 전체를 실패로 처리
+            print(f"고객 의뢰서 일괄 생성 응답 형식 오류 (시도 {attempt + 1}): {type(texts).__name__}")
+            texts = []
+
+        failed = []
+        for number, index in enumerate(pending):
+            text = _clean_request_text(texts[number]) if number < len(texts) and isinstance(texts[number], str) else ""
+            persona, wishlist = jobs[index]
+            leaked = _leaked_names(text, wishlist)
+            if not text or "🚨" in text or leaked:
+                if leaked:
+                    print(f"  [고객 {number + 1}] 위시리스트 누출 {leaked}: {text}")
+                failed.append(index)
+            else:
+                results[index] = (persona, list(wishlist), text)
+
+        pending = failed
+        if not pending:
+            break
+
+    if pending:
+        print(f"고객 의뢰서 {len(pending)}개 생성 실패 (재시도 {max_retries}회 후)")
+    return results
+
 # --- 2. 상세 피드백 생성 ---
 
-def generate_feedback(model_manager: ModelManager, persona: dict, request: str, internal_wishlist: list, design_description: str, score: float) -> str:
+def generate_feedback(model_manager: ModelManager, persona: dict, request: str, internal_wishlist: list, design_description: str, score: float, on_token=None) -> str:
     """
     ModelManager의 채팅 모델을 사용해
     점수에 기반한 상세한 고객 피드백을 생성합니다.
+    (신규) on_token이 주어지면 피드백이 생성되는 동안 부분 텍스트를 on_token(text)으로 전달합니다.
     """
     print("📄 고객 피드백 생성 중...")
     
-    # AI에게 '평가자' 역할을 부여하는 시스템 프롬프트
-    # (신규) 페르소나 기반 시스템 프롬프트
-    system_prompt = (
-        f"당신은 고객 '{persona['name']}'입니다. "
-        f"당신의 성격과 말투는 다음과 같습니다: {persona['tendency']}\n"
-        "당신은 방금 디자이너의 작업에 점수를 매겼습니다. "
-        "당신의 성격과 말투에 100% 몰입하여, '왜' 그 점수를 주었는지 1-2문장의 구체적인 피드백을 한글로 작성하세요. "
-        "점수가 높으면 당신의 방식대로 칭찬하고, 낮으면 당신의 방식대로 비판하세요."
+    # (수정) 묘사/평가자와 같은 고정 접두부 + 공개 의뢰서 + 데이터 리포트, 페르소나/위시리스트/점수는 맨 끝 작업 지시에
+    # (design_description에 밀도/공간 정보가 포함됨)
+    system_prompt = prompts.EVALUATION_SYSTEM_PROMPT
+    user_prompt = prompts.evaluation_prompt(
+        request, design_description, prompts.TASK_FEEDBACK,
+        prompts.persona_line(persona)
+        + f"내 평점: {score:.1f} / 5.0\n"
+        "이것을 참고하여 고객으로서 디자이너에게 피드백을 작성하세요.",
+        internal_wishlist=internal_wishlist or []
     )
     
-    wishlist_str = ", ".join(internal_wishlist) if internal_wishlist else "특별히 없음"
-    
-    user_prompt = (
-        f"나의 원래 요구사항: \"{request}\"\n"
-        f"(내가 마음 속으로 원했던 것: {wishlist_str})\n"
-        f"디자이너의 결과물 (상세 묘사): \"{design_description}\"\n" # <--- 이 묘사에 밀도/공간 정보가 포함됨
-        f"내 평점: {score:.1f} / 5.0\n\n"
-        "이것을 참고하여 고객으로서 디자이너에게 피드백을 작성하세요.\n"
-        "1. (필수) 내 비밀 요구사항(Wishlist)이 충족되지 않았다면 그 점을 불만스럽게 지적하세요.\n"
-        "2. (필수) '디자이너의 결과물' 묘사를 보고, 방의 '밀도'나 '공간 배치'(중앙부, 벽가 등)에 대해서도 한마디 언급하세요.\n"
-        "(예: '중앙부가 비어있어 좋네요', '너무 빽빽해서 답답해요', '입구 근처에 가구가 많아 불편해요')"
-    )
-    
-    feedback_text = model_manager.get_chat_response(system_prompt, user_prompt)
-    feedback_text = feedback_text.strip()
+    stream_callback = None
+    if on_token:
+        stream_callback = lambda partial: on_token(_clean_feedback_text(partial))
+    feedback_text = model_manager.get_chat_response(system_prompt, user_prompt, on_token=stream_callback, profile="feedback")
+    feedback_text = _clean_feedback_text(feedback_text)
+        
+    print("[ 피드백 ]")
+    return feedback_text
+
+# --- 응답 후처리 헬퍼 (스트리밍 중간 텍스트에도 동일하게 적용) ---
+
+def _clean_request_text(text: str) -> str:
+    """의뢰서 텍스트에서 따옴표와 앞뒤 공백을 제거합니다."""
+    return text.strip().replace('"', '')
+
+def _clean_feedback_text(text: str) -> str:
+    """피드백 텍스트에서 번역 태그 이후 부분과 따옴표를 제거합니다."""
+    feedback_text = text.strip()
         
     # "Translation" 태그가 있는지 확인하고, 있다면 그 앞부분만 잘라냄
     # .split('Translation')은 태그가 없으면 [전체 텍스트]를,
@@ -139,8 +258,4 @@ def generate_feedback(model_manager: ModelManager, persona: dict, request: str,
     feedback_text = feedback_text.split('T')[0]
     
     # 3. (기존) 불필요한 따옴표를 제거하고, 잘라낸 후 남았을지 모를 공백을 다시 제거
-    feedback_text = feedback_text.replace('"', '').strip()
-    # ---
-        
-    print("[ 피드백 ]")
-    return feedback_text
\ No newline at end of file
+    return feedback_text.replace('"', '').strip()
\ No newline at end of file
@@ -0,0 +1,142 @@
+# customer_queue.py
+import collections
+import random
+import sys
+import threading
+import time
+
+import config
+from . import client
+from .model import LazyEmbedding
+from templates.personas import PERSONAS
+
+def make_customer(model_manager, persona, wishlist, request_text) -> dict:
+    """게임에 바로 띄울 수 있는 고객 1명 (페르소나, 위시리스트, 의뢰서, 지연 임베딩)."""
+    embedding = LazyEmbedding(model_manager, request_text, fallback=[0.1] * 128)
+    if config.CUSTOMER_QUEUE_PREFETCH_EMBEDDING:
+        embedding.get() # (작업자 스레드) 임베딩까지 미리 계산
+    return {"persona": persona, "wishlist": wishlist, "request_text": request_text, "embedding": embedding}
+
+class CustomerQueue:
+    """
+    (신규) 준비된 고객 선반입 큐.
+    백그라운드 작업자가 client.generate_request로 고객을 미리 만들어 최대 depth명까지 쌓아 둡니다.
+    - 보충 정책: 남은 고객이 refill_at명 이하로 떨어지면 depth명이 될 때까지 다시 채움
+    - pause() 중(평가 등 LLM을 먼저 써야 할 때)에는 새 요청을 보내지 않음
+    - 생성에 실패한 고객(페르소나 None)은 큐에 넣지 않고, 연속 실패 시 대기 시간을 늘려 재시도
+    - request_pool(RequestPool)이 주어지면 미리 생성한 의뢰서를 먼저 쓰고, 풀이 바닥나면 실시간 생성
+      (pop()으로 내보낸 고객만 풀 사용 기록에 남김)
+    - 실시간 생성은 모자란 고객 수만큼 client.generate_requests_batch로 한 번에 요청
+    pop()은 기다리지 않고 바로 고객을 꺼내며, 비어 있으면 None을 반환합니다 (호출한 쪽에서 직접 생성).
+    """
+    def __init__(self, model_manager, depth: int = None, refill_at: int = None, request_pool=None):
+        self.model_manager = model_manager
+        self.request_pool = request_pool
+        self.depth = depth or config.CUSTOMER_QUEUE_DEPTH
+        self.refill_at = config.CUSTOMER_QUEUE_REFILL_AT if refill_at is None else refill_at
+
+        self._queue = collections.deque()
+        self._cond = threading.Condition()
+        self._filling = True                 # True면 depth가 될 때까지 보충 중
+        self._paused = False
+        self._stopped = False
+        self._thread = None
+
+        self.produced = 0
+        self.served = 0
+        self.misses = 0
+        self.failures = 0
+
+    def start(self):
+        """작업자 스레드를 시작합니다."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="customer-queue", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def pause(self):
+        """새 고객 생성을 잠시 멈춥니다 (이미 보낸 요청은 끝까지 진행)."""
+        with self._cond:
+            self._paused = True
+
+    def resume(self):
+        with self._cond:
+            self._paused = False
+            self._cond.notify_all()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._queue)
+
+    def pop(self):
+        """준비된 고객을 바로 꺼냅니다 (없으면 None). 기다리지 않으므로 메인 스레드에서 호출해도 됩니다."""
+        with self._cond:
+            if not self._queue:
+                self.misses += 1
+                customer = None
+            else:
+                customer = self._queue.popleft()
+                self.served += 1
+            if len(self._queue) <= self.refill_at:
+                self._filling = True
+                self._cond.notify_all()
+        if customer is not None and self.request_pool:
+            # (수정) 풀 항목은 선반입할 때가 아니라 실제로 내보낼 때 사용 기록
+            self.request_pool.mark_served(customer['persona'], customer['wishlist'], customer['request_text'])
+        return customer
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"ready": len(self._queue), "produced": self.produced, "served": self.served,
+                    "misses": self.misses, "failures": self.failures}
+
+    # --- 작업자 ---
+    def _wait_for_work(self) -> bool:
+        """보충할 차례가 될 때까지 기다립니다. 멈춰야 하면 False."""
+        with self._cond:
+            while not self._stopped and (self._paused or not self._filling):
+                self._cond.wait()
+            return not self._stopped
+
+    def _next_requests(self) -> list:
+        """다음에 넣을 (persona, wishlist, request_text) 목록. 풀에서 1개, 없으면 모자란 수만큼 일괄 생성."""
+        drawn = self.request_pool.draw() if self.request_pool else None
+        if drawn:
+            return [drawn]
+        need = min(config.REQUEST_BATCH_SIZE, max(1, self.depth - len(self)))
+        if need == 1:
+            return [client.generate_request(self.model_manager)]
+        jobs = [(random.choice(PERSONAS), client.pick_wishlist()) for _ in range(need)]
+        return [entry for entry in client.generate_requests_batch(self.model_manager, jobs) if entry]
+
+    def _worker(self):
+        consecutive_failures = 0
+        while self._wait_for_work():
+            try:
+                entries = [entry for entry in self._next_requests() if entry[0] is not None and entry[2]]
+            except Exception as e:
+                print(f"🚨 고객 선반입 오류: {e}", file=sys.stderr)
+                entries = []
+
+            if not entries:
+                consecutive_failures += 1
+                with self._cond:
+                    self.failures += 1
+                delay = min(config.CUSTOMER_QUEUE_RETRY_MAX, config.CUSTOMER_QUEUE_RETRY_BASE * 2 ** (consecutive_failures - 1))
+                time.sleep(delay)
+                continue
+            consecutive_failures = 0
+
+            for persona, wishlist, request_text in entries:
+                customer = make_customer(self.model_manager, persona, wishlist, request_text)
+                with self._cond:
+                    self._queue.append(customer)
+                    self.produced += 1
+                    if len(self._queue) >= self.depth:
+                        self._filling = False
+                print(f"🧾 고객 선반입 완료: {persona['name']} (대기 {len(self)}명)")
@@ -0,0 +1,169 @@
+# design_facts.py
+
+ZONE_CENTER = "center"
+ZONE_WALL = "wall"
+ZONE_ENTRANCE = "entrance"
+
+class DesignFacts:
+    """
+    (신규) 증분 디자인 사실 데이터.
+    가구를 놓거나 치울 때마다 add() / remove()로 O(1) 갱신하며
+    종류별 개수, 구역(중앙부/벽가/입구)별 목록, 바닥 면적과 밀도를 항상 최신으로 유지합니다.
+    report()는 evaluation._get_design_facts와 같은 형식의 사실 데이터 텍스트를 반환합니다.
+    """
+    def __init__(self, room_width: int, room_height: int):
+        self.room_width = room_width
+        self.room_height = room_height
+
+        self.count = 0
+        self.total_base_cells = 0 # 가구가 차지하는 바닥 면적
+        self.item_counts = {}     # 가구 이름 -> 개수
+        self.zones = {ZONE_CENTER: {}, ZONE_WALL: {}, ZONE_ENTRANCE: {}} # 구역 -> {id(가구): "이름 (x,y)"}
+        self._entries = {}        # id(가구) -> (구역, 이름, 바닥 면적), 놓인 순서
+
+    @classmethod
+    def from_layout(cls, placed_furniture: list, room_width: int, room_height: int):
+        """기존 가구 배치 리스트로부터 한 번에 만듭니다."""
+        facts = cls(room_width, room_height)
+        for f in placed_furniture:
+            facts.add(f)
+        return facts
+
+    # --- 구역 / 면적 계산 ---
+    def zone_of(self, grid_pos) -> str:
+        """
+        가구의 '바닥' 격자 위치로 구역을 판정합니다. (ROOM_WIDTH=10, ROOM_HEIGHT=8 기준 예시)
+        - 입구: y가 큰 쪽 (아래쪽 2줄)
+        - 중앙부: 벽에서 2칸 안쪽
+        - 벽가: 나머지
+        """
+        x, y = grid_pos
+        if y >= self.room_height - 2:
+            return ZONE_ENTRANCE
+        if 2 <= x < self.room_width - 2 and 2 <= y < self.room_height - 2:
+            return ZONE_CENTER
+        return ZONE_WALL
+
+    @staticmethod
+    def _base_cells(furniture: dict) -> int:
+        """(내부 헬퍼 함수) Z-Sorting 로직의 'base_size' 기준 바닥 면적 (회전해도 면적은 같음)."""
+        base_size = furniture['item'].get('base_size', (1, 1)) # 없으면 (1,1)
+        return base_size[0] * base_size[1]
+
+    # --- 갱신 ---
+    def add(self, furniture: dict):
+        """가구 1개가 놓였음을 반영합니다."""
+        key = id(furniture)
+        if key in self._entries:
+            return
+        name = furniture['item']['name']
+        x, y = furniture['grid_pos']
+        zone = self.zone_of((x, y))
+        cells = self._base_cells(furniture)
+
+        self._entries[key] = (zone, name, cells)
+        self.zones[zone][key] = f"{name} ({x},{y})"
+        self.item_counts[name] = self.item_counts.get(name, 0) + 1
+        self.total_base_cells += cells
+        self.count += 1
+
+    def remove(self, furniture: dict):
+        """가구 1개가 치워졌음을 반영합니다."""
+        entry = self._entries.pop(id(furniture), None)
+        if entry is None:
+            return
+        zone, name, cells = entry
+
+        del self.zones[zone][id(furniture)]
+        self.item_counts[name] -= 1
+        if self.item_counts[name] == 0:
+            del self.item_counts[name]
+        self.total_base_cells -= cells
+        self.count -= 1
+
+    def clear(self):
+        self.count = 0
+        self.total_base_cells = 0
+        self.item_counts.clear()
+        for members in self.zones.values():
+            members.clear()
+        self._entries.clear()
+
+    # --- 조회 ---
+    @property
+    def density(self) -> float:
+        """바닥 면적 / 방 전체 격자 수."""
+        return self.total_base_cells / (self.room_width * self.room_height)
+
+    def density_band(self) -> str:
+        """report()의 밀도 문장을 결정하는 구간 ("empty" / "sparse" / "dense" / "balanced")."""
+        density_ratio = self.density
+        if density_ratio == 0:
+            return "empty"
+        if density_ratio < 0.1:
+            return "sparse"
+        if density_ratio > 0.4:
+            return "dense"
+        return "balanced"
+
+    def zone_items(self, zone: str) -> list:
+        """구역에 놓인 가구의 "이름 (x,y)" 목록 (놓인 순서)."""
+        return list(self.zones[zone].values())
+
+    def canonical(self) -> tuple:
+        """
+        (신규) 놓은 순서와 무관한 사실 데이터 요약: (종류별 개수, 구역별 "이름 (x,y)" 목록, 밀도 구간), 모두 정렬.
+        report()와 같은 사실을 담으므로, 이 값이 같은 두 배치는 문장 순서만 다른 리포트를 만듭니다.
+        """
+        return (
+            sorted(self.item_counts.items()),
+            [sorted(self.zones[zone].values()) for zone in (ZONE_CENTER, ZONE_WALL, ZONE_ENTRANCE)],
+            self.density_band(),
+        )
+
+    def kind_order(self) -> list:
+        """
+        (신규) 종류 목록 순서: 남아 있는 가구 중 각 종류가 가장 먼저 놓인 순서.
+        가구 배치 리스트를 앞에서부터 훑는 evaluation._get_design_facts(기존)와 같은 순서입니다.
+        """
+        return list(dict.fromkeys(name for _, name, _ in self._entries.values()))
+
+    def report(self) -> str:
+        """LLM이 평가할 '사실 데이터' 텍스트를 만듭니다."""
+        if not self.count:
+            return "방이 완전히 비어 있습니다. 텅 빈 공간입니다."
+
+        # --- 1. 항목별 개수 요약 ---
+        item_list_str = ", ".join([f"{self.item_counts[name]}개의 {name}" for name in self.kind_order()])
+        lines = [f"이 방에는 총 {self.count}개의 가구가 있습니다. (종류: {item_list_str})\n"]
+
+        # --- 2. 구역별 배치 ---
+        center_items = self.zone_items(ZONE_CENTER)
+        wall_items = self.zone_items(ZONE_WALL)
+        entrance_items = self.zone_items(ZONE_ENTRANCE)
+
+        lines.append("\n[ 공간 배치 분석 ]\n")
+        if not center_items and not wall_items and not entrance_items:
+            lines.append("- 모든 가구가 한 곳에 뭉쳐있습니다.\n")
+        if center_items:
+            lines.append(f"- 방의 중앙부에는 {', '.join(center_items)} 등이 배치되어 공간의 중심을 잡고 있습니다.\n")
+        else:
+            lines.append("- 방의 중앙부는 비어있어 개방감이 느껴집니다.\n")
+        if wall_items:
+            lines.append(f"- 벽가에는 {', '.join(wall_items)} 등이 배치되었습니다.\n")
+        if entrance_items:
+            lines.append(f"- 입구(아래쪽) 근처에는 {', '.join(entrance_items)} 등이 놓여 있습니다.\n")
+
+        # --- 3. 밀도/여백 묘사 ---
+        band = self.density_band()
+        lines.append("\n[ 밀도 및 인상 ]\n")
+        if band == "empty":
+            pass # "비어 있음"은 첫 줄에서 이미 처리
+        elif band == "sparse": # 10% 미만
+            lines.append("- 전반적으로 방이 매우 넓고 여백이 많아 미니멀한 인상을 줍니다.")
+        elif band == "dense": # 40% 초과
+            lines.append("- 전반적으로 방이 가구로 빽빽하게 채워져 있어 동선이 복잡해 보입니다.")
+        else:
+            lines.append("- 가구들이 적절한 간격을 두고 균형 있게 배치되어 있습니다.")
+
+        return "".join(lines)
@@ -0,0 +1,216 @@
+# endpoints.py
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+
+import numpy as np
+
+class Endpoint:
+    """
+    Ollama 서버(파드) 1개.
+    클라이언트 객체와 함께 진행 중인 요청 수, 호출 종류별 최근 지연 시간을 기록합니다.
+    """
+    def __init__(self, host: str, client, window: int = 50):
+        self.host = host
+        self.client = client
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self._window = window
+        self._latencies = {} # kind ('chat:judge', 'chat:describe', 'embed', ...) -> deque[초]
+
+    def record(self, kind: str, elapsed: float, ok: bool):
+        """(lock을 잡은 상태에서 호출) 완료된 요청 1건을 통계에 반영합니다."""
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+            return
+        self._latencies.setdefault(kind, deque(maxlen=self._window)).append(elapsed)
+
+    def latency_percentile(self, kind: str, q: float, min_samples: int = 5):
+        """kind 호출의 최근 지연 시간 q-백분위수 (표본이 부족하면 None)."""
+        samples = self._latencies.get(kind)
+        if not samples or len(samples) < min_samples:
+            return None
+        return float(np.percentile(samples, q))
+
+    def mean_latency(self, kind: str) -> float:
+        samples = self._latencies.get(kind)
+        return sum(samples) / len(samples) if samples else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "host": self.host,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_ms": {
+                kind: {
+                    "mean": self.mean_latency(kind) * 1000.0,
+                    "p95": (self.latency_percentile(kind, 95, min_samples=1) or 0.0) * 1000.0,
+                }
+                for kind in self._latencies
+            },
+        }
+
+class EndpointPool:
+    """
+    여러 Ollama 엔드포인트에 요청을 분배합니다.
+    - 라우팅: 진행 중 요청이 가장 적은 엔드포인트 (동률이면 평균 지연이 짧은 쪽)
+    - 헤징(선택): 첫 요청이 해당 엔드포인트의 p95 지연 안에 끝나지 않으면
+      다른 엔드포인트에 같은 요청을 보내고 먼저 끝난 응답을 사용합니다.
+    """
+    def __init__(self, endpoints: list, hedge_default_delay: float = 2.0, hedge_min_delay: float = 0.05, hedge_quantile: float = 95):
+        self.endpoints = list(endpoints)
+        self.hedge_default_delay = hedge_default_delay
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_quantile = hedge_quantile
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, kind: str = "chat", exclude=()) -> Endpoint:
+        """요청을 보낼 엔드포인트를 고르고 진행 중 요청 수를 1 늘립니다."""
+        with self._lock:
+            candidates = [ep for ep in self.endpoints if ep not in exclude] or self.endpoints
+            endpoint = min(candidates, key=lambda ep: (ep.in_flight, ep.mean_latency(kind)))
+            endpoint.in_flight += 1
+            return endpoint
+
+    def release(self, endpoint: Endpoint, kind: str, elapsed: float, ok: bool):
+        """acquire한 엔드포인트의 요청이 끝났음을 기록합니다."""
+        with self._lock:
+            endpoint.in_flight -= 1
+            endpoint.record(kind, elapsed, ok)
+
+    def remove(self, endpoint: Endpoint):
+        with self._lock:
+            self.endpoints.remove(endpoint)
+
+    def _start(self, submit, endpoint: Endpoint, kind: str):
+        """submit(endpoint)로 요청을 시작하고, 끝나면 통계를 남기도록 콜백을 겁니다."""
+        start = time.perf_counter()
+
+        def on_done(future):
+            ok = not future.cancelled() and future.exception() is None
+            if future.cancelled():
+                # 헤징에서 진 요청: 지연 시간 통계에는 넣지 않음
+                with self._lock:
+                    endpoint.in_flight -= 1
+                return
+            self.release(endpoint, kind, time.perf_counter() - start, ok)
+
+        future = submit(endpoint)
+        future.add_done_callback(on_done)
+        return future
+
+    def hedge_delay(self, endpoint: Endpoint, kind: str) -> float:
+        """
+        헤지 요청을 보내기 전까지 기다릴 시간 (엔드포인트의 p95 지연 기반).
+        kind별(예: 'chat:judge')로 따로 집계하므로 긴 생성 호출이 짧은 호출의 기준을 끌어올리지 않습니다.
+        """
+        with self._lock:
+            p = endpoint.latency_percentile(kind, self.hedge_quantile)
+        if p is None:
+            return self.hedge_default_delay
+        return max(self.hedge_min_delay, p)
+
+    def call(self, submit, kind: str = "chat", hedge: bool = False):
+        """
+        submit(endpoint) -> concurrent.futures.Future 로 요청을 보내고 결과를 반환합니다.
+        hedge=True이고 엔드포인트가 2개 이상이면 느린 요청에 대해 헤지 요청을 보냅니다.
+        """
+        return self.submit_call(submit, kind, hedge).result()
+
+    def submit_call(self, submit, kind: str = "chat", hedge: bool = False, transform=None) -> Future:
+        """
+        (신규) call()을 기다리지 않고 시작해 Future를 반환합니다.
+        주 요청이 hedge_delay 안에 끝나지 않으면 다른 엔드포인트에 헤지 요청을 보내고,
+        먼저 성공한 응답(transform이 있으면 transform(응답))으로 완료되며 진 요청은 취소합니다.
+        반환된 Future를 cancel()하면 주 요청과 헤지 요청을 모두 취소합니다
+        (submit이 돌려준 Future의 cancel()이 실제 요청을 끊는지는 submit에 달려 있음).
+        """
+        outer = Future()
+        lock = threading.RLock()
+        attempts = []
+        state = {"settled": False, "failed": 0, "timer": None}
+
+        def settle(winner, error):
+            """(lock을 잡은 상태에서 호출) 결과를 확정하고 나머지 시도를 정리합니다."""
+            state["settled"] = True
+            if state["timer"] is not None:
+                state["timer"].cancel()
+            for other in attempts:
+                if other is not winner:
+                    other.cancel()
+            try:
+                if error is not None:
+                    outer.set_exception(error)
+                else:
+                    outer.set_result(transform(winner.result()) if transform else winner.result())
+            except InvalidStateError:
+                pass # 그사이 호출자가 취소함
+            except Exception as e:
+                outer.set_exception(e) # transform 실패
+
+        def on_attempt_done(attempt):
+            if attempt.cancelled():
+                return
+            error = attempt.exception()
+            with lock:
+                if state["settled"]:
+                    return
+                if error is None:
+                    if attempt is not attempts[0]:
+                        with self._lock:
+                            self.hedges_won += 1
+                    settle(attempt, None)
+                    return
+                state["failed"] += 1
+                # 아직 진행 중인 시도가 있으면 그 결과를 기다림 (보내기 전인 헤지 요청은 보내지 않음)
+                if state["failed"] >= len(attempts):
+                    settle(None, error)
+
+        def start(endpoint):
+            attempt = self._start(submit, endpoint, kind)
+            attempts.append(attempt)
+            attempt.add_done_callback(on_attempt_done)
+
+        def start_backup(primary_ep):
+            with lock:
+                if state["settled"] or outer.done():
+                    return
+                with self._lock:
+                    self.hedges_sent += 1
+                start(self.acquire(kind, exclude=(primary_ep,)))
+
+        def on_outer_done(future):
+            if not future.cancelled():
+                return
+            with lock:
+                state["settled"] = True
+                if state["timer"] is not None:
+                    state["timer"].cancel()
+                pending = list(attempts)
+            for attempt in pending:
+                attempt.cancel()
+
+        outer.add_done_callback(on_outer_done)
+        with lock:
+            primary_ep = self.acquire(kind)
+            start(primary_ep)
+            if hedge and len(self.endpoints) >= 2 and not state["settled"]:
+                timer = threading.Timer(self.hedge_delay(primary_ep, kind), start_backup, args=(primary_ep,))
+                timer.daemon = True
+                state["timer"] = timer
+                timer.start()
+        return outer
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "endpoints": [ep.stats() for ep in self.endpoints],
+                "hedges_sent": self.hedges_sent,
+                "hedges_won": self.hedges_won,
+            }
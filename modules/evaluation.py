@@ -1,127 +1,59 @@
 # evaluation.py (Refactored)
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
 import numpy as np
-import re
+from dataclasses import dataclass, field
 
+import config
+from . import client, prompts
+from .design_facts import DesignFacts
 from .model import ModelManager
+from .pipeline import StageGraph
 
 def _get_design_facts(placed_furniture: list, room_width: int, room_height: int) -> str:
     """
     (내부 헬퍼 함수)
     가구 배치 리스트와 방 크기를 기반으로,
     LLM이 평가할 '사실 데이터'를 텍스트로 생성합니다.
-    (기존 describe_design의 로직과 동일)
+    (수정) 집계는 DesignFacts가 담당합니다. 게임에서는 main.py가 유지하는 DesignFacts의 report()를 바로 사용합니다.
     """
-    if not placed_furniture:
-        return "방이 완전히 비어 있습니다. 텅 빈 공간입니다."
-
-    # --- 1. 항목별 개수 요약 ---
-    item_counts = {}
-    total_base_cells = 0 # 가구가 차지하는 바닥 면적
-    
-    for f in placed_furniture:
-        name = f['item']['name']
-        item_counts[name] = item_counts.get(name, 0) + 1
-        
-        # (신규) Z-Sorting 로직을 위한 'base_size' 참조
-        base_size = f['item'].get('base_size', (1, 1)) # 없으면 (1,1)
-        rotation = f.get('rotation', 0)
-        
-        if rotation % 2 == 1: # 90도 회전
-            total_base_cells += base_size[1] * base_size[0]
-        else:
-            total_base_cells += base_size[0] * base_size[1]
-
-    item_list_str = ", ".join([f"{count}개의 {name}" for name, count in item_counts.items()])
-    description = f"이 방에는 총 {len(placed_furniture)}개의 가구가 있습니다. (종류: {item_list_str})\n"
-
-    # --- 2. 구역별 배치 분석 ---
-    wall_items = []
-    center_items = []
-    entrance_items = [] # y가 큰 쪽 (아래쪽)
-
-    # 구역 정의 (ROOM_WIDTH=10, ROOM_HEIGHT=8 기준 예시)
-    entrance_line = room_height - 2 # y=6, 7
-    # 벽에서 2칸 안쪽을 '중앙'으로 정의
-    center_x_start, center_x_end = 2, room_width - 2 # x=2~7
-    center_y_start, center_y_end = 2, room_height - 2 # y=2~5
-
-    for f in placed_furniture:
-        name = f['item']['name']
-        x, y = f['grid_pos']
-        
-        # 가구의 '바닥' 격자 위치 기준
-        if y >= entrance_line:
-            entrance_items.append(f"{name} ({x},{y})")
-        elif (x < center_x_start or x >= center_x_end or 
-              y < center_y_start or y >= center_y_end):
-            wall_items.append(f"{name} ({x},{y})")
-        else:
-            center_items.append(f"{name} ({x},{y})")
-
-    # --- 3. 묘사 생성 ---
-    description += "\n[ 공간 배치 분석 ]\n"
-    
-    if not center_items and not wall_items and not entrance_items and placed_furniture:
-        description += "- 모든 가구가 한 곳에 뭉쳐있습니다.\n"
-
-    if center_items:
-        description += f"- 방의 중앙부에는 {', '.join(center_items)} 등이 배치되어 공간의 중심을 잡고 있습니다.\n"
-    else:
-        description += "- 방의 중앙부는 비어있어 개방감이 느껴집니다.\n"
-    
-    if wall_items:
-        description += f"- 벽가에는 {', '.join(wall_items)} 등이 배치되었습니다.\n"
-    
-    if entrance_items:
-        description += f"- 입구(아래쪽) 근처에는 {', '.join(entrance_items)} 등이 놓여 있습니다.\n"
-
-    # --- 4. 밀도/여백 묘사 (신규) ---
-    total_cells = room_width * room_height
-    density_ratio = total_base_cells / total_cells
-    
-    description += "\n[ 밀도 및 인상 ]\n"
-    if density_ratio == 0:
-        pass # "비어 있음"은 첫 줄에서 이미 처리
-    elif density_ratio < 0.1: # 10% 미만
-        description += "- 전반적으로 방이 매우 넓고 여백이 많아 미니멀한 인상을 줍니다."
-    elif density_ratio > 0.4: # 40% 초과
-        description += "- 전반적으로 방이 가구로 빽빽하게 채워져 있어 동선이 복잡해 보입니다."
-    else:
-        description += "- 가구들이 적절한 간격을 두고 균형 있게 배치되어 있습니다."
-            
-    # print("[상세 디자인 묘사 (모델에게 넘겨주는 프롬프트)]")
-    # print(description)
-    return description
+    return DesignFacts.from_layout(placed_furniture, room_width, room_height).report()
 
 # --- 1. 디자인 설명서 생성 (로직 동일) ---
-def describe_design(model_manager: ModelManager, placed_furniture: list, room_width: int, room_height: int) -> str:
+def describe_design(model_manager: ModelManager, placed_furniture: list, room_width: int, room_height: int, on_token=None, design_facts=None, request_text=None) -> str:
     """
     LLM을 호출하여, 배치된 가구의 '사실'을 '자연스러운' 문장으로 묘사합니다.
+    (신규) on_token이 주어지면 묘사가 생성되는 동안 부분 텍스트를 on_token(text)으로 전달합니다.
+    (신규) design_facts가 주어지면 사실 데이터를 다시 계산하지 않습니다.
+    (신규) request_text(공개 의뢰서)는 묘사에 쓰이지 않지만, 평가자/피드백과 같은 프롬프트 접두부를 만들어
+    서버의 프롬프트 캐시를 재사용하기 위해 넘깁니다 (prompts.py 참고).
+    묘사는 화면에 그대로 보이므로 비밀 위시리스트는 넘기지 않습니다.
     """
     
     # 1. 먼저, 프로그램적으로 사실 데이터를 수집합니다.
-    design_facts = _get_design_facts(placed_furniture, room_width, room_height)
+    if design_facts is None:
+        design_facts = _get_design_facts(placed_furniture, room_width, room_height)
     
     # 2. LLM이 준비되지 않았거나, 방이 비어있으면 LLM을 호출할 필요가 없습니다.
     if not model_manager or not model_manager.is_ready or not placed_furniture:
         print(design_facts)
         return design_facts # 사실 데이터(기존 묘사)를 그대로 반환
 
-    # 3. LLM에게 '자연스러운 묘사'를 요청하는 프롬프트
-    system_prompt = (
-        "당신은 인테리어 디자이너 또는 공간 비평가입니다. "
-        "당신은 딱딱한 '데이터 리포트'를 받아서, 그것을 '감성적이고 자연스러운' 묘사 문장(1-2 문단)으로 재작성해야 합니다. "
-        "사실을 왜곡하지 말고, 긍정/부정 판단도 하지 마세요. 오직 '묘사'만 하세요. "
-        "(예: '방이 빽빽합니다' -> '가구들이 공간을 알차게 채우고 있네요.')"
-    )
-    
-    user_prompt = (
-        f"다음은 이 방에 대한 '사실 데이터'입니다. 이 데이터를 기반으로 자연스러운 묘사 글을 한국어로 작성하세요:\n\n"
-        f"--- 데이터 리포트 ---\n{design_facts}\n---"
+    # 3. LLM에게 '자연스러운 묘사'를 요청하는 프롬프트 (수정: 고정 접두부 + 가변 접미부)
+    system_prompt = prompts.EVALUATION_SYSTEM_PROMPT
+    user_prompt = prompts.evaluation_prompt(
+        request_text, design_facts, prompts.TASK_DESCRIBE,
+        "위 데이터 리포트를 기반으로 자연스러운 묘사 글을 한국어로 작성하세요."
     )
     
     try:
-        natural_description = model_manager.get_chat_response(system_prompt, user_prompt)
+        stream_callback = None
+        if on_token:
+            stream_callback = lambda partial: on_token(partial.strip().replace('"', ''))
+        natural_description = model_manager.get_chat_response(system_prompt, user_prompt, on_token=stream_callback, profile="describe")
         
         # LLM이 응답에 붙일 수 있는 불필요한 따옴표 제거
         natural_description = natural_description.strip().replace('"', '')
@@ -151,57 +83,360 @@ def calculate_similarity_score(vec_a: list[float], vec_b: list[float]) -> float:
     score = ((cosine_similarity + 1) / 2) * 5.0
     return score
 
+# (신규) AI 평가자 응답 형식 (Ollama format 파라미터로 전달되는 JSON 스키마)
+JUDGE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "number", "minimum": 0, "maximum": 5},
+        "missing": {"type": "array", "items": {"type": "string"}, "maxItems": 5}, # 위시리스트는 최대 5개
+        "notes": {"type": "string", "maxLength": config.JUDGE_NOTES_MAX_CHARS}, # 프롬프트와 같은 상한 (JUDGE_NUM_PREDICT 안에 들어가도록)
+    },
+    "required": ["score", "missing", "notes"],
+}
+
+@dataclass
+class JudgeResult:
+    """AI 평가자의 검증된 응답."""
+    score: float                                 # 0.0 ~ 5.0 (소수점 한 자리)
+    missing: list = field(default_factory=list)  # 평가자가 누락으로 본 위시리스트 가구
+    notes: str = ""                              # 한 줄 평가 근거
+    variance: float = 0.0                        # (신규) 여러 번 샘플링했을 때 점수 분산
+    samples: int = 1                             # (신규) 집계에 사용한 샘플 수
+
+def _parse_judge_result(data: dict, internal_wishlist: list):
+    """
+    (내부 헬퍼 함수)
+    JSON 응답을 JudgeResult로 검증/변환합니다. 점수가 숫자가 아니면 None을 반환합니다.
+    """
+    try:
+        score = float(data['score'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    score = round(min(5.0, max(0.0, score)), 1)
+
+    missing = data.get('missing')
+    if not isinstance(missing, list):
+        missing = []
+    # 위시리스트에 있는 이름만 인정 (모델이 지어낸 가구 제외)
+    missing = [item for item in missing if isinstance(item, str) and item in (internal_wishlist or [])]
+
+    notes = data.get('notes')
+    return JudgeResult(score=score, missing=missing, notes=notes.strip() if isinstance(notes, str) else "")
+
 # (신규) AI 평가자(LLM-as-Judge)를 호출하는 함수
-def get_llm_judge_score(model_manager, request_text, internal_wishlist, design_description):
+def _judge_prompts(request_text, internal_wishlist, design_description) -> tuple:
+    """
+    (내부 헬퍼 함수) AI 평가자의 (시스템, 사용자) 프롬프트.
+    (수정) 공개 자료(의뢰서/디자인)는 공유 접두부에, 평가 가이드라인과 비밀 위시리스트는 맨 끝 작업에 배치
+    """
+    user_prompt = prompts.evaluation_prompt(
+        request_text, design_description, prompts.TASK_JUDGE,
+        "이 모든 것을 고려하여 평가 결과 JSON만 반환하세요:",
+        internal_wishlist=internal_wishlist or []
+    )
+    return prompts.EVALUATION_SYSTEM_PROMPT, user_prompt
+
+def get_llm_judge_result(model_manager, request_text, internal_wishlist, design_description, options=None, hedge=None):
     """
     채팅 모델(LLM)을 '평가자'로 사용하여, 
-    요구사항, 위시리스트, 실제 디자인을 복합적으로 평가하여 0~5점 사이의 점수를 반환합니다.
+    요구사항, 위시리스트, 실제 디자인을 복합적으로 평가합니다.
+    (수정) JSON 스키마로 {score, missing, notes} 형식을 강제하고 짧은 토큰 상한으로 호출합니다.
+    모델을 쓸 수 없거나 응답이 유효하지 않으면 None을 반환합니다.
+    options / hedge로 judge 프로필 옵션과 헤지 여부를 바꿀 수 있습니다.
     """
     print("AI 평가자가 점수 계산 중...")
 
-    system_prompt = (
-        "당신은 까다로운 인테리어 디자인 평가자입니다. "
-        "당신은 0.0에서 5.0 사이의 소수점 한 자리 점수(예: '3.5')만을 반환해야 합니다. "
-        "다른 말은 절대 하지 마세요. 오직 숫자만 응답하세요."
-    )
-    
-    wishlist_str = ", ".join(internal_wishlist) if internal_wishlist else "없음"
+    if not model_manager or not model_manager.is_ready:
+        return None
 
-    user_prompt = (
-        "다음은 평가 자료입니다.\n\n"
-        f"--- 1. 고객의 공개 의뢰서 (분위기 점수 40% 반영) ---\n"
-        f"\"{request_text}\"\n\n"
-        
-        f"--- 2. 고객의 비밀 위시리스트 (사실 점수 60% 반영) ---\n"
-        f"[{wishlist_str}]\n\n"
-        
-        f"--- 3. 실제 디자인 결과 (묘사) ---\n"
-        f"\"{design_description}\"\n\n"
-        
-        "--- 평가 가이드라인 ---\n"
-        "1. [사실(60%)] '디자인 결과(3)'에 '비밀 위시리스트(2)'의 가구가 포함되어 있습니까? (가장 중요)\n"
-        "2. [분위기(40%)] '디자인 결과(3)'가 '공개 의뢰서(1)'의 모호한 분위기(예: 아늑함, 모던함)를 만족시킵니까?\n"
-        "3. [감점] '디자인 결과(3)' 묘사 중 '빽빽하게', '복잡해' 등의 부정적 표현이 있다면 감점하세요.\n\n"
-        "이 모든 것을 고려하여 0.0~5.0 사이의 최종 점수(숫자)만 반환하세요:"
-    )
+    system_prompt, user_prompt = _judge_prompts(request_text, internal_wishlist, design_description)
     
+    # (신규) 점수는 평가 지연에 직결되므로, 느린 파드가 있으면 다른 파드로 헤지 요청
+    data = model_manager.get_json_response(
+        system_prompt,
+        user_prompt,
+        JUDGE_SCHEMA,
+        options=options,
+        hedge=config.OLLAMA_HEDGE_JUDGE if hedge is None else hedge,
+        profile="judge"
+    )
+    result = _parse_judge_result(data, internal_wishlist) if data else None
+    if result is None:
+        print("🚨 AI 평가자 응답이 유효하지 않습니다.")
+    return result
+
+def get_llm_judge_consensus(model_manager, request_text, internal_wishlist, design_description, samples=None, spread=None, deadline=None, concurrency=None):
+    """
+    (신규) AI 평가자 자기 일관성 샘플링.
+    서로 다른 seed와 높은 temperature로 최대 samples개를 (수정) 동시에 최대 concurrency개씩 보내고,
+    최소 JUDGE_SAMPLE_MIN개가 모인 뒤 점수 범위(최대-최소)가 spread 이하가 되거나 deadline(초)이 지나면
+    중앙값 점수와 분산을 JudgeResult로 반환합니다. (유효한 샘플이 없으면 None)
+    멈출 때 아직 보내지 않은 샘플은 보내지 않고, 진행 중인 샘플은 취소해 서버 슬롯을 바로 돌려줍니다
+    (ModelManager.submit_json_response 참고). 헤지 여부는 설정(OLLAMA_HEDGE_JUDGE)을 따릅니다.
+    """
+    samples = samples or config.JUDGE_SAMPLES
+    spread = config.JUDGE_SAMPLE_SPREAD if spread is None else spread
+    deadline = config.JUDGE_DEADLINE if deadline is None else deadline
+    concurrency = concurrency or config.JUDGE_SAMPLE_CONCURRENCY
+    min_samples = min(samples, config.JUDGE_SAMPLE_MIN)
+
+    if not model_manager or not model_manager.is_ready:
+        return None
+
+    print(f"AI 평가자가 점수 계산 중... (샘플 {samples}개, 동시 {concurrency}개)")
+    system_prompt, user_prompt = _judge_prompts(request_text, internal_wishlist, design_description)
+    seeds = iter(range(samples))
+    running = set()
+    results = []
+    end_time = time.monotonic() + deadline
+
+    def launch():
+        """동시 샘플 수가 concurrency가 될 때까지 다음 seed의 샘플을 보냅니다."""
+        while len(running) < concurrency:
+            seed = next(seeds, None)
+            if seed is None:
+                return
+            running.add(model_manager.submit_json_response(
+                system_prompt, user_prompt, JUDGE_SCHEMA,
+                options={"temperature": config.JUDGE_SAMPLE_TEMPERATURE, "seed": seed},
+                hedge=config.OLLAMA_HEDGE_JUDGE,
+                profile="judge"
+            ))
+
     try:
-        raw_score = model_manager.get_chat_response(system_prompt, user_prompt)
-        # LLM이 반환한 텍스트에서 숫자만 추출 (예: "4.5점입니다" -> 4.5)
-        score_match = re.search(r"(\d\.\d)", raw_score)
-        if score_match:
-            return float(score_match.group(1))
-        else:
-            # LLM이 이상한 답을 줬을 때 Fallback
-            return float(raw_score.strip())
-    except Exception as e:
-        print(f"🚨 AI 평가자 점수 변환 실패: {e}")
+        launch()
+        while running:
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                print(f"AI 평가자 샘플링 시간 초과 ({len(results)}/{samples}개 수집)")
+                break
+            done, _ = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                running.discard(future)
+                try:
+                    data = future.result()
+                except Exception as e:
+                    print(f"AI 평가자 샘플 실패: {e}")
+                    continue
+                result = _parse_judge_result(data, internal_wishlist) if data else None
+                if result is not None:
+                    results.append(result)
+
+            scores = [r.score for r in results]
+            if len(scores) >= min_samples and max(scores) - min(scores) <= spread:
+                break
+            launch()
+    finally:
+        # 조기 종료 / 시간 초과: 진행 중인 샘플을 취소 (보내지 않은 seed는 그대로 버림)
+        for future in running:
+            future.cancel()
+        if running:
+            print(f"AI 평가자 샘플 {len(running)}개 취소")
+
+    if not results:
+        return None
+
+    scores = np.array([r.score for r in results])
+    score = round(float(np.median(scores)), 1)
+    # 누락 가구: 과반수 샘플이 지적한 것만, 근거: 집계 점수에 가장 가까운 샘플
+    missing = [item for item in (internal_wishlist or []) if sum(item in r.missing for r in results) * 2 > len(results)]
+    closest = min(results, key=lambda r: abs(r.score - score))
+    print(f"AI 평가자 샘플 {len(results)}/{samples}개: {scores.tolist()} -> {score} (분산 {scores.var():.3f})")
+    return JudgeResult(score=score, missing=missing, notes=closest.notes, variance=float(scores.var()), samples=len(results))
+
+def judge_design(model_manager, request_text, internal_wishlist, design_description):
+    """(신규) 설정(JUDGE_SAMPLES)에 따라 단일 호출 또는 자기 일관성 샘플링으로 평가합니다."""
+    if config.JUDGE_SAMPLES > 1:
+        return get_llm_judge_consensus(model_manager, request_text, internal_wishlist, design_description)
+    return get_llm_judge_result(model_manager, request_text, internal_wishlist, design_description)
+
+def get_llm_judge_score(model_manager, request_text, internal_wishlist, design_description):
+    """
+    AI 평가자의 점수(0~5)만 반환합니다.
+    평가자를 쓸 수 없으면 0점 대신 중립 점수(JUDGE_FALLBACK_SCORE)를 반환합니다.
+    """
+    result = judge_design(model_manager, request_text, internal_wishlist, design_description)
+    if result is None:
+        return config.JUDGE_FALLBACK_SCORE
+    return result.score
+
+def _wishlist_penalty(internal_wishlist: list, placed_furniture: list, furniture_index=None):
+    """
+    (내부 헬퍼 함수)
+    위시리스트 중 배치되지 않은 가구를 찾아 (페널티, 누락 목록)을 반환합니다. (누락 1개당 0.5점)
+    """
+    # 현재 배치된 모든 가구의 이름 (중복 제거)
+    placed_names = set([f['item']['name'] for f in placed_furniture])
+    
+    if furniture_index is not None:
+        # (신규) 위시리스트 x 배치 가구 유사도 행렬 1회 계산 (네트워크 호출 없음)
+        missing_items = furniture_index.find_missing(internal_wishlist, placed_names, config.WISHLIST_MATCH_THRESHOLD)
+    else:
+        # 위시리스트의 아이템(예: "소파")이
+        # 배치된 가구 이름(예: "작은 소파", "큰 소파")에 포함되는지 확인
+        missing_items = [item for item in internal_wishlist if item not in placed_names]
+
+    return 0.5 * len(missing_items), missing_items
+
+# --- (신규) 규칙 기반 즉시 점수 ---
+
+def _occupancy_grid(placed_furniture: list, room_width: int, room_height: int) -> np.ndarray:
+    """
+    (내부 헬퍼 함수)
+    가구의 '바닥 격자'(충돌 판정과 같은 높이 1 영역)를 칠한 (room_height, room_width) bool 배열을 만듭니다.
+    """
+    grid = np.zeros((room_height, room_width), dtype=bool)
+    for f in placed_furniture:
+        x, y = f['grid_pos']
+        size = f['item']['size']
+        width = size[1] if f.get('rotation', 0) % 2 == 1 else size[0]
+        grid[y, max(0, x):max(0, x + width)] = True
+    return grid
+
+def _zone_masks(room_width: int, room_height: int):
+    """(내부 헬퍼 함수) _get_design_facts와 같은 기준의 (벽가, 중앙부, 입구) bool 마스크를 반환합니다."""
+    ys, xs = np.indices((room_height, room_width))
+    entrance = ys >= room_height - 2
+    center = ~entrance & (xs >= 2) & (xs < room_width - 2) & (ys >= 2) & (ys < room_height - 2)
+    wall = ~entrance & ~center
+    return wall, center, entrance
+
+def rule_based_score(internal_wishlist: list, placed_furniture: list, room_width: int, room_height: int, furniture_index=None) -> float:
+    """
+    (신규) LLM 없이 즉시 계산하는 잠정 점수 (0.0 ~ 5.0).
+    위시리스트 충족률(60%)과 배치 품질(40%: 밀도, 입구 혼잡도, 중앙부 개방감)을 격자 배열 연산으로 계산합니다.
+    AI 평가자 점수가 나오기 전 미리보기, 그리고 평가자를 쓸 수 없을 때의 대체 점수로 사용합니다.
+    """
+    if not placed_furniture:
         return 0.0
 
+    # 1. 위시리스트 충족률
+    _, missing_items = _wishlist_penalty(internal_wishlist, placed_furniture, furniture_index)
+    coverage = 1.0 - len(missing_items) / len(internal_wishlist) if internal_wishlist else 1.0
+
+    # 2. 격자 / 구역별 점유율
+    grid = _occupancy_grid(placed_furniture, room_width, room_height)
+    _, center, entrance = _zone_masks(room_width, room_height)
+    density = grid.mean()
+    entrance_ratio = grid[entrance].mean() if entrance.any() else 0.0
+    center_ratio = grid[center].mean() if center.any() else 0.0
+
+    # 3. 배치 품질 (각 0~1)
+    if density < 0.1:
+        density_score = density / 0.1               # 너무 비어 있음
+    elif density > 0.4:
+        density_score = max(0.0, 1.0 - (density - 0.4) / 0.4) # 너무 빽빽함
+    else:
+        density_score = 1.0
+    entrance_score = 1.0 - min(1.0, 2.0 * entrance_ratio)       # 입구 근처가 막힐수록 감점
+    center_score = 1.0 - min(1.0, max(0.0, center_ratio - 0.25) / 0.5) # 중앙부가 너무 차면 감점
+    layout = 0.5 * density_score + 0.25 * entrance_score + 0.25 * center_score
+
+    return round(float(5.0 * (0.6 * coverage + 0.4 * layout)), 1)
+
 # --- 3. 평가 실행 (NEW: ModelManager를 인자로 받음) ---
-def evaluate_design(model_manager, request_text: str, internal_wishlist: list, placed_furniture: list, room_width: int, room_height: int):
+def _reuse(future):
+    """
+    (내부 헬퍼 함수)
+    추측 사전 평가(speculation)로 미리 시작한 작업의 결과를 기다려 (True, 결과)를 반환합니다.
+    작업이 없거나 취소/실패했으면 (False, None)을 반환합니다 (호출자가 직접 다시 계산).
+    """
+    if future is None or future.cancelled():
+        return False, None
+    try:
+        return True, future.result()
+    except Exception as e:
+        print(f"추측 사전 평가 결과 사용 실패 ({e}). 다시 계산합니다.")
+        return False, None
+
+def _judge_with_deadline(model_manager, request_text, internal_wishlist, design_description, pending=None):
+    """
+    (내부 헬퍼 함수)
+    AI 평가자를 호출하되 config.JUDGE_DEADLINE 초 안에 끝나지 않으면 None을 반환합니다.
+    늦게 끝난 응답은 버려지지만 응답 캐시에는 남습니다.
+    (신규) pending(미리 시작한 평가자 작업의 Future)이 있으면 새로 호출하지 않고 그 결과를 기다립니다.
+    """
+    if not model_manager or not model_manager.is_ready:
+        return None
+
+    if pending is not None and not pending.cancelled():
+        try:
+            return pending.result(timeout=config.JUDGE_DEADLINE)
+        except FutureTimeoutError:
+            print(f"🚨 AI 평가자 응답이 {config.JUDGE_DEADLINE:.0f}초 안에 오지 않아 규칙 기반 점수를 사용합니다.")
+            return None
+        except Exception as e:
+            print(f"추측 사전 평가 결과 사용 실패 ({e}). 다시 계산합니다.")
+
+    holder = {}
+    worker = threading.Thread(
+        target=lambda: holder.setdefault('result', judge_design(model_manager, request_text, internal_wishlist, design_description)),
+        daemon=True
+    )
+    worker.start()
+    worker.join(config.JUDGE_DEADLINE)
+    if worker.is_alive():
+        print(f"🚨 AI 평가자 응답이 {config.JUDGE_DEADLINE:.0f}초 안에 오지 않아 규칙 기반 점수를 사용합니다.")
+    return holder.get('result')
+
+def _build_evaluation_graph(model_manager, request_text: str, internal_wishlist: list, placed_furniture: list, room_width: int, room_height: int, on_token=None, furniture_index=None, design_facts=None, precomputed=None) -> StageGraph:
+    """
+    (내부 헬퍼 함수)
+    평가 단계 그래프를 만듭니다. AI 평가자는 LLM 묘사를 기다리지 않고 사실 데이터로 바로 점수를 매깁니다.
+    design_facts(사실 데이터 텍스트)가 주어지면 다시 집계하지 않습니다.
+    precomputed({"describe": Future, "judge": Future})가 주어지면 미리 시작한 작업의 결과를 재사용합니다.
+
+        facts ─┬─ describe (LLM 묘사, 스트리밍)
+               └─ judge    (AI 평가자) ─┬─ score
+        penalty ────────────────────────┤
+        rule_score (평가자 실패 시 대체) ─┘
+    """
+    precomputed = precomputed or {}
+
+    def describe(facts):
+        reused, text = _reuse(precomputed.get("describe"))
+        if reused:
+            print("🔮 미리 생성한 묘사를 사용합니다.")
+            if on_token:
+                on_token(text)
+            return text
+        return describe_design(
+            model_manager, placed_furniture, room_width, room_height, on_token=on_token, design_facts=facts,
+            request_text=request_text
+        )
+
+    graph = StageGraph()
+    graph.add("facts", lambda: design_facts if design_facts is not None else _get_design_facts(placed_furniture, room_width, room_height))
+    graph.add("penalty", lambda: _wishlist_penalty(internal_wishlist, placed_furniture, furniture_index))
+    graph.add("describe", describe, deps=["facts"])
+    graph.add("judge", lambda facts: _judge_with_deadline(
+        model_manager,
+        request_text,      # (A) 공개 의뢰서
+        internal_wishlist, # (Secret) 비밀 위시리스트
+        facts,             # (B) 실제 디자인 (사실 데이터)
+        pending=precomputed.get("judge")
+    ), deps=["facts"])
+    graph.add("rule_score", lambda: rule_based_score(internal_wishlist, placed_furniture, room_width, room_height, furniture_index))
+
+    def final_score(judge, penalty, rule_score):
+        if judge is None:
+            # (신규) 평가자를 쓸 수 없거나 너무 느리면 규칙 기반 점수 사용 (위시리스트 충족률이 이미 반영됨)
+            print(f"점수 (규칙 기반): {rule_score:.1f}")
+            return rule_score
+        penalty_value, missing_items = penalty
+        for item in missing_items:
+            print(f"   [페널티] 요구 가구 '{item}' 누락.")
+        final = max(0.0, judge.score - penalty_value) # 0점 미만 방지
+        print(f"점수: {final:.1f}")
+        return final
+
+    graph.add("score", final_score, deps=["judge", "penalty", "rule_score"])
+    return graph
+
+def evaluate_design(model_manager, request_text: str, internal_wishlist: list, placed_furniture: list, room_width: int, room_height: int, on_token=None, furniture_index=None, design_facts=None, parallel=True):
     """
     (수정) LLM-as-Judge 방식으로 전체 평가 프로세스를 실행합니다.
+    (수정) 묘사 생성과 AI 평가자 점수는 단계 그래프에서 동시에 실행됩니다.
     
     Args:
         model_manager (ModelManager): Ollama 통신 객체
@@ -209,48 +444,125 @@ def evaluate_design(model_manager, request_text: str, internal_wishlist: list, p
         request_text (str): (신규) A - 공개 의뢰서
         internal_wishlist (list): (신규) Secret - 비밀 위시리스트
         placed_furniture (list): B - 배치된 가구
+        on_token (callable): (신규) 디자인 묘사 스트리밍 중 부분 텍스트를 받는 콜백
+        furniture_index (LazyFurnitureIndex): (신규) 가구 이름 임베딩 인덱스 (없으면 문자열 비교)
+        design_facts (str): (신규) DesignFacts.report() 결과 (없으면 placed_furniture로 집계)
+        parallel (bool): (신규) False면 단계를 하나씩 차례로 실행합니다 (벤치마크의 직렬 기준 경로)
     """
     print("\n--- [ 고객 평가 (LLM-Judge) ] ---")
-    
-    # 1. 현재 디자인(B)을 자연어로 변환
-    # (⭐️ 수정 ⭐️): model_manager를 describe_design에 전달
-    design_desc = describe_design(
-        model_manager, # <-- (신규) LLM 호출을 위해 전달
-        placed_furniture, 
-        room_width, 
-        room_height
+
+    graph = _build_evaluation_graph(
+        model_manager, request_text, internal_wishlist, placed_furniture,
+        room_width, room_height, on_token=on_token, furniture_index=furniture_index, design_facts=design_facts
     )
-    
-    # 2. LLM-Judge 호출
-    base_score = get_llm_judge_score(
-        model_manager,
-        request_text,      # (A) 공개 의뢰서
-        internal_wishlist, # (Secret) 비밀 위시리스트
-        design_desc        # (B) 실제 디자인
+    results = graph.run(serial=not parallel)
+
+    return {
+        "score": results["score"],
+        "description": results["describe"]
+    }
+
+def evaluate_with_feedback(model_manager, persona: dict, request_text: str, internal_wishlist: list, placed_furniture: list, room_width: int, room_height: int,
+                           on_token=None, on_score=None, on_feedback_token=None, furniture_index=None, design_facts=None, precomputed=None):
+    """
+    (신규) 평가 + 고객 피드백까지 단계 그래프 하나로 실행합니다.
+    피드백은 묘사를 기다리지 않고 점수가 나오는 즉시 (사실 데이터를 바탕으로) 생성을 시작합니다.
+    on_score(score)는 점수가 확정되는 즉시 호출됩니다.
+    precomputed는 추측 사전 평가(SpeculativeEvaluator.take)가 넘겨준 {단계 이름: Future}입니다.
+    {"score", "description", "feedback", "fallback"}를 반환합니다.
+    """
+    print("\n--- [ 고객 평가 (단계 그래프) ] ---")
+
+    graph = _build_evaluation_graph(
+        model_manager, request_text, internal_wishlist, placed_furniture,
+        room_width, room_height, on_token=on_token, furniture_index=furniture_index, design_facts=design_facts,
+        precomputed=precomputed
     )
 
-    # --- 3. 위시리스트 페널티 계산 ---
-    penalty = 0.0
-    missing_items = []
+    def feedback(facts, score):
+        if on_score:
+            on_score(score)
+        return client.generate_feedback(
+            model_manager, persona, request_text, internal_wishlist, facts, score, on_token=on_feedback_token
+        )
 
-    # 현재 배치된 모든 가구의 이름 (중복 제거)
-    placed_names = set([f['item']['name'] for f in placed_furniture])
-    
-    for item in internal_wishlist:
-        # 위시리스트의 아이템(예: "소파")이
-        # 배치된 가구 이름(예: "작은 소파", "큰 소파")에 포함되는지 확인
-        if item not in placed_names:
-            print(f"   [페널티] 요구 가구 '{item}' 누락.")
-            missing_items.append(item)
-            penalty += 0.5
-            
-    # 4. 최종 점수 계산
-    final_score = max(0.0, base_score - penalty) # 0점 미만 방지
-    
-    result = {
-        "score": final_score,
-        "description": design_desc
+    graph.add("feedback", feedback, deps=["facts", "score"])
+    results = graph.run()
+    print(f"[단계별 시간]\n{graph.report()}")
+
+    return {
+        "score": results["score"],
+        "description": results["describe"],
+        "feedback": results["feedback"],
+        "fallback": results["judge"] is None # 규칙 기반 대체 점수를 썼는지 여부
     }
-    
+
+# --- 4. (신규) 단일 호출 평가 ---
+
+# 단일 호출 평가 응답 형식
+SINGLE_PASS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "description": {"type": "string"},
+        "score": {"type": "number", "minimum": 0, "maximum": 5},
+        "feedback": {"type": "string"},
+    },
+    "required": ["description", "score", "feedback"],
+}
+
+def evaluate_design_single_pass(model_manager, persona: dict, request_text: str, internal_wishlist: list, placed_furniture: list, room_width: int, room_height: int, furniture_index=None, design_facts=None):
+    """
+    (신규) 묘사 / 점수 / 피드백을 LLM 호출 1번으로 생성합니다.
+    사실 데이터, 의뢰서, 위시리스트, 페르소나를 한 번만 보내고
+    {description, score, feedback} JSON을 받아 evaluate_design과 같은 방식으로 위시리스트 페널티를 적용합니다.
+    모델을 쓸 수 없거나 응답이 유효하지 않으면 None을 반환합니다 (호출자는 3단계 방식으로 대체).
+    """
+    print("\n--- [ 고객 평가 (단일 호출) ] ---")
+
+    if not model_manager or not model_manager.is_ready or not placed_furniture or not persona:
+        return None
+
+    if design_facts is None:
+        design_facts = _get_design_facts(placed_furniture, room_width, room_height)
+    penalty, missing_items = _wishlist_penalty(internal_wishlist, placed_furniture, furniture_index)
+
+    # (수정) 묘사/평가자/피드백과 같은 고정 접두부 + 공개 의뢰서 + 데이터 리포트, 페르소나와 위시리스트는 작업 지시에
+    missing_str = ", ".join(missing_items) if missing_items else "없음"
+    system_prompt = prompts.EVALUATION_SYSTEM_PROMPT
+    user_prompt = prompts.evaluation_prompt(
+        request_text, design_facts, prompts.TASK_SINGLE_PASS,
+        prompts.persona_line(persona)
+        + f"(비밀 위시리스트 중 방에 없는 가구: {missing_str})\n"
+        "평가 결과 JSON만 반환하세요:",
+        internal_wishlist=internal_wishlist or []
+    )
+
+    data = model_manager.get_json_response(system_prompt, user_prompt, SINGLE_PASS_SCHEMA, profile="single_pass")
+    if not data:
+        print("🚨 단일 호출 평가 응답이 유효하지 않습니다.")
+        return None
+
+    try:
+        base_score = min(5.0, max(0.0, float(data['score'])))
+    except (KeyError, TypeError, ValueError):
+        print("🚨 단일 호출 평가 점수가 유효하지 않습니다.")
+        return None
+
+    description = str(data.get('description') or design_facts).strip().replace('"', '')
+    feedback = str(data.get('feedback') or "").strip().replace('"', '')
+
+    for item in missing_items:
+        print(f"   [페널티] 요구 가구 '{item}' 누락.")
+    final_score = max(0.0, round(base_score, 1) - penalty) # 0점 미만 방지
+
+    print("[상세 디자인 묘사]")
+    print(description)
     print(f"점수: {final_score:.1f}")
-    return result
\ No newline at end of file
+    print("[ 피드백 ]")
+    print(feedback)
+
+    return {
+        "score": final_score,
+        "description": description,
+        "feedback": feedback
+    }
@@ -0,0 +1,192 @@
+# furniture_index.py
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from .model import ModelManager
+
+MATRIX_FILE = "embeddings.npy"
+MANIFEST_FILE = "manifest.json"
+
+class FurnitureIndex:
+    """
+    가구 이름 임베딩 인덱스입니다.
+    가구 이름들을 EEVE 임베딩으로 한 번만 변환해 정규화된 (N, D) 행렬로 보관하고,
+    디스크에는 메모리 매핑 가능한 .npy + manifest.json 으로 저장합니다.
+    평가 중에는 네트워크 호출 없이 행렬곱 한 번으로 코사인 유사도를 계산합니다.
+    """
+    def __init__(self, names: list, matrix: np.ndarray, catalog=None):
+        self.names = list(names)
+        self.matrix = matrix # 행마다 L2 정규화된 벡터
+        self.catalog = set(catalog or ()) # (신규) 실제로 배치할 수 있는 가구 이름 (정확히 비교)
+        self._row = {name: i for i, name in enumerate(self.names)}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._row
+
+    # --- 생성 / 저장 / 로드 ---
+    @classmethod
+    def build(cls, model_manager: ModelManager, names: list):
+        """
+        모든 이름을 한 번의 배치 임베딩 호출로 변환해 인덱스를 만듭니다.
+        하나라도 실패하면 None을 반환합니다.
+        """
+        if not model_manager or not model_manager.is_ready:
+            return None
+
+        vectors = model_manager.get_embeddings(names)
+        for name, vector in zip(names, vectors):
+            if not vector:
+                print(f"🚨 가구 임베딩 실패: {name}", file=sys.stderr)
+                return None
+
+        return cls(names, _normalize_rows(np.asarray(vectors, dtype=np.float32)))
+
+    def save(self, index_dir: str, model_name: str):
+        """행렬(.npy)과 manifest(모델, 이름 순서, 차원)를 저장합니다."""
+        os.makedirs(index_dir, exist_ok=True)
+        np.save(os.path.join(index_dir, MATRIX_FILE), np.ascontiguousarray(self.matrix))
+        manifest = {
+            "model": model_name,
+            "names": self.names,
+            "dim": int(self.matrix.shape[1]),
+            "created": time.time(),
+        }
+        with open(os.path.join(index_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, index_dir: str, model_name: str, names: list):
+        """
+        저장된 인덱스를 메모리 매핑으로 엽니다.
+        모델이 다르거나 필요한 이름이 빠져 있으면 None을 반환합니다 (재생성 필요).
+        """
+        try:
+            with open(os.path.join(index_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest['model'] != model_name or not set(names) <= set(manifest['names']):
+                return None
+            matrix = np.load(os.path.join(index_dir, MATRIX_FILE), mmap_mode='r')
+            if matrix.shape != (len(manifest['names']), manifest['dim']):
+                return None
+            return cls(manifest['names'], matrix)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"가구 인덱스 로드 실패 ({index_dir}): {e}", file=sys.stderr)
+            return None
+
+    @classmethod
+    def load_or_build(cls, model_manager: ModelManager, names: list, index_dir: str, catalog=None):
+        """
+        디스크에 맞는 인덱스가 있으면 로드하고, 없으면 새로 만들어 저장합니다.
+        (수정) 저장에 실패해도 (디스크 가득 참, 권한 등) 메모리의 인덱스는 그대로 사용합니다.
+        """
+        names = list(dict.fromkeys(names)) # 순서 유지 중복 제거
+        model_name = model_manager.embedding_model if model_manager else None
+
+        index = cls.load(index_dir, model_name, names)
+        if index is not None:
+            print(f"✅ 가구 임베딩 인덱스 로드 ({len(index.names)}개)")
+        else:
+            index = cls.build(model_manager, names)
+            if index is None:
+                return None
+            try:
+                index.save(index_dir, model_name)
+            except OSError as e:
+                print(f"🚨 가구 인덱스 저장 실패 ({index_dir}): {e}", file=sys.stderr)
+            print(f"✅ 가구 임베딩 인덱스 생성 ({len(index.names)}개)")
+
+        index.catalog = set(catalog or ())
+        return index
+
+    # --- 조회 ---
+    def vectors(self, names: list) -> np.ndarray:
+        """이름 목록에 해당하는 정규화 벡터들을 (len(names), D) 행렬로 반환합니다."""
+        return self.matrix[[self._row[name] for name in names]]
+
+    def similarity(self, names_a: list, names_b: list) -> np.ndarray:
+        """두 이름 목록 사이의 코사인 유사도 행렬 (len(a), len(b))을 반환합니다."""
+        if not names_a or not names_b:
+            return np.zeros((len(names_a), len(names_b)), dtype=np.float32)
+        return self.vectors(names_a) @ self.vectors(names_b).T
+
+    def top_k(self, query, k: int = 5) -> list:
+        """
+        가장 비슷한 가구 이름 k개를 (이름, 유사도) 리스트로 반환합니다.
+        query는 인덱스에 있는 가구 이름이거나 임베딩 벡터입니다.
+        """
+        if isinstance(query, str):
+            query_vec = self.matrix[self._row[query]]
+        else:
+            query_vec = _normalize_rows(np.asarray(query, dtype=np.float32)[None, :])[0]
+
+        scores = self.matrix @ query_vec
+        k = min(k, len(self.names))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.names[i], float(scores[i])) for i in top]
+
+    def find_missing(self, wishlist: list, placed_names, threshold: float) -> list:
+        """
+        위시리스트 중 배치되지 않은 항목을 반환합니다.
+        (수정) 카탈로그(catalog)에 있는 이름은 항상 정확한 문자열 비교로 판단합니다.
+        ('작은 소파'와 '큰 소파', '테이블'과 '탁자'는 서로 다른 가구이므로 유사도로 합치지 않음)
+        카탈로그 밖의 이름 중 인덱스에 있는 것만 배치된 가구와의 유사도가 threshold 이상이면 충족으로 봅니다.
+        threshold가 None(보정 전)이면 유사도 비교를 하지 않습니다.
+        """
+        placed_known = [name for name in placed_names if name in self]
+        wish_known = [name for name in wishlist if name in self and name not in self.catalog]
+
+        satisfied = set()
+        if threshold is not None and wish_known and placed_known:
+            best = self.similarity(wish_known, placed_known).max(axis=1)
+            satisfied = {name for name, score in zip(wish_known, best) if score >= threshold}
+
+        return [item for item in wishlist if item not in satisfied and item not in placed_names]
+
+class LazyFurnitureIndex:
+    """
+    (신규) 필요할 때 만드는 가구 이름 인덱스.
+    유사도 기준(threshold)이 None이면 인덱스를 만들지 않고 정확한 문자열 비교만 하므로
+    시작 시 카탈로그 전체 임베딩 호출을 하지 않습니다.
+    기준이 설정된 뒤 첫 find_missing()에서 한 번만 FurnitureIndex.load_or_build를 호출하며,
+    실패하면 이후에도 문자열 비교로 진행합니다.
+    """
+    def __init__(self, model_manager, names: list, index_dir: str, catalog=None):
+        self.model_manager = model_manager
+        self.names = list(names)
+        self.index_dir = index_dir
+        self.catalog = list(catalog or ())
+        self._index = None
+        self._attempted = False
+        self._lock = threading.Lock()
+
+    def get(self):
+        """인덱스를 반환합니다 (처음 호출 시 로드/생성, 실패하면 None)."""
+        with self._lock:
+            if not self._attempted:
+                self._attempted = True
+                try:
+                    self._index = FurnitureIndex.load_or_build(self.model_manager, self.names, self.index_dir, catalog=self.catalog)
+                except Exception as e:
+                    print(f"🚨 가구 임베딩 인덱스 준비 실패 (문자열 비교로 진행): {e}", file=sys.stderr)
+            return self._index
+
+    def find_missing(self, wishlist: list, placed_names, threshold: float) -> list:
+        """FurnitureIndex.find_missing과 같으나, threshold가 None이면 인덱스 없이 정확히 비교합니다."""
+        index = self.get() if threshold is not None else None
+        if index is None:
+            return [item for item in wishlist if item not in placed_names]
+        return index.find_missing(wishlist, placed_names, threshold)
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """(내부 헬퍼 함수) 각 행을 L2 노름 1로 정규화합니다."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
@@ -1,78 +1,183 @@
 import pygame
 import sys
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # 프로젝트 모듈 임포트
 from . import client
-from .model import ModelManager
+from .model import ModelManager, LazyEmbedding
+from .furniture_index import LazyFurnitureIndex
+from .pipeline import StageGraph
+from .request_pool import RequestPool
 from templates import furnitures
 import config
 
 # ========= 리소스 로딩 스레드 함수 =========
+# (신규) 로딩 작업 그래프: 이름 -> (상태 표시 문구, 의존 작업)
+LOADING_TASKS = {
+    "furniture_assets": ("가구 에셋 로드 중...", []),
+    "background":       ("배경 이미지 로드 중...", []),
+    "model":            ("AI 모델 서버에 연결 중... (Ollama)", []),
+    "request_pool":     ("의뢰서 풀 로드 중...", []),
+    "first_request":    ("새로운 고객 의뢰서 생성 중...", ["model", "request_pool"]),
+}
+
+def new_progress_tracker() -> dict:
+    """
+    (신규) 로딩 진행 상황 공유 dict.
+    로딩 스레드는 progress_tracker["lock"]을 잡은 상태에서만 고치고, 화면은 progress_snapshot()으로 복사본을 읽습니다.
+    """
+    return {
+        "lock": threading.Lock(),
+        "step": 0,
+        "total_steps": len(LOADING_TASKS),
+        "status": "초기화 중...",
+        "tasks": {name: {"state": "waiting", "ms": None} for name in LOADING_TASKS},
+    }
+
+def progress_snapshot(progress_tracker) -> dict:
+    """(신규) 진행 상황의 복사본 (작업별 dict까지 복사하므로 읽는 동안 로딩 스레드가 고쳐도 안전)."""
+    with progress_tracker["lock"]:
+        return {
+            "step": progress_tracker["step"],
+            "total_steps": progress_tracker["total_steps"],
+            "status": progress_tracker["status"],
+            "tasks": {name: dict(task) for name, task in progress_tracker["tasks"].items()},
+        }
+
+def _set_status(progress_tracker, status: str):
+    """(내부 헬퍼 함수) lock을 잡고 status 문구를 바꿉니다."""
+    with progress_tracker["lock"]:
+        progress_tracker["status"] = status
+
+def _update_status(progress_tracker):
+    """(내부 헬퍼 함수, lock을 잡은 상태에서 호출) 진행 중인 작업들의 문구를 합쳐 status로 표시합니다."""
+    running = [LOADING_TASKS[name][0] for name, task in progress_tracker["tasks"].items() if task["state"] == "running"]
+    progress_tracker["status"] = " / ".join(running) if running else progress_tracker["status"]
+
+def _tracked(name, fn, progress_tracker):
+    """(내부 헬퍼 함수) 작업 시작/끝을 progress_tracker["tasks"]에 기록하도록 fn을 감쌉니다 (모든 기록은 lock 안에서)."""
+    lock = progress_tracker["lock"]
+
+    def run(**deps):
+        with lock:
+            progress_tracker["tasks"][name]["state"] = "running"
+            _update_status(progress_tracker)
+        start = time.perf_counter()
+        state = "failed"
+        try:
+            value = fn(**deps)
+            state = "done"
+            return value
+        finally:
+            with lock:
+                task = progress_tracker["tasks"][name]
+                task["state"] = state
+                task["ms"] = (time.perf_counter() - start) * 1000.0
+                progress_tracker["step"] += 1
+                _update_status(progress_tracker)
+    return run
+
 def load_game_resources(results_dict, completion_event, progress_tracker):
     """
     (백그라운드 스레드) 모든 무거운 리소스(이미지, 모델)를 로드합니다.
+    (수정) 서로 의존하지 않는 작업(이미지 디코딩, 모델 서버 연결, 의뢰서 풀 읽기)은 작은 스레드 풀에서 동시에 실행하므로
+    시작 버튼까지의 시간은 가장 긴 의존 경로(보통 모델 연결 -> 첫 의뢰서)로 줄어듭니다.
+    이미지는 디코딩/스케일만 하고 화면 형식 변환(convert)은 메인 스레드에서 합니다 (_convert_surfaces).
+    progress_tracker(new_progress_tracker())의 "tasks"에는 작업별 상태(waiting/running/done/failed)와 걸린 시간(ms)이 기록됩니다.
     """
-    try:
-        total_steps = 5 # 총 5단계 작업
-        progress_tracker["total_steps"] = total_steps
-        
-        # 1. 가구 이미지 로드
-        progress_tracker["status"] = "가구 에셋 로드 중..."
-        results_dict['FURNITURE_LIST'] = furnitures.load_furniture_data(config.GRID_SIZE)
-        progress_tracker["step"] = 1
-        
-        # 2. 배경 이미지 로드
-        progress_tracker["status"] = "배경 이미지 로드 중..."
-        background_image = pygame.image.load(config.BACKGROUND_IMAGE_PATH).convert()
+
+    def load_furniture_assets():
+        results_dict['FURNITURE_LIST'] = furnitures.load_furniture_data(config.GRID_SIZE, convert=False)
+        return results_dict['FURNITURE_LIST']
+
+    def load_background():
+        background_image = pygame.image.load(config.BACKGROUND_IMAGE_PATH)
         results_dict['background_image'] = pygame.transform.scale(background_image, (config.GAME_AREA_WIDTH, config.GAME_AREA_HEIGHT))
-        progress_tracker["step"] = 2
-        
-        # 3. 모델 매니저 초기화 (가장 오래 걸리는 작업)
-        progress_tracker["status"] = "AI 모델 서버에 연결 중... (Ollama)"
+
+    def connect_model():
+        # 모델 매니저 초기화 (가장 오래 걸리는 작업)
         model_manager = ModelManager()
         results_dict['model_manager'] = model_manager
-        progress_tracker["step"] = 3
-
         if not model_manager.is_ready:
-             raise Exception("모델 매니저 로드 실패 (Ollama 서버 확인)")
-        
-        # 4. 첫 번째 의뢰서 생성 (네트워크 통신)
-        progress_tracker["status"] = "새로운 고객 의뢰서 생성 중..."
-        persona, wishlist, request_text = client.generate_request(model_manager)
-        
+            raise Exception("모델 매니저 로드 실패 (Ollama 서버 확인)")
+        return model_manager
+
+    def load_request_pool():
+        results_dict['request_pool'] = RequestPool.load(config.REQUEST_POOL_PATH)
+        return results_dict['request_pool']
+
+    def first_request(model, request_pool):
+        # 첫 번째 의뢰서 (미리 생성한 풀에서 꺼내고, 풀이 비었을 때만 네트워크 통신)
+        drawn = request_pool.draw()
+        persona, wishlist, request_text = drawn or client.generate_request(model)
+        if not request_text:
+            raise Exception("의뢰서 생성 실패")
+        request_pool.mark_served(persona, wishlist, request_text)
+
         results_dict['current_persona'] = persona
         results_dict['internal_wishlist'] = wishlist
         results_dict['request_text'] = request_text
-        progress_tracker["step"] = 4
-        
-        # 5. 첫 번째 임베딩 생성 (네트워크 통신)
-        progress_tracker["status"] = "고객 의뢰서 분석 중... (EEVE)"
-        request_embedding = model_manager.get_embedding(request_text)
-        results_dict['request_embedding'] = request_embedding
-        progress_tracker["step"] = 5
+        # (수정) 의뢰서 임베딩은 실제로 필요해질 때 계산 (시작 시 왕복 1회 절약)
+        results_dict['request_embedding'] = model.embed_later(request_text)
 
-        progress_tracker["status"] = "로드 완료!"
-        
-        if not request_embedding:
-            raise Exception("의뢰서 임베딩 실패")
+    task_fns = {
+        "furniture_assets": load_furniture_assets,
+        "background": load_background,
+        "model": connect_model,
+        "request_pool": load_request_pool,
+        "first_request": first_request,
+    }
+    graph = StageGraph()
+    for name, (_, deps) in LOADING_TASKS.items():
+        graph.add(name, _tracked(name, task_fns[name], progress_tracker), deps=deps)
+
+    try:
+        with ThreadPoolExecutor(max_workers=config.LOADING_WORKERS, thread_name_prefix="loading") as executor:
+            try:
+                graph.run(executor)
+            finally:
+                print(f"[로딩 작업별 시간]\n{graph.report()}")
+
+        # (수정) 가구 이름 임베딩 인덱스는 시작 시 만들지 않고, 유사도 기준이 설정된 뒤 첫 평가에서 만듦
+        catalog = [item['name'] for item in results_dict['FURNITURE_LIST']]
+        results_dict['furniture_index'] = LazyFurnitureIndex(
+            results_dict['model_manager'], client.FURNITURE_LIST_AS_LIST + catalog, config.FURNITURE_INDEX_DIR, catalog
+        )
+
+        with progress_tracker["lock"]:
+            progress_tracker["step"] = progress_tracker["total_steps"]
+            progress_tracker["status"] = "로드 완료!"
             
     except Exception as e:
         print(f"리소스 로딩 중 오류 (테스트 모드로 전환): {e}")
         # 실패 시 테스트 모드로 폴백
-        progress_tracker["status"] = f"오류 발생: {e}. 테스트 모드로 전환합니다."
-        results_dict['FURNITURE_LIST'] = results_dict.get('FURNITURE_LIST') or furnitures.load_furniture_data(config.GRID_SIZE)
+        _set_status(progress_tracker, f"오류 발생: {e}. 테스트 모드로 전환합니다.")
+        results_dict['FURNITURE_LIST'] = results_dict.get('FURNITURE_LIST') or furnitures.load_furniture_data(config.GRID_SIZE, convert=False)
         if 'background_image' not in results_dict:
              results_dict['background_image'] = None # 배경 로드 실패
         results_dict['model_manager'] = None
-        persona, wishlist, request_text = client.generate_request(None)
+        results_dict['furniture_index'] = None
+        # (수정) 의뢰서 풀이 있으면 테스트 의뢰서 대신 사용
+        request_pool = results_dict.get('request_pool') or RequestPool.load(config.REQUEST_POOL_PATH)
+        results_dict['request_pool'] = request_pool
+        persona, wishlist, request_text = request_pool.draw() or client.generate_request(None)
+        request_pool.mark_served(persona, wishlist, request_text)
         results_dict['current_persona'] = persona
+        results_dict['internal_wishlist'] = wishlist
         results_dict['request_text'] = request_text
-        results_dict['request_embedding'] = [0.1] * 128
+        results_dict['request_embedding'] = LazyEmbedding(None, request_text, fallback=[0.1] * 128)
     finally:
         # 메인 스레드에 로딩 완료 신호 전송
         completion_event.set()
 
+def _convert_surfaces(results_dict):
+    """(신규) (메인 스레드) 로딩 스레드가 디코딩한 이미지를 화면 형식으로 변환합니다."""
+    furnitures.convert_furniture_images(results_dict.get('FURNITURE_LIST') or [])
+    if results_dict.get('background_image') is not None:
+        results_dict['background_image'] = results_dict['background_image'].convert()
+
 # ========= 로딩 스크린 함수 =========
 def run_loading_screen(screen, clock, font_l, font_m):
     """
@@ -104,7 +209,7 @@ def run_loading_screen(screen, clock, font_l, font_m):
     # --- 2. 리소스 로딩 스레드 시작 ---
     loading_results = {}
     loading_complete_event = threading.Event()
-    progress_tracker = {"step": 0, "total_steps": 5, "status": "초기화 중..."}
+    progress_tracker = new_progress_tracker()
     
     loader_thread = threading.Thread(
         target=load_game_resources, 
@@ -137,7 +242,8 @@ def run_loading_screen(screen, clock, font_l, font_m):
         if not is_fully_loaded and loading_complete_event.is_set():
             is_fully_loaded = True
             current_progress = 1.0 # 100%로 강제
-            progress_tracker["status"] = "로드 완료! 시작 버튼을 누르세요."
+            _set_status(progress_tracker, "로드 완료! 시작 버튼을 누르세요.")
+            _convert_surfaces(loading_results) # (신규) 화면 형식 변환은 메인 스레드에서
 
         # --- 이벤트 처리 ---
         for event in pygame.event.get():
@@ -161,7 +267,8 @@ def run_loading_screen(screen, clock, font_l, font_m):
             
         else:
             # 2b. 로딩 중: 로딩 바 표시
-            target_progress = progress_tracker["step"] / progress_tracker["total_steps"]
+            progress = progress_snapshot(progress_tracker) # (수정) 로딩 스레드와 겹치지 않도록 복사본으로 그리기
+            target_progress = progress["step"] / progress["total_steps"]
             if current_progress < target_progress:
                 current_progress += 0.01 
                 if current_progress > target_progress:
@@ -179,6 +286,11 @@ def run_loading_screen(screen, clock, font_l, font_m):
             percent_text = font_m.render(f"{int(current_progress * 100)}%", True, (255, 255, 255))
             percent_rect = percent_text.get_rect(center=(bar_x + bar_width // 2, bar_y + bar_height // 2))
             screen.blit(percent_text, percent_rect)
+
+            # (신규) 지금 진행 중인 작업 표시
+            status_text = font_m.render(progress["status"], True, (255, 255, 255))
+            status_rect = status_text.get_rect(center=(bar_x + bar_width // 2, bar_y - 20))
+            screen.blit(status_text, status_rect)
         
         pygame.display.flip()
         clock.tick(60)
@@ -1,69 +1,331 @@
-from ollama import Client
+from ollama import Client, AsyncClient
+import asyncio
+import importlib.util
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+import httpx
+import json
 import sys
 import os
 from dotenv import load_dotenv
 
+import config
+from .cache import ResponseCache
+from .endpoints import Endpoint, EndpointPool
+
 load_dotenv()
 POD_ID = os.getenv("POD_ID")
 
 # RunPod에서 제공하는 Ollama 엔드포인트
 RUNPOD_HOST_URL = f"https://{POD_ID}-11434.proxy.runpod.net"
 
+def _resolve_default_hosts() -> list[str]:
+    """
+    (내부 헬퍼 함수)
+    사용할 Ollama 엔드포인트 목록을 환경 변수에서 읽습니다. (모두 쉼표로 여러 개 지정 가능)
+    1. OLLAMA_HOST_URL: 임의의 URL (예: 로컬 스텁 서버)
+    2. POD_IDS: 여러 RunPod 파드 ID
+    3. POD_ID: 기존 단일 RunPod 파드
+    """
+    host_urls = os.getenv("OLLAMA_HOST_URL")
+    if host_urls:
+        return [url.strip() for url in host_urls.split(',') if url.strip()]
+    pod_ids = os.getenv("POD_IDS")
+    if pod_ids:
+        return [f"https://{pod_id.strip()}-11434.proxy.runpod.net" for pod_id in pod_ids.split(',') if pod_id.strip()]
+    return [RUNPOD_HOST_URL]
+
+DEFAULT_HOSTS = _resolve_default_hosts()
+
+def _build_http_options() -> dict:
+    """
+    (내부 헬퍼 함수)
+    커넥션 풀 / keep-alive / 타임아웃 설정을 httpx 클라이언트 인자로 변환합니다.
+    HTTP/2는 h2 패키지가 설치된 경우에만 켭니다.
+    """
+    use_http2 = config.OLLAMA_HTTP2 and importlib.util.find_spec("h2") is not None
+    return {
+        "timeout": httpx.Timeout(config.OLLAMA_READ_TIMEOUT, connect=config.OLLAMA_CONNECT_TIMEOUT),
+        "limits": httpx.Limits(
+            max_connections=config.OLLAMA_POOL_SIZE,
+            max_keepalive_connections=config.OLLAMA_POOL_SIZE,
+            keepalive_expiry=config.OLLAMA_KEEPALIVE_EXPIRY,
+        ),
+        "http2": use_http2,
+    }
+
+class _EventLoopThread:
+    """
+    (내부 헬퍼 클래스)
+    AsyncClient 전용 이벤트 루프를 데몬 스레드에서 돌립니다.
+    어느 스레드에서든 코루틴을 넘기면 결과가 나올 때까지 기다려 돌려줍니다.
+    """
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=1.0)
+
+class PromptTokenEstimator:
+    """
+    (신규) 프롬프트 토큰 수 추정기.
+    서버 응답의 prompt_eval_count / 프롬프트 글자 수로 '글자당 토큰 수'를 측정해 두고,
+    새 프롬프트의 토큰 수를 글자 수로부터 추정합니다.
+    서버의 프롬프트 캐시로 prompt_eval_count가 작게 나올 수 있으므로 최근 측정값 중 최댓값을 사용합니다.
+    """
+    def __init__(self, default_ratio: float, window: int = 32):
+        self.default_ratio = default_ratio
+        self._ratios = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    @property
+    def ratio(self) -> float:
+        with self._lock:
+            return max(self._ratios) if self._ratios else self.default_ratio
+
+    def observe(self, prompt_chars: int, prompt_eval_count):
+        """응답 1건의 실제 프롬프트 토큰 수를 반영합니다."""
+        if not prompt_chars or not prompt_eval_count:
+            return
+        with self._lock:
+            self._ratios.append(prompt_eval_count / prompt_chars)
+
+    def estimate(self, prompt_chars: int) -> int:
+        return int(prompt_chars * self.ratio) + 1
+
+def _prompt_chars(messages: list) -> int:
+    """(내부 헬퍼 함수) 메시지 내용의 총 글자 수 (역할 태그 등 템플릿 토큰 몫으로 메시지당 8글자 추가)."""
+    return sum(len(m.get('content', '')) + 8 for m in messages)
+
+def _latency_kind(method: str, profile: str) -> str:
+    """
+    (내부 헬퍼 함수) 지연 시간 통계를 모을 호출 종류 ('chat:judge' 등).
+    긴 묘사/피드백 생성과 짧은 평가자 호출의 p95가 섞이지 않도록 profile별로 나눕니다.
+    """
+    return f"{method}:{profile}"
+
 class ModelManager:
     """
     Ollama 서버와의 모든 통신을 관리하는 클래스입니다.
     연결 확인, 모델(EEVE, Chat) 준비, 임베딩 생성을 담당합니다.
+
+    use_async=True이면 AsyncClient를 백그라운드 이벤트 루프에서 사용하고,
+    기존 동기 메서드(get_chat_response 등)는 그 위의 동기 파사드로 동작합니다.
+    두 모드 모두 keep-alive 커넥션 풀을 공유하므로 호출마다 TLS 연결을 새로 맺지 않습니다.
+
+    채팅/임베딩 응답은 (model, messages, options) 키로 ResponseCache에 저장되며,
+    히트/미스 통계는 cache_stats()로 확인할 수 있습니다.
+    (수정) 채팅 응답은 결과가 정해진 호출(temperature 0 또는 seed 지정)만 캐시합니다.
+
+    엔드포인트(파드)가 여러 개이면 EndpointPool이 진행 중 요청이 가장 적은 곳으로 보내고,
+    hedge=True 호출은 느린 파드를 기다리는 대신 다른 파드에 중복 요청을 보냅니다.
     """
-    def __init__(self, embedding_model='EEVE-Korean-10.8B', chat_model='llama3'):
+    def __init__(self, embedding_model='EEVE-Korean-10.8B', chat_model='llama3', use_async=None, host=None, hosts=None):
         print("=== 모델 초기화 중... ===")
         self.embedding_model = embedding_model
         self.chat_model = chat_model
+        self.use_async = config.OLLAMA_USE_ASYNC if use_async is None else use_async
+        self.hosts = list(hosts or ([host] if host else DEFAULT_HOSTS))
         self.is_ready = False
+        self.pool = EndpointPool([], config.OLLAMA_HEDGE_DEFAULT_DELAY, config.OLLAMA_HEDGE_MIN_DELAY)
+        self._loop_thread = None
+        self._executor = None
+        self._last_activity = time.monotonic()
+        self._keep_alive_stop = threading.Event()
+        self.token_estimator = PromptTokenEstimator(config.PROMPT_TOKENS_PER_CHAR) # (신규) 컨텍스트 초과 감시용
+        # (수정) 채팅 모델의 num_ctx는 모든 호출(예열 포함)에서 같은 값 (바뀌면 Ollama가 모델을 다시 올림)
+        self.chat_num_ctx = config.CHAT_NUM_CTX
+        self._num_ctx_lock = threading.Lock()
+        self._prompt_stats = {} # (신규) profile -> {"calls", "prompt_tokens", "estimated_tokens", "prompt_eval_ms", "truncated", "json_failures"}
+        self._prompt_stats_lock = threading.Lock()
 
-        # --- (수정) RunPod에 연결하는 Client 생성 ---
+        # (신규) 응답 캐시 (메모리 LRU + 디스크)
+        self.cache = None
+        if config.RESPONSE_CACHE_ENABLED:
+            self.cache = ResponseCache(
+                max_entries=config.RESPONSE_CACHE_MAX_ENTRIES,
+                ttl=config.RESPONSE_CACHE_TTL,
+                disk_dir=config.RESPONSE_CACHE_DIR,
+                max_disk_entries=config.RESPONSE_CACHE_MAX_DISK_ENTRIES,
+            )
+
+        # --- (수정) 엔드포인트마다 RunPod에 연결하는 Client 생성 ---
         try:
-            # 지정된 RunPod URL로 Client 생성
-            self.client = Client(host=RUNPOD_HOST_URL)
-            print(f"RunPod에 연결합니다...")
-        
+            http_options = _build_http_options()
+            if self.use_async:
+                # AsyncClient는 전용 이벤트 루프 안에서 생성해야 커넥션 풀이 그 루프에 묶입니다.
+                self._loop_thread = _EventLoopThread()
+                clients = [self._loop_thread.run(self._create_async_client(h, http_options)) for h in self.hosts]
+            else:
+                # 지정된 RunPod URL로 Client 생성 (동기 호출은 스레드 풀에서 실행)
+                clients = [Client(host=h, **http_options) for h in self.hosts]
+                self._executor = ThreadPoolExecutor(max_workers=config.OLLAMA_POOL_SIZE * len(self.hosts))
+            self.pool.endpoints = [Endpoint(h, c) for h, c in zip(self.hosts, clients)]
+            print(f"RunPod에 연결합니다... (엔드포인트 {len(self.hosts)}개, async={self.use_async}, http2={http_options['http2']})")
+
             self._initialize_ollama()
 
+            # (신규) 유휴 중 keep_alive 갱신 (첫 요청/평가가 cold model을 만나지 않도록)
+            if self.is_ready and config.OLLAMA_KEEP_ALIVE_REFRESH > 0:
+                threading.Thread(target=self._keep_alive_loop, daemon=True).start()
+
         except Exception as e:
             print(f"🚨 Client 생성 실패: {e}", file=sys.stderr)
             print("RunPod URL이 정확한지, Ollama가 해당 포트에서 실행 중인지 확인하세요.")
             self.is_ready = False
 
-    def _initialize_ollama(self):
+    def embed_later(self, text: str, fallback=None):
+        """
+        (신규) 실제로 필요해질 때 계산되는 지연 임베딩 객체를 반환합니다.
+        """
+        return LazyEmbedding(self, text, fallback)
+
+    @staticmethod
+    async def _create_async_client(host: str, http_options: dict) -> AsyncClient:
+        return AsyncClient(host=host, **http_options)
+
+    def _submit(self, endpoint: Endpoint, method: str, kwargs: dict):
+        """
+        (내부 헬퍼 함수)
+        특정 엔드포인트에 API 호출을 시작하고 concurrent.futures.Future를 반환합니다.
+        """
+        if self.use_async:
+            return asyncio.run_coroutine_threadsafe(getattr(endpoint.client, method)(**kwargs), self._loop_thread.loop)
+        return self._executor.submit(getattr(endpoint.client, method), **kwargs)
+
+    def _call(self, method: str, hedge: bool = False, kind: str = None, **kwargs):
         """
-        Ollama 서버에 연결하고 필요한 모델이 있는지 확인합니다.
-        없으면 모델을 pull 합니다.
+        (동기 파사드) Ollama API 메서드를 호출합니다.
+        EndpointPool이 엔드포인트를 고르고, async 모드에서는 이벤트 루프 스레드에서 실행됩니다.
+        (수정) kind는 지연 시간 통계 / 헤지 대기 시간을 따로 잡을 호출 종류입니다 (기본: method).
         """
+        self._last_activity = time.monotonic()
+        return self.pool.call(lambda endpoint: self._submit(endpoint, method, kwargs), kind=kind or method, hedge=hedge)
+
+    def _cached(self, key_parts: tuple, compute):
+        """
+        (내부 헬퍼 함수)
+        캐시가 켜져 있으면 key_parts로 조회/저장하고, 꺼져 있으면 compute()를 그대로 호출합니다.
+        """
+        if self.cache is None:
+            return compute()
+        return self.cache.get_or_compute(ResponseCache.make_key(*key_parts), compute)
+
+    def cache_stats(self) -> dict:
+        """응답 캐시의 히트/미스 카운터를 반환합니다."""
+        return self.cache.stats() if self.cache else {}
+
+    def endpoint_stats(self) -> dict:
+        """엔드포인트별 진행 중 요청 수 / 지연 시간 / 헤징 통계를 반환합니다."""
+        return self.pool.stats()
+
+    def close(self):
+        """커넥션 풀과 이벤트 루프를 정리합니다."""
+        self._keep_alive_stop.set()
         try:
-            self.client.list()
-            print("🦙 Ollama 연결 완료\n")
-            
-            # 필요한 모델 목록
-            required_models_name = [self.embedding_model, self.chat_model]
-
-            # 실제로 받아온 모델 목록 (위와 비교)
-            model_list = self.client.list()['models']
-            available_models = [model['model'] for model in model_list]
-
-            for model_name in required_models_name:
-                # 모델 이름에 특수문자를 포함할 수 있으므로 startswith로 검사
-                if not any(m.startswith(model_name) for m in available_models):
-                    print(f"🚨 모델 '{model_name}' 없음. Pull하는 중...")
-                    self.client.pull(model_name)
-                    print(f"✅ 모델 '{model_name}' Pull 완료")
+            for endpoint in self.pool.endpoints:
+                if self.use_async:
+                    self._loop_thread.run(endpoint.client.close())
                 else:
-                    print(f"✅ 모델 '{model_name}' 준비 완료")
-            print()
-            
-            self.is_ready = True
-
+                    endpoint.client.close()
+            if self._loop_thread is not None:
+                self._loop_thread.stop()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
         except Exception as e:
-            print(f"Error: {e}\n", file=sys.stderr)
-            self.is_ready = False
+            print(f"Error from 'close()': {e}", file=sys.stderr)
+
+    def _initialize_ollama(self):
+        """
+        각 Ollama 서버에 연결하고 필요한 모델이 있는지 확인합니다.
+        없으면 모델을 pull 하고, (설정 시) 예열 요청으로 모델을 메모리에 올려 둡니다.
+        (수정) 모든 엔드포인트 x 모델 확인을 동시에 진행합니다.
+        연결에 실패한 엔드포인트는 풀에서 제외합니다.
+        """
+        endpoints = list(self.pool.endpoints)
+        with ThreadPoolExecutor(max_workers=len(endpoints) or 1) as startup_pool:
+            futures = {startup_pool.submit(self._prepare_endpoint, endpoint): endpoint for endpoint in endpoints}
+            for future, endpoint in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Error ({endpoint.host}): {e}\n", file=sys.stderr)
+                    self.pool.remove(endpoint)
+
+        self.is_ready = bool(self.pool.endpoints)
+
+    def _prepare_endpoint(self, endpoint: Endpoint):
+        """(내부 헬퍼 함수) 엔드포인트 1개의 연결 확인 및 모델 준비 (모델별로 동시에)."""
+        # 실제로 받아온 모델 목록 (연결 확인 겸용)
+        model_list = self._submit(endpoint, 'list', {}).result()['models']
+        print(f"🦙 Ollama 연결 완료 ({endpoint.host})")
+
+        # 필요한 모델 목록
+        required_models_name = [self.embedding_model, self.chat_model]
+
+        available_models = [model['model'] for model in model_list]
+
+        def prepare_model(model_name):
+            # 모델 이름에 특수문자를 포함할 수 있으므로 startswith로 검사
+            if not any(m.startswith(model_name) for m in available_models):
+                print(f"🚨 모델 '{model_name}' 없음. Pull하는 중...")
+                self._submit(endpoint, 'pull', {'model': model_name}).result()
+                print(f"✅ 모델 '{model_name}' Pull 완료")
+            else:
+                print(f"✅ 모델 '{model_name}' 준비 완료")
+
+            if config.OLLAMA_WARMUP_ON_START:
+                start = time.perf_counter()
+                self._warm_up(endpoint, model_name)
+                print(f"🔥 모델 '{model_name}' 예열 완료 ({time.perf_counter() - start:.1f}초)")
+
+        with ThreadPoolExecutor(max_workers=len(required_models_name)) as model_pool:
+            for future in [model_pool.submit(prepare_model, name) for name in dict.fromkeys(required_models_name)]:
+                future.result()
+
+    def _warm_up(self, endpoint: Endpoint, model_name: str):
+        """
+        (내부 헬퍼 함수)
+        모델을 서버 메모리에 올리고 keep_alive 시간을 갱신합니다.
+        임베딩 모델은 짧은 embed, 채팅 모델은 토큰 1개짜리 생성으로 예열합니다.
+        (수정) 채팅 모델은 실제 호출과 같은 num_ctx로 예열해야 첫 요청에서 다시 올리지 않습니다.
+        """
+        if model_name == self.embedding_model:
+            self._submit(endpoint, 'embed', {
+                'model': model_name, 'input': ["예열"], 'keep_alive': config.OLLAMA_KEEP_ALIVE
+            }).result()
+        else:
+            self._submit(endpoint, 'generate', {
+                'model': model_name, 'prompt': "안녕", 'options': {'num_predict': 1, 'num_ctx': self.chat_num_ctx},
+                'keep_alive': config.OLLAMA_KEEP_ALIVE
+            }).result()
+
+    def _keep_alive_loop(self):
+        """
+        (백그라운드 스레드)
+        마지막 요청 이후 OLLAMA_KEEP_ALIVE_REFRESH 초 동안 조용하면
+        모든 엔드포인트의 모델을 다시 예열해 서버가 모델을 내리지 않도록 합니다.
+        """
+        interval = config.OLLAMA_KEEP_ALIVE_REFRESH
+        while not self._keep_alive_stop.wait(interval / 4):
+            if time.monotonic() - self._last_activity < interval:
+                continue
+            for endpoint in list(self.pool.endpoints):
+                for model_name in dict.fromkeys([self.embedding_model, self.chat_model]):
+                    try:
+                        self._warm_up(endpoint, model_name)
+                    except Exception as e:
+                        print(f"keep_alive 갱신 실패 ({endpoint.host}, {model_name}): {e}", file=sys.stderr)
+            self._last_activity = time.monotonic()
 
     def get_embedding(self, text: str) -> list[float]:
         """
@@ -71,42 +333,413 @@ class ModelManager:
         """
         if not self.is_ready or not text:
             return []
-            
-        try:
-            response = self.client.embeddings(model=self.embedding_model, prompt=text)
-            return response['embedding']
-        except Exception as e:
-            print(f"Error from 'get_embedding()': {e}", file=sys.stderr)
-            return []
-            
+
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """
+        (신규) 여러 텍스트를 한 번의 embed 호출(다중 input)로 변환합니다.
+        캐시에 있는 텍스트는 제외하고 나머지만 서버로 보냅니다.
+        실패한 항목은 빈 리스트로 반환합니다.
+        """
+        if not self.is_ready or not texts:
+            return [[] for _ in texts]
+
+        results = {}
+        pending = []
+        for text in dict.fromkeys(texts): # 순서 유지 중복 제거
+            if not text:
+                results[text] = []
+                continue
+            if self.cache is not None:
+                found, vector = self.cache.get(ResponseCache.make_key('embed', self.embedding_model, text))
+                if found:
+                    results[text] = vector
+                    continue
+            pending.append(text)
+
+        if pending:
+            try:
+                start = time.perf_counter()
+                response = self._call('embed', model=self.embedding_model, input=pending, keep_alive=config.OLLAMA_KEEP_ALIVE)
+                cost = (time.perf_counter() - start) / len(pending)
+                for text, vector in zip(pending, response['embeddings']):
+                    results[text] = list(vector)
+                    if self.cache is not None:
+                        self.cache.put(ResponseCache.make_key('embed', self.embedding_model, text), results[text], cost)
+            except Exception as e:
+                print(f"Error from 'get_embeddings()': {e}", file=sys.stderr)
+
+        return [results.get(text, []) for text in texts]
+
+    def _build_chat_request(self, system_prompt: str, user_prompt: str, options=None, format=None, profile: str = "default") -> dict:
+        """
+        (내부 헬퍼 함수)
+        chat 호출에 넘길 model / messages / options 를 구성합니다.
+        (수정) 옵션은 config.GENERATION_PROFILES[profile] 위에 options를 덮어써서 만들고,
+        num_ctx는 항상 고정값(self.chat_num_ctx)을 넣습니다 (_check_num_ctx 참고).
+        format(JSON 스키마)이 있으면 구조화 출력을 요청합니다.
+        """
+        messages = [
+            {'role': 'system', 'content': system_prompt},
+            {'role': 'user', 'content': user_prompt},
+        ]
+        merged_options = dict(config.GENERATION_PROFILES.get(profile, config.GENERATION_PROFILES["default"]))
+        merged_options.update(options or {})
+        if not merged_options.get("stop"):
+            merged_options.pop("stop", None)
+
+        merged_options["num_ctx"] = self._check_num_ctx(messages, merged_options.get("num_predict", 0), profile)
+
+        request = {"model": self.chat_model, "messages": messages, "options": merged_options, "keep_alive": config.OLLAMA_KEEP_ALIVE}
+        if format is not None:
+            request["format"] = format
+        return request
+
+    def _check_num_ctx(self, messages: list, num_predict: int, profile: str) -> int:
+        """
+        (내부 헬퍼 함수)
+        프롬프트 토큰 추정치 + num_predict가 고정 num_ctx를 넘는지 확인합니다.
+        Ollama는 num_ctx가 바뀔 때마다 모델을 다시 올리므로 호출마다 크기를 바꾸지 않고,
+        넘칠 때만 (CHAT_NUM_CTX_AUTO_GROW이면) 2배씩 한 번 늘려 이후 호출에도 그 값을 씁니다 (줄이지 않음).
+        """
+        needed = int(self.token_estimator.estimate(_prompt_chars(messages)) * config.PROMPT_TOKEN_MARGIN) + max(0, num_predict)
+        with self._num_ctx_lock:
+            if needed <= self.chat_num_ctx:
+                return self.chat_num_ctx
+            grown = self.chat_num_ctx
+            while config.CHAT_NUM_CTX_AUTO_GROW and grown < needed and grown < config.NUM_CTX_MAX:
+                grown = min(grown * 2, config.NUM_CTX_MAX)
+            if grown != self.chat_num_ctx:
+                print(f"⚠️ 컨텍스트 크기 증가: {self.chat_num_ctx} -> {grown} (추정 {needed} 토큰, profile={profile}, 모델 재적재 1회)", file=sys.stderr)
+                self.chat_num_ctx = grown
+            if needed > self.chat_num_ctx:
+                print(f"⚠️ 프롬프트가 컨텍스트({self.chat_num_ctx})를 넘을 수 있습니다 (추정 {needed} 토큰, profile={profile})", file=sys.stderr)
+            return self.chat_num_ctx
+
+    def _observe_prompt_tokens(self, request: dict, response, profile: str = "default"):
+        """
+        (내부 헬퍼 함수) 응답의 prompt_eval_count로 글자당 토큰 수 측정값을 갱신하고,
+        (신규) 호출마다 프롬프트 토큰 수 / 평가 시간을 출력하고 profile별로 집계합니다.
+        서버가 프롬프트 접두부를 캐시에서 재사용하면 prompt_eval_count는 새로 계산한 토큰만 세므로,
+        전체 프롬프트 추정치와의 차이로 접두부 재사용 비율을 추정합니다.
+        """
+        prompt_chars = _prompt_chars(request['messages'])
+        estimated = self.token_estimator.estimate(prompt_chars) # 측정값 반영 전 추정치 (전체 프롬프트)
+        prompt_eval_count = getattr(response, 'prompt_eval_count', None)
+        self.token_estimator.observe(prompt_chars, prompt_eval_count)
+        # (신규) num_predict 상한에 걸려 잘린 응답 (JSON이면 파싱 실패로 이어짐)
+        if getattr(response, 'done_reason', None) == 'length':
+            print(f"⚠️ 응답이 num_predict 상한({request['options'].get('num_predict')})에서 잘렸습니다 (profile={profile})", file=sys.stderr)
+            self._count_profile_event(profile, "truncated")
+        if not prompt_eval_count:
+            return
+        prompt_eval_ms = (getattr(response, 'prompt_eval_duration', None) or 0) / 1e6
+        with self._prompt_stats_lock:
+            stats = self._profile_stats(profile)
+            stats["calls"] += 1
+            stats["prompt_tokens"] += prompt_eval_count
+            stats["estimated_tokens"] += max(estimated, prompt_eval_count)
+            stats["prompt_eval_ms"] += prompt_eval_ms
+        reuse = max(0.0, 1.0 - prompt_eval_count / estimated) if estimated else 0.0
+        print(f"[프롬프트] {profile}: {prompt_eval_count} 토큰 평가 ({prompt_eval_ms:.0f}ms, 접두부 재사용 추정 {reuse:.0%})")
+
+    def _profile_stats(self, profile: str) -> dict:
+        """(내부 헬퍼 함수, _prompt_stats_lock을 잡은 상태에서 호출) profile의 집계 dict."""
+        return self._prompt_stats.setdefault(profile, {
+            "calls": 0, "prompt_tokens": 0, "estimated_tokens": 0, "prompt_eval_ms": 0.0, "truncated": 0, "json_failures": 0
+        })
+
+    def _count_profile_event(self, profile: str, event: str):
+        """(내부 헬퍼 함수) profile의 잘림 / JSON 파싱 실패 횟수를 1 늘립니다."""
+        with self._prompt_stats_lock:
+            self._profile_stats(profile)[event] += 1
+
+    def prompt_stats(self) -> dict:
+        """
+        (신규) profile별 호출 수 / 평균 평가 토큰 수 / 평균 프롬프트 평가 시간(ms) /
+        추정 접두부 재사용 비율(1 - 평가 토큰 / 전체 프롬프트 추정 토큰)을 반환합니다.
+        (신규) num_predict 상한에서 잘린 응답 수(truncated)와 JSON 파싱 실패 수(json_failures)도 함께 반환합니다.
+        """
+        with self._prompt_stats_lock:
+            return {
+                profile: {
+                    "calls": stats["calls"],
+                    "mean_prompt_tokens": stats["prompt_tokens"] / stats["calls"] if stats["calls"] else 0.0,
+                    "mean_prompt_eval_ms": stats["prompt_eval_ms"] / stats["calls"] if stats["calls"] else 0.0,
+                    "prefix_reuse": 1.0 - stats["prompt_tokens"] / stats["estimated_tokens"] if stats["estimated_tokens"] else 0.0,
+                    "truncated": stats["truncated"],
+                    "json_failures": stats["json_failures"],
+                }
+                for profile, stats in self._prompt_stats.items()
+            }
+
+    @staticmethod
+    def _is_cacheable(request: dict) -> bool:
+        """
+        (내부 헬퍼 함수) 같은 요청에 항상 같은 응답이 나오는 호출인지 (temperature 0 또는 seed 지정).
+        샘플링 호출(의뢰서, 묘사, 피드백 등)을 캐시하면 같은 프롬프트에 하루 동안 같은 '무작위' 글이 반복되므로 캐시하지 않습니다.
+        """
+        options = request['options']
+        return options.get('temperature') == 0 or options.get('seed') is not None
+
+    @staticmethod
+    def _cache_key_parts(request: dict) -> tuple:
+        """(내부 헬퍼 함수) num_ctx는 출력에 영향을 주지 않고 자동 증가로 바뀔 수 있으므로 캐시 키에서 제외합니다."""
+        options = {k: v for k, v in request['options'].items() if k != 'num_ctx'}
+        return ('chat', request['model'], request['messages'], options, request.get('format'))
+
     # 모델 프롬프트 응답
-    def get_chat_response(self, system_prompt: str, user_prompt: str) -> str:
+    def get_chat_response(self, system_prompt: str, user_prompt: str, on_token=None, hedge=False, options=None, format=None, profile: str = "default") -> str:
         """
         채팅 모델을 사용해 자연어 응답을 생성합니다.
+        on_token이 주어지면 스트리밍으로 생성하면서, 토큰이 도착할 때마다
+        지금까지 누적된 텍스트를 on_token(partial_text)으로 넘겨줍니다.
+        hedge=True이면 (스트리밍이 아닐 때) 느린 엔드포인트에 대해 헤지 요청을 보냅니다.
+        profile / options / format은 _build_chat_request를 참고하세요.
         """
         if not self.is_ready:
             return "🚨 모델이 준비되지 않음"
-            
+
         try:
-            messages = [
-                {'role': 'system', 'content': system_prompt},
-                {'role': 'user', 'content': user_prompt},
-                {'role': 'assistant', 'content': "아늑하고 소파와 테이블이 있는 작은 거실이 좋아요."}
-            ]
-            options = {
-                "temperature": 0.7,
-                "num_ctx": 2048,
-                "top_p": 1,
-                "num_predict": 1000
-            }
+            request = self._build_chat_request(system_prompt, user_prompt, options, format, profile)
+            key_parts = self._cache_key_parts(request)
+            cache = self.cache if self._is_cacheable(request) else None
 
-            response = self.client.chat(
-                model=self.chat_model, 
-                messages=messages,
-                options=options
-            )
+            if on_token is not None:
+                # 캐시에 있으면 스트리밍 없이 한 번에 전달
+                if cache is not None:
+                    found, cached_text = cache.get(ResponseCache.make_key(*key_parts))
+                    if found:
+                        on_token(cached_text)
+                        return cached_text
 
-            return response['message']['content']
+                start = time.perf_counter()
+                partial_text = ""
+                for token in self._stream_request(request, profile):
+                    partial_text += token
+                    on_token(partial_text)
+                if cache is not None and partial_text:
+                    cache.put(ResponseCache.make_key(*key_parts), partial_text, time.perf_counter() - start)
+                return partial_text
+
+            def compute():
+                response = self._call('chat', hedge=hedge, kind=_latency_kind('chat', profile), **request)
+                self._observe_prompt_tokens(request, response, profile)
+                return response['message']['content']
+
+            return self._cached(key_parts, compute) if cache is not None else compute()
         except Exception as e:
             print(f"Error 'get_chat_response()': {e}", file=sys.stderr)
-            return "🚨 피드백 생성 중 오류"
\ No newline at end of file
+            return "🚨 피드백 생성 중 오류"
+
+    def get_json_response(self, system_prompt: str, user_prompt: str, schema: dict, options=None, hedge=False, profile: str = "judge"):
+        """
+        (신규) JSON 스키마로 출력 형식을 강제한 채팅 응답을 dict로 반환합니다.
+        모델을 쓸 수 없거나 JSON 파싱에 실패하면 None을 반환합니다.
+        """
+        if not self.is_ready:
+            return None
+
+        raw_text = self.get_chat_response(system_prompt, user_prompt, hedge=hedge, options=options, format=schema, profile=profile)
+        return self._parse_json(raw_text, profile)
+
+    def _parse_json(self, raw_text: str, profile: str):
+        """(내부 헬퍼 함수) JSON 응답 텍스트를 dict로 바꿉니다 (실패하면 None, profile별 실패 횟수 집계)."""
+        try:
+            data = json.loads(raw_text)
+        except (json.JSONDecodeError, TypeError):
+            print(f"Error 'get_json_response()': JSON 파싱 실패: {str(raw_text)[:100]!r}", file=sys.stderr)
+            self._count_profile_event(profile, "json_failures")
+            return None
+        return data if isinstance(data, dict) else None
+
+    def submit_json_response(self, system_prompt: str, user_prompt: str, schema: dict, options=None, hedge=False, profile: str = "judge") -> Future:
+        """
+        (신규) get_json_response를 기다리지 않고 시작해 Future(결과: dict 또는 None)를 반환합니다.
+        future.cancel()은 보내기 전인 헤지 요청뿐 아니라 이미 진행 중인 요청도 실제로 끊습니다.
+        - async 모드: 이벤트 루프의 작업을 취소 (HTTP 요청이 닫힘)
+        - 동기 모드: 스트리밍으로 받다가 취소되면 스트림을 닫음 (서버가 생성을 멈춤)
+        샘플링 호출용이므로 응답 캐시는 거치지 않습니다.
+        """
+        if not self.is_ready:
+            future = Future()
+            future.set_result(None)
+            return future
+
+        request = self._build_chat_request(system_prompt, user_prompt, options, schema, profile)
+        self._last_activity = time.monotonic()
+        return self.pool.submit_call(
+            lambda endpoint: self._submit_cancellable_chat(endpoint, request, profile),
+            kind=_latency_kind('chat', profile),
+            hedge=hedge,
+            transform=lambda raw_text: self._parse_json(raw_text, profile)
+        )
+
+    def _submit_cancellable_chat(self, endpoint: Endpoint, request: dict, profile: str) -> Future:
+        """(내부 헬퍼 함수) 취소하면 진행 중인 요청이 끊기는 chat 호출을 시작합니다 (결과: 응답 텍스트)."""
+        if self.use_async:
+            return asyncio.run_coroutine_threadsafe(self._achat_text(endpoint, request, profile), self._loop_thread.loop)
+        future = Future()
+        self._executor.submit(self._collect_stream, future, endpoint, request, profile)
+        return future
+
+    async def _achat_text(self, endpoint: Endpoint, request: dict, profile: str) -> str:
+        """(내부 헬퍼 함수) 이벤트 루프에서 chat을 호출하고 응답 텍스트를 반환합니다."""
+        response = await endpoint.client.chat(**request)
+        self._observe_prompt_tokens(request, response, profile)
+        return response['message']['content']
+
+    def _collect_stream(self, future: Future, endpoint: Endpoint, request: dict, profile: str):
+        """
+        (내부 헬퍼 함수, 동기 모드)
+        chat 응답을 스트리밍으로 모아 future에 넣습니다. future가 취소되면 다음 조각에서 스트림을 닫고 멈춥니다.
+        """
+        try:
+            chunks = endpoint.client.chat(stream=True, **request)
+            text = ""
+            try:
+                for chunk in chunks:
+                    if future.cancelled():
+                        return
+                    text += chunk['message']['content']
+                    if getattr(chunk, 'done', False):
+                        self._observe_prompt_tokens(request, chunk, profile)
+            finally:
+                chunks.close() # 생성기를 닫으면 HTTP 스트림도 닫힘
+            result, error = text, None
+        except Exception as e:
+            result, error = None, e
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass # 그사이 취소됨
+
+    def stream_chat_response(self, system_prompt: str, user_prompt: str, profile: str = "default"):
+        """
+        (제너레이터) 채팅 응답을 토큰(조각) 단위로 yield 합니다.
+        연결 오류는 호출자에게 그대로 전달됩니다.
+        """
+        if not self.is_ready:
+            return
+
+        yield from self._stream_request(self._build_chat_request(system_prompt, user_prompt, profile=profile), profile)
+
+    def _stream_request(self, request: dict, profile: str = "default"):
+        """(내부 헬퍼 함수) 이미 구성된 chat 요청을 스트리밍으로 보내고 토큰을 yield 합니다."""
+        self._last_activity = time.monotonic()
+        kind = _latency_kind('chat_stream', profile)
+        endpoint = self.pool.acquire(kind)
+        start = time.perf_counter()
+        ok = False
+        try:
+            if self.use_async:
+                chunks = self._iter_async_stream(endpoint, request)
+            else:
+                chunks = endpoint.client.chat(stream=True, **request)
+
+            for chunk in chunks:
+                token = chunk['message']['content']
+                if token:
+                    yield token
+                if getattr(chunk, 'done', False):
+                    self._observe_prompt_tokens(request, chunk, profile)
+            ok = True
+        finally:
+            self.pool.release(endpoint, kind, time.perf_counter() - start, ok)
+
+    def _iter_async_stream(self, endpoint: Endpoint, request: dict):
+        """
+        (내부 헬퍼 함수)
+        이벤트 루프에서 도는 AsyncClient 스트림을 큐로 받아 동기 제너레이터로 바꿉니다.
+        """
+        chunk_queue = queue.Queue()
+        end_of_stream = object()
+
+        async def pump():
+            try:
+                async for chunk in await endpoint.client.chat(stream=True, **request):
+                    chunk_queue.put(chunk)
+            except Exception as e:
+                chunk_queue.put(e)
+            finally:
+                chunk_queue.put(end_of_stream)
+
+        asyncio.run_coroutine_threadsafe(pump(), self._loop_thread.loop)
+
+        while True:
+            item = chunk_queue.get()
+            if item is end_of_stream:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    # --- 비동기 API (async 모드 전용, 이벤트 루프 안에서 await) ---
+    async def _acall(self, method: str, kind: str = None, **kwargs):
+        """(내부 헬퍼 함수) _call의 비동기 버전 (최소 진행 중 요청 라우팅, 헤징 없음)."""
+        kind = kind or method
+        endpoint = self.pool.acquire(kind)
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = await getattr(endpoint.client, method)(**kwargs)
+            ok = True
+            return response
+        finally:
+            self.pool.release(endpoint, kind, time.perf_counter() - start, ok)
+
+    async def aget_embedding(self, text: str) -> list[float]:
+        """get_embedding의 비동기 버전입니다."""
+        if not self.is_ready or not text or not self.use_async:
+            return []
+        try:
+            response = await self._acall('embed', model=self.embedding_model, input=[text], keep_alive=config.OLLAMA_KEEP_ALIVE)
+            return list(response['embeddings'][0])
+        except Exception as e:
+            print(f"Error from 'aget_embedding()': {e}", file=sys.stderr)
+            return []
+
+    async def aget_chat_response(self, system_prompt: str, user_prompt: str, profile: str = "default") -> str:
+        """get_chat_response의 비동기 버전입니다."""
+        if not self.is_ready or not self.use_async:
+            return "🚨 모델이 준비되지 않음"
+        try:
+            request = self._build_chat_request(system_prompt, user_prompt, profile=profile)
+            response = await self._acall('chat', kind=_latency_kind('chat', profile), **request)
+            self._observe_prompt_tokens(request, response, profile)
+            return response['message']['content']
+        except Exception as e:
+            print(f"Error 'aget_chat_response()': {e}", file=sys.stderr)
+            return "🚨 피드백 생성 중 오류"
+
+class LazyEmbedding:
+    """
+    (신규) 지연 임베딩.
+    get()을 처음 호출할 때(또는 prefetch()로 백그라운드에서) 한 번만 계산합니다.
+    아무도 읽지 않으면 임베딩 요청을 보내지 않습니다.
+    모델을 쓸 수 없거나 실패하면 fallback 값을 반환합니다.
+    """
+    def __init__(self, model_manager, text: str, fallback=None):
+        self.model_manager = model_manager
+        self.text = text
+        self.fallback = fallback if fallback is not None else []
+        self._value = None
+        self._lock = threading.Lock()
+
+    def get(self) -> list[float]:
+        with self._lock:
+            if self._value is None:
+                vector = []
+                if self.model_manager and self.model_manager.is_ready:
+                    vector = self.model_manager.get_embedding(self.text)
+                self._value = vector or self.fallback
+            return self._value
+
+    def prefetch(self):
+        """백그라운드 스레드에서 미리 계산을 시작합니다."""
+        threading.Thread(target=self.get, daemon=True).start()
+        return self
@@ -0,0 +1,99 @@
+# occupancy.py
+import numpy as np
+
+EMPTY = -1
+DOOR = -2
+
+class OccupancyGrid:
+    """
+    (신규) 격자 점유 인덱스.
+    (room_height, room_width) int 배열에 각 칸을 차지한 가구의 배치 id를 기록합니다.
+    - 가구: '바닥 격자'(utils.check_collision과 같은 높이 1 영역)만 기록
+    - 문: DOOR 값으로 기록 (가구의 전체 영역과 겹치면 안 됨)
+    배치 가능 여부는 배열 슬라이스 검사, 커서 아래 가구 찾기는 칸 1개 조회로 끝나므로
+    방에 놓인 가구 수와 관계없이 비용이 일정합니다.
+    """
+    def __init__(self, room_width: int, room_height: int):
+        self.room_width = room_width
+        self.room_height = room_height
+        self.grid = np.full((room_height, room_width), EMPTY, dtype=np.int32)
+        self.door_position = None
+        self._placements = {} # 배치 id -> 가구 dict
+        self._ids = {}        # id(가구 dict) -> 배치 id
+        self._next_id = 0
+
+    @staticmethod
+    def _visual_size(item: dict, rotation: int):
+        """(내부 헬퍼 함수) utils.get_rotated_size와 같은 회전 후 (w, h)."""
+        size = item['size']
+        return (size[1], size[0]) if rotation % 2 == 1 else size
+
+    # --- 갱신 ---
+    def set_door(self, door_position):
+        """문 위치를 바꿉니다 (None이면 문 없음)."""
+        if self.door_position is not None:
+            x, y = self.door_position
+            self.grid[y, x] = EMPTY
+        self.door_position = door_position
+        if door_position is not None:
+            x, y = door_position
+            self.grid[y, x] = DOOR
+
+    def add(self, furniture: dict):
+        """가구 1개의 바닥 격자를 기록합니다."""
+        placement_id = self._next_id
+        self._next_id += 1
+        self._placements[placement_id] = furniture
+        self._ids[id(furniture)] = placement_id
+
+        x, y = furniture['grid_pos']
+        width, _ = self._visual_size(furniture['item'], furniture.get('rotation', 0))
+        self.grid[y, x:x + width] = placement_id
+
+    def remove(self, furniture: dict):
+        """가구 1개의 바닥 격자를 비웁니다."""
+        placement_id = self._ids.pop(id(furniture), None)
+        if placement_id is None:
+            return
+        del self._placements[placement_id]
+
+        x, y = furniture['grid_pos']
+        width, _ = self._visual_size(furniture['item'], furniture.get('rotation', 0))
+        row = self.grid[y, x:x + width]
+        row[row == placement_id] = EMPTY
+
+    def clear(self):
+        """모든 가구를 지웁니다 (문은 유지)."""
+        self.grid.fill(EMPTY)
+        self._placements.clear()
+        self._ids.clear()
+        self.set_door(self.door_position)
+
+    # --- 조회 ---
+    def check_collision(self, new_item: dict, new_pos, new_rot: int) -> bool:
+        """utils.check_collision과 같은 규칙의 충돌 판정 (True면 놓을 수 없음)."""
+        x, y = new_pos
+        width, height = self._visual_size(new_item, new_rot)
+
+        # 1. 방 경계 확인
+        if x < 0 or y < 0 or x + width > self.room_width or y + height > self.room_height:
+            return True
+
+        # 2. 다른 가구의 바닥 격자와 겹치는지 확인 (바닥 1줄)
+        if (self.grid[y, x:x + width] >= 0).any():
+            return True
+
+        # 3. 가구 전체 영역이 문과 겹치는지 확인
+        if self.door_position is not None:
+            door_x, door_y = self.door_position
+            if x <= door_x < x + width and y <= door_y < y + height:
+                return True
+
+        return False
+
+    def piece_at(self, grid_x: int, grid_y: int):
+        """해당 칸의 바닥 격자를 차지한 가구 dict를 반환합니다 (없으면 None)."""
+        if not (0 <= grid_x < self.room_width and 0 <= grid_y < self.room_height):
+            return None
+        placement_id = int(self.grid[grid_y, grid_x])
+        return self._placements.get(placement_id) if placement_id >= 0 else None
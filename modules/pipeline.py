@@ -0,0 +1,119 @@
+# pipeline.py
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import config
+
+# 평가 단계들이 공유하는 작업자 풀 (LLM 호출은 대부분 I/O 대기이므로 스레드로 충분)
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+def get_worker_pool() -> ThreadPoolExecutor:
+    """(처음 호출 시 생성) 단계 실행용 공유 스레드 풀을 반환합니다."""
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = ThreadPoolExecutor(max_workers=config.PIPELINE_WORKERS, thread_name_prefix="stage")
+        return _worker_pool
+
+class StageGraph:
+    """
+    (신규) 작은 단계 의존 그래프(DAG) 실행기.
+    각 단계는 fn(**의존 단계 결과)로 호출되며, 의존 단계가 모두 끝나는 즉시 작업자 풀에서 시작합니다.
+    서로 의존하지 않는 단계(예: 묘사 생성과 AI 평가자 점수)는 동시에 실행됩니다.
+
+        graph = StageGraph()
+        graph.add("facts", make_facts)
+        graph.add("describe", describe, deps=["facts"])
+        graph.add("judge", judge, deps=["facts"])
+        results = graph.run()
+    """
+    def __init__(self):
+        self._stages = {} # name -> (fn, deps)
+        self.timings = {} # name -> (시작, 끝) 초, run() 시작 기준
+
+    def add(self, name: str, fn, deps=()):
+        for dep in deps:
+            if dep not in self._stages:
+                raise ValueError(f"알 수 없는 의존 단계: {dep} (단계 '{name}')")
+        self._stages[name] = (fn, list(deps))
+        return self
+
+    def run(self, executor: ThreadPoolExecutor = None, serial: bool = False) -> dict:
+        """
+        모든 단계를 실행하고 {단계 이름: 결과}를 반환합니다.
+        단계가 예외를 던지면 그 단계에 의존하는 단계는 건너뛰고, 남은 단계가 끝난 뒤 첫 예외를 다시 던집니다.
+        serial=True면 작업자 풀 없이 호출한 스레드에서 추가한 순서대로 하나씩 실행합니다 (비교 기준용).
+        """
+        if serial:
+            return self._run_serial()
+        executor = executor or get_worker_pool()
+        results = {}
+        pending = dict(self._stages)
+        running = {} # future -> name
+        first_error = None
+        origin = time.perf_counter()
+
+        def run_stage(name, fn, kwargs):
+            start = time.perf_counter() - origin
+            try:
+                return fn(**kwargs)
+            finally:
+                self.timings[name] = (start, time.perf_counter() - origin)
+
+        while pending or running:
+            # 의존 단계가 모두 끝난 단계를 시작 (실패한 단계에 의존하면 건너뜀)
+            for name, (fn, deps) in list(pending.items()):
+                if any(dep in pending or dep in running.values() for dep in deps):
+                    continue
+                del pending[name]
+                if any(dep not in results for dep in deps):
+                    continue
+                kwargs = {dep: results[dep] for dep in deps}
+                running[executor.submit(run_stage, name, fn, kwargs)] = name
+
+            if not running:
+                break
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    print(f"단계 '{name}' 실패: {e}", file=sys.stderr)
+                    first_error = first_error or e
+
+        if first_error is not None:
+            raise first_error
+        return results
+
+    def _run_serial(self) -> dict:
+        """(신규) 단계를 추가한 순서(의존 단계가 항상 먼저)대로 호출한 스레드에서 실행합니다."""
+        results = {}
+        first_error = None
+        origin = time.perf_counter()
+        for name, (fn, deps) in self._stages.items():
+            if any(dep not in results for dep in deps):
+                continue
+            start = time.perf_counter() - origin
+            try:
+                results[name] = fn(**{dep: results[dep] for dep in deps})
+            except Exception as e:
+                print(f"단계 '{name}' 실패: {e}", file=sys.stderr)
+                first_error = first_error or e
+            finally:
+                self.timings[name] = (start, time.perf_counter() - origin)
+
+        if first_error is not None:
+            raise first_error
+        return results
+
+    def report(self) -> str:
+        """단계별 시작/종료 시각을 한 줄씩 문자열로 반환합니다 (시작 순)."""
+        lines = []
+        for name, (start, end) in sorted(self.timings.items(), key=lambda item: item[1][0]):
+            lines.append(f"  {name:<10} {start * 1000:7.0f}ms -> {end * 1000:7.0f}ms ({(end - start) * 1000:.0f}ms)")
+        return "\n".join(lines)
@@ -0,0 +1,87 @@
+# prompts.py
+"""
+(신규) 서버 프롬프트 캐시(KV 캐시)를 재사용하기 위한 평가 프롬프트 배치.
+
+    [시스템] EVALUATION_SYSTEM_PROMPT           <- 모든 호출에서 글자 하나까지 같은 고정 접두부
+    [사용자] 공개 의뢰서                        <- 같은 고객이면 같음
+             데이터 리포트 (사실 데이터)          <- 같은 배치면 같음
+             작업 (역할 지시 / 비밀 위시리스트 / 추가 지시) <- 호출마다 다른 부분은 맨 끝에만
+
+묘사 / 평가자 / 피드백 / 단일 호출 평가가 모두 이 순서를 따르므로
+한 배치를 평가하는 동안 '작업' 앞까지는 서버가 다시 계산하지 않습니다.
+(수정) 공유 접두부에는 플레이어에게 보여도 되는 자료(공개 의뢰서, 사실 데이터)만 넣습니다.
+비밀 위시리스트와 역할별 지시는 '작업' 안에만 들어가므로, 화면에 스트리밍되는 묘사는 위시리스트를 보지 못합니다.
+"""
+
+import config
+
+TASK_DESCRIBE = "묘사"
+TASK_JUDGE = "평가"
+TASK_FEEDBACK = "피드백"
+TASK_SINGLE_PASS = "종합"
+
+EVALUATION_SYSTEM_PROMPT = (
+    "당신은 인테리어 디자인 게임에서 고객의 방을 살펴보는 AI입니다.\n"
+    "모든 요청은 '공개 의뢰서' -> '데이터 리포트' -> '작업' 순서로 주어집니다. "
+    "'작업'에 적힌 역할과 지시만 수행하고, 다른 말은 절대 하지 마세요.\n"
+)
+
+# 역할별 지시 ('작업' 블록 맨 앞에 들어감)
+ROLE_INSTRUCTIONS = {
+    TASK_DESCRIBE: (
+        "당신은 인테리어 디자이너 또는 공간 비평가입니다. "
+        "딱딱한 '데이터 리포트'를 '감성적이고 자연스러운' 묘사 문장(1-2 문단)으로 한국어로 재작성하세요. "
+        "사실을 왜곡하지 말고, 긍정/부정 판단도 하지 마세요. 의뢰서 내용은 묘사에 쓰지 말고 오직 '묘사'만 하세요. "
+        "(예: '방이 빽빽합니다' -> '가구들이 공간을 알차게 채우고 있네요.')\n"
+    ),
+    TASK_JUDGE: (
+        "당신은 까다로운 인테리어 디자인 평가자입니다. "
+        "JSON 객체 하나만 반환하세요: "
+        "{\"score\": 0.0~5.0 사이의 소수점 한 자리 점수, \"missing\": 디자인에 빠진 위시리스트 가구 이름 목록, "
+        f"\"notes\": {config.JUDGE_NOTES_MAX_CHARS}자 이내의 한 줄 근거}}.\n"
+        "  1. [사실(60%)] '데이터 리포트'에 '비밀 위시리스트'의 가구가 포함되어 있습니까? (가장 중요)\n"
+        "  2. [분위기(40%)] '데이터 리포트'가 '공개 의뢰서'의 모호한 분위기(예: 아늑함, 모던함)를 만족시킵니까?\n"
+        "  3. [감점] '데이터 리포트'에 '빽빽하게', '복잡해' 등의 부정적 표현이 있다면 감점하세요.\n"
+    ),
+    TASK_FEEDBACK: (
+        "당신은 아래에 적힌 고객 본인이며, 방금 디자이너의 작업에 점수를 매겼습니다. "
+        "당신의 성격과 말투에 100% 몰입하여, '왜' 그 점수를 주었는지 1-2문장의 구체적인 피드백을 한글로 작성하세요. "
+        "점수가 높으면 당신의 방식대로 칭찬하고, 낮으면 당신의 방식대로 비판하세요.\n"
+        "  1. (필수) 비밀 위시리스트가 충족되지 않았다면 그 점을 불만스럽게 지적하세요.\n"
+        "  2. (필수) 방의 '밀도'나 '공간 배치'(중앙부, 벽가 등)에 대해서도 한마디 언급하세요.\n"
+        "  (예: '중앙부가 비어있어 좋네요', '너무 빽빽해서 답답해요', '입구 근처에 가구가 많아 불편해요')\n"
+    ),
+    TASK_SINGLE_PASS: (
+        "당신은 아래에 적힌 고객 본인입니다. "
+        "description(데이터 리포트를 감성적으로 옮긴 1-2 문단의 방 묘사, 위시리스트는 언급하지 않음), "
+        "score(비밀 위시리스트 충족 60% / 의뢰서 분위기 40% 기준의 0.0~5.0 점수), "
+        "feedback(당신의 말투로 쓴 1-2문장 피드백, 빠진 위시리스트와 공간 배치를 언급)을 담은 JSON 객체 하나만 반환하세요.\n"
+    ),
+}
+
+def shared_block(request_text: str, design_facts: str) -> str:
+    """모든 작업이 공유하는 접두부. 플레이어에게 보여도 되는 자료만 담습니다 (비밀 위시리스트 제외)."""
+    return (
+        f"--- 공개 의뢰서 ---\n\"{request_text or ''}\"\n\n"
+        f"--- 데이터 리포트 ---\n{design_facts}\n---\n\n"
+    )
+
+def wishlist_line(internal_wishlist: list) -> str:
+    """평가자 / 피드백 / 단일 호출 '작업'에만 넣는 비밀 위시리스트 한 줄."""
+    wishlist_str = ", ".join(internal_wishlist) if internal_wishlist else "없음"
+    return f"비밀 위시리스트: [{wishlist_str}]\n"
+
+def persona_line(persona: dict) -> str:
+    """피드백 / 단일 호출 작업 지시에 넣는 고객 페르소나 한 줄."""
+    return f"당신은 고객 '{persona['name']}'입니다. 당신의 성격과 말투는 다음과 같습니다: {persona['tendency']}\n"
+
+def evaluation_prompt(request_text: str, design_facts: str, task: str, instruction: str = "", internal_wishlist: list = None) -> str:
+    """
+    공개 의뢰서 -> 데이터 리포트 -> 작업 순서의 사용자 프롬프트 (가변 부분은 맨 끝).
+    internal_wishlist를 주면 '작업' 안에만 비밀 위시리스트를 넣습니다 (묘사에는 주지 않음).
+    """
+    secret = wishlist_line(internal_wishlist) if internal_wishlist is not None else ""
+    return (
+        shared_block(request_text, design_facts)
+        + f"--- 작업: [{task}] ---\n{ROLE_INSTRUCTIONS[task]}{secret}{instruction}"
+    )
@@ -0,0 +1,146 @@
+# request_pool.py
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+
+from templates.personas import PERSONAS
+
+POOL_VERSION = 1
+USED_VERSION = 2 # <pool>.used 형식 (1: 목록 위치, 2: 항목 id)
+
+def save_pool(path: str, entries: list):
+    """
+    (persona, wishlist, request_text) 목록을 압축된 색인 형식으로 저장합니다.
+    페르소나는 id 표, 가구는 이름 표의 번호로 저장해 항목마다 문자열을 반복하지 않습니다.
+        {"version": 1, "personas": ["persona_01", ...], "furniture": ["책장", ...],
+         "entries": [[페르소나 번호, [가구 번호, ...], "의뢰서"], ...]}
+    """
+    persona_ids, furniture_names = [], []
+    persona_index, furniture_index = {}, {}
+
+    def index_of(value, table, lookup):
+        if value not in lookup:
+            lookup[value] = len(table)
+            table.append(value)
+        return lookup[value]
+
+    packed = [
+        [index_of(persona['id'], persona_ids, persona_index),
+         [index_of(name, furniture_names, furniture_index) for name in wishlist],
+         request_text]
+        for persona, wishlist, request_text in entries
+    ]
+    data = {"version": POOL_VERSION, "personas": persona_ids, "furniture": furniture_names, "entries": packed}
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def load_pool(path: str) -> list:
+    """save_pool로 저장한 파일을 [(persona, wishlist, request_text), ...]로 읽습니다. 현재 PERSONAS에 없는 페르소나는 건너뜁니다."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != POOL_VERSION:
+        raise ValueError(f"지원하지 않는 의뢰서 풀 버전: {data.get('version')}")
+
+    personas_by_id = {persona['id']: persona for persona in PERSONAS}
+    personas = [personas_by_id.get(persona_id) for persona_id in data['personas']]
+    furniture = data['furniture']
+    return [
+        (personas[p], [furniture[i] for i in wishlist], request_text)
+        for p, wishlist, request_text in data['entries']
+        if personas[p] is not None and request_text
+    ]
+
+def entry_id(persona: dict, wishlist: list, request_text: str) -> str:
+    """
+    항목 내용으로 만든 고정 id.
+    풀 파일의 항목 순서가 바뀌거나 (알 수 없는 페르소나라서) 건너뛴 항목이 있어도 같은 항목은 같은 id를 가집니다.
+    """
+    raw = json.dumps([persona['id'], list(wishlist), request_text], ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+class RequestPool:
+    """
+    (신규) 미리 생성해 둔 의뢰서 풀.
+    draw()는 아직 쓰지 않은 항목을 무작위로 하나 꺼내며 (LLM 호출 없음),
+    (수정) 실제로 손님에게 보여 준 항목만 mark_served()로 옆 파일(<path>.used)에 기록해 다음 실행에서 반복되지 않게 합니다.
+    선반입만 하고 보여 주지 못한 항목은 다음 실행에서 다시 쓸 수 있습니다.
+    기록은 목록 위치가 아닌 항목 내용의 id(entry_id)로 저장합니다.
+    모두 쓰면 draw()는 None을 반환합니다 (호출한 쪽에서 실시간 생성).
+    """
+    def __init__(self, path: str, entries: list, used=None):
+        self.path = path
+        self.entries = entries
+        self._ids = [entry_id(*entry) for entry in entries]
+        self._known = set(self._ids)
+        self._used = set(used or ()) & self._known # 풀에서 빠진 항목의 기록은 정리
+        self._remaining = [i for i, item_id in enumerate(self._ids) if item_id not in self._used]
+        random.shuffle(self._remaining)
+        self._lock = threading.Lock()
+
+    @property
+    def used_path(self) -> str:
+        return self.path + ".used"
+
+    @classmethod
+    def load(cls, path: str):
+        """풀 파일을 읽습니다. 파일이 없거나 읽을 수 없으면 빈 풀을 반환합니다."""
+        if not path or not os.path.exists(path):
+            return cls(path, [])
+        try:
+            entries = load_pool(path)
+        except Exception as e:
+            print(f"🚨 의뢰서 풀 로드 실패 ({path}): {e}", file=sys.stderr)
+            return cls(path, [])
+
+        used = []
+        try:
+            with open(path + ".used", 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get('version') == USED_VERSION:
+                used = data.get('ids', [])
+            else:
+                print(f"🚨 이전 형식의 의뢰서 풀 사용 기록은 무시합니다 ({path}.used)", file=sys.stderr)
+        except (OSError, json.JSONDecodeError):
+            pass
+        pool = cls(path, entries, used)
+        print(f"📦 의뢰서 풀 로드: {len(pool)}/{len(entries)}개 남음 ({path})")
+        return pool
+
+    def __len__(self):
+        with self._lock:
+            return len(self._remaining)
+
+    def draw(self):
+        """남은 항목 하나를 (persona, wishlist, request_text)로 꺼냅니다 (없으면 None). 사용 기록은 남기지 않습니다."""
+        with self._lock:
+            if not self._remaining:
+                return None
+            index = self._remaining.pop()
+        persona, wishlist, request_text = self.entries[index]
+        return persona, list(wishlist), request_text
+
+    def mark_served(self, persona: dict, wishlist: list, request_text: str):
+        """손님에게 실제로 보여 준 항목을 사용 기록에 남깁니다. 풀에 없는 (실시간 생성한) 의뢰서는 무시합니다."""
+        if persona is None or not request_text:
+            return
+        item_id = entry_id(persona, wishlist, request_text)
+        with self._lock:
+            if item_id not in self._known or item_id in self._used:
+                return
+            self._used.add(item_id)
+            used = sorted(self._used)
+        self._save_used(used)
+
+    def _save_used(self, used: list):
+        try:
+            with open(self.used_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": USED_VERSION, "ids": used}, f)
+        except OSError as e:
+            print(f"🚨 의뢰서 풀 사용 기록 저장 실패: {e}", file=sys.stderr)
@@ -0,0 +1,79 @@
+# result_cache.py
+import hashlib
+import json
+
+import config
+from .cache import ResponseCache
+from .design_facts import DesignFacts
+
+LEVEL_EXACT = "exact"
+LEVEL_FACTS = "facts"
+
+def layout_fingerprint(placed_furniture: list, door_position, room_width: int, room_height: int, level: str = LEVEL_EXACT, design_facts: DesignFacts = None) -> str:
+    """
+    배치의 정규 지문을 만듭니다. (가구를 놓은 순서와 무관)
+    - "exact": 방 크기, 문 위치, 가구별 (이름, 좌표, 회전)이 모두 같아야 같은 지문
+    - "facts": (수정) 회전이나 놓은 순서만 다른 배치를 합칩니다. 사실 데이터(DesignFacts.canonical(): 종류별 개수,
+               구역별 가구 이름과 좌표, 밀도 구간)와 문 위치가 같으면 같은 지문입니다.
+               좌표는 그대로 남으므로 "exact"보다 크게 합쳐지지는 않습니다 (좌표를 버리면 다른 방의 묘사/피드백을 재사용하게 됨).
+    design_facts가 주어지면 "facts" 지문을 다시 집계하지 않고 그 값을 사용합니다.
+    """
+    if level == LEVEL_FACTS:
+        facts = design_facts or DesignFacts.from_layout(placed_furniture, room_width, room_height)
+        canonical = [LEVEL_FACTS, (room_width, room_height), door_position, facts.canonical()]
+    elif level == LEVEL_EXACT:
+        placements = sorted(
+            (f['item']['name'], f['grid_pos'][0], f['grid_pos'][1], f.get('rotation', 0) % 4)
+            for f in placed_furniture
+        )
+        canonical = [LEVEL_EXACT, (room_width, room_height), door_position, placements]
+    else:
+        raise ValueError(f"알 수 없는 지문 수준: {level}")
+
+    raw = json.dumps(canonical, ensure_ascii=False, default=list)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+class EvaluationResultCache:
+    """
+    (신규) 평가 결과 캐시.
+    (배치 지문, 의뢰서, 위시리스트) -> {score, description, feedback}를 디스크에 저장해
+    같거나 동등한 디자인은 LLM을 전혀 호출하지 않고 결과를 돌려줍니다.
+    저장/만료/LRU/통계는 ResponseCache를 그대로 사용합니다.
+    (수정) 키는 평가 시작 시점에 key()로 한 번 만들어 get()/put()에 넘깁니다.
+    평가가 끝나기 전에 게임이 초기화되어 배치나 사실 데이터가 바뀌어도 평가한 배치의 키로 저장됩니다.
+    """
+    def __init__(self, level: str = None, disk_dir=None, max_entries: int = None, max_disk_entries: int = None, ttl=None):
+        self.level = level or config.EVALUATION_CACHE_LEVEL
+        self._store = ResponseCache(
+            max_entries=max_entries or config.EVALUATION_CACHE_MAX_ENTRIES,
+            ttl=ttl if ttl is not None else config.EVALUATION_CACHE_TTL,
+            disk_dir=disk_dir if disk_dir is not None else config.EVALUATION_CACHE_DIR,
+            max_disk_entries=max_disk_entries or config.EVALUATION_CACHE_MAX_DISK_ENTRIES,
+        )
+
+    def key(self, placed_furniture, door_position, room_width, room_height, request_text, internal_wishlist, design_facts=None) -> str:
+        """(배치 지문, 의뢰서, 위시리스트)로 캐시 키를 만듭니다."""
+        fingerprint = layout_fingerprint(placed_furniture, door_position, room_width, room_height, self.level, design_facts)
+        return ResponseCache.make_key('evaluation', fingerprint, request_text, sorted(internal_wishlist or []))
+
+    def get(self, key: str):
+        """key()로 만든 키에 저장된 평가 결과 dict를 반환합니다 (없으면 None)."""
+        found, result = self._store.get(key)
+        return dict(result) if found else None
+
+    def put(self, key: str, result: dict, cost: float = 0.0):
+        """
+        key()로 만든 키에 평가 결과를 저장합니다. cost는 평가에 걸린 시간(초)입니다.
+        규칙 기반 대체 점수나 오류 응답이 섞인 결과는 저장하지 않습니다.
+        """
+        if result.get('fallback') or any("🚨" in str(result.get(k, "")) for k in ('description', 'feedback')):
+            return
+        stored = {k: result[k] for k in ('score', 'description', 'feedback') if k in result}
+        self._store.put(key, stored, cost)
+
+    def stats(self) -> dict:
+        """히트/미스 카운터와 절약한 시간을 반환합니다."""
+        return self._store.stats()
+
+    def clear(self):
+        self._store.clear()
@@ -0,0 +1,98 @@
+# speculation.py
+import hashlib
+import threading
+import time
+
+import config
+from . import evaluation
+from .pipeline import get_worker_pool
+
+def evaluation_fingerprint(design_facts: str, request_text: str, internal_wishlist: list) -> str:
+    """묘사/평가자 결과를 결정하는 입력(사실 데이터, 의뢰서, 위시리스트)의 지문."""
+    raw = "\x1f".join([design_facts or "", request_text or "", "\x1e".join(internal_wishlist or [])])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+class SpeculativeEvaluator:
+    """
+    (신규) 추측 사전 평가.
+    플레이어가 배치를 멈추고 config.SPECULATIVE_IDLE_SECONDS 동안 아무것도 바꾸지 않으면
+    현재 배치의 묘사(와 설정 시 AI 평가자 점수)를 백그라운드에서 미리 계산합니다.
+    결과는 지문(evaluation_fingerprint)으로 구분되며, 배치가 바뀌면 버려집니다.
+    평가 버튼을 눌렀을 때 지문이 같으면 이미 끝났거나 진행 중인 작업을 그대로 넘겨줍니다.
+    """
+    def __init__(self, model_manager, room_width: int, room_height: int, idle_seconds: float = None, include_judge: bool = None):
+        self.model_manager = model_manager
+        self.room_width = room_width
+        self.room_height = room_height
+        self.idle_seconds = config.SPECULATIVE_IDLE_SECONDS if idle_seconds is None else idle_seconds
+        self.include_judge = config.SPECULATIVE_JUDGE if include_judge is None else include_judge
+
+        self._lock = threading.Lock()
+        self._last_change = time.monotonic()
+        self._fingerprint = None # 현재 작업의 지문 (None이면 작업 없음)
+        self._futures = {}       # 단계 이름 -> Future
+
+        self.started = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def invalidate(self):
+        """배치/고객이 바뀌었을 때 호출합니다. 진행 중인 추측 작업을 버리고 대기 시간을 다시 잽니다."""
+        with self._lock:
+            self._last_change = time.monotonic()
+            self._discard()
+
+    def should_start(self) -> bool:
+        """(매 프레임) 배치가 충분히 오래 그대로였고 아직 작업을 시작하지 않았으면 True."""
+        if not self.model_manager or not self.model_manager.is_ready:
+            return False
+        with self._lock:
+            return self._fingerprint is None and time.monotonic() - self._last_change >= self.idle_seconds
+
+    def start(self, design_facts: str, request_text: str, internal_wishlist: list, placed_furniture: list):
+        """현재 배치의 묘사(와 평가자 점수)를 작업자 풀에서 미리 시작합니다."""
+        fingerprint = evaluation_fingerprint(design_facts, request_text, internal_wishlist)
+        pool = get_worker_pool()
+        placed_snapshot = list(placed_furniture)
+
+        with self._lock:
+            if self._fingerprint is not None:
+                return
+            self._fingerprint = fingerprint
+            self._futures = {
+                "describe": pool.submit(
+                    evaluation.describe_design, self.model_manager, placed_snapshot,
+                    self.room_width, self.room_height, design_facts=design_facts,
+                    request_text=request_text
+                )
+            }
+            if self.include_judge:
+                self._futures["judge"] = pool.submit(
+                    evaluation.judge_design, self.model_manager, request_text, internal_wishlist, design_facts
+                )
+            self.started += 1
+        print(f"🔮 추측 사전 평가 시작 ({', '.join(self._futures)})")
+
+    def take(self, design_facts: str, request_text: str, internal_wishlist: list) -> dict:
+        """
+        지문이 같은 추측 작업이 있으면 {단계 이름: Future}를 넘겨주고, 없으면 빈 dict를 반환합니다.
+        넘겨준 작업은 더 이상 이 객체가 관리하지 않습니다.
+        """
+        fingerprint = evaluation_fingerprint(design_facts, request_text, internal_wishlist)
+        with self._lock:
+            if self._fingerprint != fingerprint:
+                self._discard()
+                return {}
+            futures = self._futures
+            self._fingerprint, self._futures = None, {}
+            self.reused += 1
+        return futures
+
+    def _discard(self):
+        """(lock을 잡은 상태에서 호출) 현재 작업을 버립니다. 아직 시작하지 않은 작업은 취소합니다."""
+        if self._fingerprint is None:
+            return
+        for future in self._futures.values():
+            future.cancel()
+        self._fingerprint, self._futures = None, {}
+        self.discarded += 1
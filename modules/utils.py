@@ -43,8 +43,14 @@ def get_rotated_image(item, rotation):
         rotated_pixel_size = (rotated_size_grid[0] * config.GRID_SIZE, rotated_size_grid[1] * config.GRID_SIZE)
         return pygame.transform.scale(rotated_image, rotated_pixel_size)
 
-def check_collision(new_item, new_pos, new_rot, placed_furniture, door_position):
-    """(수정) 충돌 판정은 '바닥 격자'(높이 1)만 검사합니다."""
+def check_collision(new_item, new_pos, new_rot, placed_furniture, door_position, occupancy=None):
+    """
+    (수정) 충돌 판정은 '바닥 격자'(높이 1)만 검사합니다.
+    (신규) occupancy(OccupancyGrid)가 주어지면 가구 목록을 훑지 않고 격자 슬라이스로 판정합니다.
+    """
+    if occupancy is not None:
+        return occupancy.check_collision(new_item, new_pos, new_rot)
+
     # 가구의 시각적(화면에 표시되는) 크기
     new_size_visual = get_rotated_size(new_item, new_rot)
     new_rect_full = pygame.Rect(new_pos[0], new_pos[1], new_size_visual[0], new_size_visual[1])
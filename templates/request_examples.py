@@ -0,0 +1,37 @@
+# 의뢰서 생성용 예시 (가구 -> 모호한 표현)
+# client.py에서 위시리스트 가구에 맞는 예시만 골라 프롬프트에 넣음
+# 가구 이름은 '작은 소파' -> '소파'처럼 마지막 단어(핵심 명사)로도 찾음
+
+REQUEST_EXAMPLE_BANK = [
+    (("소파",), "편안히 기댈 곳이 필요해요."),
+    (("소파",), "편안한 느낌이 좋아요."),
+    (("소파",), "앉을 곳이 있으면 좋겠어요."),
+    (("스토브",), "집에서 요리하는 것을 좋아합니다."),
+    (("스토브",), "가족이 모여 식사할 수 있는 곳"),
+    (("냉장고",), "부엌이 중요합니다."),
+    (("냉장고",), "사람은 먹어야 하니까요."),
+    (("옷걸이",), "옷을 정리할 수 있는 공간이 필요해요."),
+    (("옷장",), "저는 옷이 많기 때문에 정리 공간이 필요해요."),
+    (("욕조",), "저는 물에 들어가 멍때리는 것을 좋아해요."),
+    (("벽난로",), "따뜻하고 편안해야 해요."),
+    (("식탁",), "가족들이 모여 대화할 수 있는 공간이 필요해요."),
+    (("시계",), "고급적인 장식이 있으면 좋아요."),
+    (("시계",), "나는 시간이 중요한 사람이에요."),
+    (("다리미판",), "저는 패션에 관심이 많아요."),
+    (("다리미판",), "매일 옷 입는 것을 걱정해요."),
+    (("거울",), "저는 패션에 관심이 많아요."),
+    (("거울",), "매일 옷 입는 것을 걱정해요."),
+    (("화분",), "마음을 진정시켜줄 친구가 필요해요."),
+    (("화분",), "저는 평화로운 느낌이 좋아요."),
+    (("선반",), "제 물건이 많아서 이걸 정리해야 해요."),
+    (("선반",), "여러 물건을 올릴 수 있으면 좋겠다."),
+    (("컴퓨터", "책장"), "밤에 조용히 작업할 공간이 필요해요."),
+    (("책장",), "나의 지식을 보관할 장소가 있으면 좋겠어요."),
+    # (신규) 기존 예시가 없던 가구
+    (("테이블",), "찻잔 하나 올려둘 곳이면 충분해요."),
+    (("탁자",), "손 닿는 곳에 작은 물건을 두고 싶어요."),
+    (("침대",), "하루가 끝나면 푹 쓰러질 곳이 필요해요."),
+    (("침대",), "잠만큼은 제대로 자고 싶어요."),
+    (("전등",), "밤에도 은은하게 밝았으면 해요."),
+    (("변기",), "급할 때 멀리 가고 싶지 않아요."),
+]
@@ -0,0 +1,88 @@
+# test_cache.py
+import threading
+import time
+
+from modules import cache as cache_module
+from modules.cache import ResponseCache
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_ttl_expires_memory_and_disk_entries(tmp_path, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    cache = ResponseCache(max_entries=4, ttl=60, disk_dir=str(tmp_path))
+
+    cache.put("a", "값")
+    clock.now += 59
+    assert cache.get("a") == (True, "값")
+
+    # 새 인스턴스(디스크만)에서도 같은 만료 기준
+    reloaded = ResponseCache(max_entries=4, ttl=60, disk_dir=str(tmp_path))
+    assert reloaded.get("a") == (True, "값")
+
+    clock.now += 2
+    assert cache.get("a") == (False, None)
+    assert ResponseCache(max_entries=4, ttl=60, disk_dir=str(tmp_path)).get("a") == (False, None)
+    assert not list(tmp_path.glob("*.json")) # 만료된 파일은 지움
+
+def test_memory_lru_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == (True, 1) # a를 최근 사용으로
+    cache.put("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+
+def test_disk_keeps_at_most_max_disk_entries(tmp_path):
+    cache = ResponseCache(max_entries=8, disk_dir=str(tmp_path), max_disk_entries=3)
+    for i in range(6):
+        cache.put(f"k{i}", i)
+    assert len(list(tmp_path.glob("*.json"))) <= 3
+
+def test_get_or_compute_coalesces_concurrent_calls():
+    cache = ResponseCache(max_entries=4)
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(timeout=5)
+        return "응답"
+
+    results = []
+    workers = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute))) for _ in range(5)]
+    for worker in workers:
+        worker.start()
+    # 리더가 compute에 들어가고 나머지가 합류할 때까지 대기
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for worker in workers:
+        worker.join(timeout=5)
+
+    assert len(calls) == 1
+    assert results == ["응답"] * 5
+    assert cache.stats()["coalesced"] == 4
+
+def test_get_or_compute_does_not_cache_errors():
+    cache = ResponseCache(max_entries=4)
+
+    def fail():
+        raise RuntimeError("백엔드 오류")
+
+    try:
+        cache.get_or_compute("k", fail)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("예외가 전달되지 않음")
+    assert cache.get_or_compute("k", lambda: "복구") == "복구"
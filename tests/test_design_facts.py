@@ -0,0 +1,116 @@
+# test_design_facts.py
+"""DesignFacts.report()가 기존 evaluation._get_design_facts와 같은 텍스트를 만드는지 확인합니다."""
+import random
+
+from modules.design_facts import DesignFacts
+
+ROOM_WIDTH, ROOM_HEIGHT = 10, 8
+NAMES = ["침대", "책상", "의자", "화분", "책장", "전등"]
+
+def baseline_design_facts(placed_furniture: list, room_width: int, room_height: int) -> str:
+    """DesignFacts 도입 전 evaluation._get_design_facts (기준 구현, 그대로 옮김)."""
+    if not placed_furniture:
+        return "방이 완전히 비어 있습니다. 텅 빈 공간입니다."
+
+    item_counts = {}
+    total_base_cells = 0
+    for f in placed_furniture:
+        name = f['item']['name']
+        item_counts[name] = item_counts.get(name, 0) + 1
+        base_size = f['item'].get('base_size', (1, 1))
+        rotation = f.get('rotation', 0)
+        if rotation % 2 == 1:
+            total_base_cells += base_size[1] * base_size[0]
+        else:
+            total_base_cells += base_size[0] * base_size[1]
+
+    item_list_str = ", ".join([f"{count}개의 {name}" for name, count in item_counts.items()])
+    description = f"이 방에는 총 {len(placed_furniture)}개의 가구가 있습니다. (종류: {item_list_str})\n"
+
+    wall_items = []
+    center_items = []
+    entrance_items = []
+    entrance_line = room_height - 2
+    center_x_start, center_x_end = 2, room_width - 2
+    center_y_start, center_y_end = 2, room_height - 2
+
+    for f in placed_furniture:
+        name = f['item']['name']
+        x, y = f['grid_pos']
+        if y >= entrance_line:
+            entrance_items.append(f"{name} ({x},{y})")
+        elif (x < center_x_start or x >= center_x_end or
+              y < center_y_start or y >= center_y_end):
+            wall_items.append(f"{name} ({x},{y})")
+        else:
+            center_items.append(f"{name} ({x},{y})")
+
+    description += "\n[ 공간 배치 분석 ]\n"
+    if not center_items and not wall_items and not entrance_items and placed_furniture:
+        description += "- 모든 가구가 한 곳에 뭉쳐있습니다.\n"
+    if center_items:
+        description += f"- 방의 중앙부에는 {', '.join(center_items)} 등이 배치되어 공간의 중심을 잡고 있습니다.\n"
+    else:
+        description += "- 방의 중앙부는 비어있어 개방감이 느껴집니다.\n"
+    if wall_items:
+        description += f"- 벽가에는 {', '.join(wall_items)} 등이 배치되었습니다.\n"
+    if entrance_items:
+        description += f"- 입구(아래쪽) 근처에는 {', '.join(entrance_items)} 등이 놓여 있습니다.\n"
+
+    total_cells = room_width * room_height
+    density_ratio = total_base_cells / total_cells
+    description += "\n[ 밀도 및 인상 ]\n"
+    if density_ratio == 0:
+        pass
+    elif density_ratio < 0.1:
+        description += "- 전반적으로 방이 매우 넓고 여백이 많아 미니멀한 인상을 줍니다."
+    elif density_ratio > 0.4:
+        description += "- 전반적으로 방이 가구로 빽빽하게 채워져 있어 동선이 복잡해 보입니다."
+    else:
+        description += "- 가구들이 적절한 간격을 두고 균형 있게 배치되어 있습니다."
+    return description
+
+def make_furniture(rng: random.Random) -> dict:
+    base_size = rng.choice([(1, 1), (2, 1), (1, 2), (2, 2), (3, 2)])
+    return {
+        "item": {"name": rng.choice(NAMES), "base_size": base_size},
+        "grid_pos": (rng.randrange(ROOM_WIDTH), rng.randrange(ROOM_HEIGHT)),
+        "rotation": rng.choice([0, 1]),
+    }
+
+def test_empty_room_matches_baseline():
+    facts = DesignFacts(ROOM_WIDTH, ROOM_HEIGHT)
+    assert facts.report() == baseline_design_facts([], ROOM_WIDTH, ROOM_HEIGHT)
+
+def test_report_matches_baseline_over_random_place_and_remove():
+    # main.py처럼 놓을 때는 리스트 끝에 추가, 치울 때는 임의 위치에서 제거
+    for seed in range(50):
+        rng = random.Random(seed)
+        placed_furniture = []
+        facts = DesignFacts(ROOM_WIDTH, ROOM_HEIGHT)
+        for _ in range(40):
+            if placed_furniture and rng.random() < 0.4:
+                f = rng.choice(placed_furniture)
+                placed_furniture.remove(f)
+                facts.remove(f)
+            else:
+                f = make_furniture(rng)
+                placed_furniture.append(f)
+                facts.add(f)
+            assert facts.report() == baseline_design_facts(placed_furniture, ROOM_WIDTH, ROOM_HEIGHT)
+
+def test_kind_order_follows_earliest_remaining_piece():
+    # 의자가 먼저 놓였지만 첫 의자가 치워지면, 남은 가구 기준으로 침대가 먼저 옵니다
+    chair_1 = {"item": {"name": "의자"}, "grid_pos": (0, 0)}
+    bed = {"item": {"name": "침대"}, "grid_pos": (4, 4)}
+    chair_2 = {"item": {"name": "의자"}, "grid_pos": (9, 0)}
+    facts = DesignFacts.from_layout([chair_1, bed, chair_2], ROOM_WIDTH, ROOM_HEIGHT)
+    facts.remove(chair_1)
+
+    assert facts.kind_order() == ["침대", "의자"]
+    assert facts.report() == baseline_design_facts([bed, chair_2], ROOM_WIDTH, ROOM_HEIGHT)
+
+def test_from_layout_matches_baseline():
+    rng = random.Random(7)
+    layout = [make_furniture(rng) for _ in range(12)]
+    assert DesignFacts.from_layout(layout, ROOM_WIDTH, ROOM_HEIGHT).report() == baseline_design_facts(layout, ROOM_WIDTH, ROOM_HEIGHT)
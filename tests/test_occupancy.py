@@ -0,0 +1,106 @@
+# test_occupancy.py
+"""OccupancyGrid가 기존 utils.check_collision / 우클릭 가구 찾기(pygame.Rect 기반)와 같은 결과를 내는지 확인합니다."""
+import random
+
+from modules.occupancy import OccupancyGrid
+
+ROOM_WIDTH, ROOM_HEIGHT = 10, 8
+SIZES = [(1, 1), (2, 1), (1, 2), (2, 2), (3, 2), (2, 3)]
+
+def rects_collide(a, b) -> bool:
+    """pygame.Rect.colliderect와 같은 판정 (x, y, w, h), 넓이가 0인 사각형은 겹치지 않음."""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    if aw <= 0 or ah <= 0 or bw <= 0 or bh <= 0:
+        return False
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+def rect_contains(rect, point) -> bool:
+    """pygame.Rect.collidepoint와 같은 판정."""
+    x, y, w, h = rect
+    return x <= point[0] < x + w and y <= point[1] < y + h
+
+def rotated_size(item, rotation):
+    size = item['size']
+    return (size[1], size[0]) if rotation % 2 == 1 else size
+
+def baseline_check_collision(new_item, new_pos, new_rot, placed_furniture, door_position) -> bool:
+    """OccupancyGrid 도입 전 utils.check_collision (pygame.Rect 대신 위 헬퍼 사용)."""
+    width, height = rotated_size(new_item, new_rot)
+    full = (new_pos[0], new_pos[1], width, height)
+    if new_pos[0] < 0 or new_pos[1] < 0 or new_pos[0] + width > ROOM_WIDTH or new_pos[1] + height > ROOM_HEIGHT:
+        return True
+
+    base = (new_pos[0], new_pos[1], width, 1)
+    for f in placed_furniture:
+        f_width, _ = rotated_size(f['item'], f['rotation'])
+        if rects_collide(base, (f['grid_pos'][0], f['grid_pos'][1], f_width, 1)):
+            return True
+
+    if door_position:
+        if rects_collide(full, (door_position[0], door_position[1], 1, 1)):
+            return True
+    return False
+
+def baseline_piece_at(placed_furniture, grid_x, grid_y):
+    """OccupancyGrid 도입 전 main.py의 우클릭 가구 찾기."""
+    for f in sorted(placed_furniture, key=lambda f: (f['grid_pos'][1], f['grid_pos'][0]), reverse=True):
+        f_width, _ = rotated_size(f['item'], f['rotation'])
+        if rect_contains((f['grid_pos'][0], f['grid_pos'][1], f_width, 1), (grid_x, grid_y)):
+            return f
+    return None
+
+def random_room(rng: random.Random):
+    """main.py처럼 충돌하지 않는 자리에만 놓고, 가끔 치우면서 배치를 만듭니다."""
+    door_position = (rng.randrange(ROOM_WIDTH), ROOM_HEIGHT - 1)
+    grid = OccupancyGrid(ROOM_WIDTH, ROOM_HEIGHT)
+    grid.set_door(door_position)
+    placed_furniture = []
+    for _ in range(60):
+        if placed_furniture and rng.random() < 0.2:
+            f = rng.choice(placed_furniture)
+            placed_furniture.remove(f)
+            grid.remove(f)
+            continue
+        item = {"name": "가구", "size": rng.choice(SIZES)}
+        pos = (rng.randrange(ROOM_WIDTH), rng.randrange(ROOM_HEIGHT))
+        rotation = rng.choice([0, 1])
+        if not baseline_check_collision(item, pos, rotation, placed_furniture, door_position):
+            f = {"item": item, "grid_pos": pos, "rotation": rotation}
+            placed_furniture.append(f)
+            grid.add(f)
+    return grid, placed_furniture, door_position
+
+def test_check_collision_matches_baseline():
+    for seed in range(30):
+        rng = random.Random(seed)
+        grid, placed_furniture, door_position = random_room(rng)
+        for size in SIZES:
+            item = {"name": "새 가구", "size": size}
+            for rotation in (0, 1):
+                for x in range(-1, ROOM_WIDTH + 1):
+                    for y in range(-1, ROOM_HEIGHT + 1):
+                        expected = baseline_check_collision(item, (x, y), rotation, placed_furniture, door_position)
+                        assert grid.check_collision(item, (x, y), rotation) == expected, (seed, size, rotation, x, y)
+
+def test_piece_at_matches_baseline_hit_test():
+    for seed in range(30):
+        rng = random.Random(seed)
+        grid, placed_furniture, _ = random_room(rng)
+        for x in range(-1, ROOM_WIDTH + 1):
+            for y in range(-1, ROOM_HEIGHT + 1):
+                assert grid.piece_at(x, y) is baseline_piece_at(placed_furniture, x, y), (seed, x, y)
+
+def test_door_move_and_clear():
+    grid = OccupancyGrid(ROOM_WIDTH, ROOM_HEIGHT)
+    item = {"name": "의자", "size": (1, 1)}
+    grid.set_door((3, 7))
+    assert grid.check_collision(item, (3, 7), 0)
+    grid.set_door((5, 7))
+    assert not grid.check_collision(item, (3, 7), 0)
+
+    f = {"item": item, "grid_pos": (3, 7), "rotation": 0}
+    grid.add(f)
+    grid.clear()
+    assert grid.piece_at(3, 7) is None
+    assert grid.check_collision(item, (5, 7), 0) # 문은 초기화 후에도 유지
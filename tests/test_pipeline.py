@@ -0,0 +1,67 @@
+# test_pipeline.py
+import threading
+
+import pytest
+
+from modules.pipeline import StageGraph
+
+def build_graph(log: list, started: dict):
+    """facts -> (describe, judge) -> score 모양의 그래프. 각 단계는 시작 / 끝을 log에 남깁니다."""
+    lock = threading.Lock()
+
+    def stage(name, value):
+        def fn(**deps):
+            with lock:
+                log.append(("start", name, sorted(deps)))
+            started[name].set()
+            if name == "describe":
+                # judge와 동시에 실행되는지 확인 (직렬이면 judge가 아직 시작 전)
+                started["judge"].wait(timeout=0.5)
+            with lock:
+                log.append(("end", name))
+            return value + sum(deps.values())
+        return fn
+
+    graph = StageGraph()
+    graph.add("facts", stage("facts", 1))
+    graph.add("describe", stage("describe", 10), deps=["facts"])
+    graph.add("judge", stage("judge", 100), deps=["facts"])
+    graph.add("score", stage("score", 1000), deps=["describe", "judge"])
+    return graph
+
+@pytest.mark.parametrize("serial", [False, True])
+def test_stages_run_after_their_dependencies(serial):
+    log = []
+    started = {name: threading.Event() for name in ("facts", "describe", "judge", "score")}
+    results = build_graph(log, started).run(serial=serial)
+
+    assert results == {"facts": 1, "describe": 11, "judge": 101, "score": 1112}
+    position = {(event[0], event[1]): i for i, event in enumerate(log)}
+    for name, deps in {"describe": ["facts"], "judge": ["facts"], "score": ["describe", "judge"]}.items():
+        for dep in deps:
+            assert position[("end", dep)] < position[("start", name)]
+    assert ("start", "score", ["describe", "judge"]) in log
+
+def test_independent_stages_overlap():
+    log = []
+    started = {name: threading.Event() for name in ("facts", "describe", "judge", "score")}
+    build_graph(log, started).run()
+
+    position = {(event[0], event[1]): i for i, event in enumerate(log)}
+    assert position[("start", "judge")] < position[("end", "describe")]
+
+def test_failed_stage_skips_dependents_and_reraises():
+    ran = []
+    graph = StageGraph()
+    graph.add("facts", lambda: 1)
+    graph.add("judge", lambda facts: (_ for _ in ()).throw(ValueError("평가 실패")), deps=["facts"])
+    graph.add("rule_score", lambda: ran.append("rule_score") or 2)
+    graph.add("score", lambda judge: ran.append("score"), deps=["judge"])
+
+    with pytest.raises(ValueError):
+        graph.run()
+    assert ran == ["rule_score"]
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError):
+        StageGraph().add("score", lambda judge: judge, deps=["judge"])
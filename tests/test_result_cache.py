@@ -0,0 +1,45 @@
+# test_result_cache.py
+from modules.design_facts import DesignFacts
+from modules.result_cache import LEVEL_EXACT, LEVEL_FACTS, EvaluationResultCache, layout_fingerprint
+
+ROOM_WIDTH, ROOM_HEIGHT = 10, 8
+DOOR = (4, 8)
+
+def furniture(name, x, y, rotation=0):
+    return {"item": {"name": name, "base_size": (2, 1)}, "grid_pos": (x, y), "rotation": rotation}
+
+def test_facts_level_merges_rotation_and_placement_order_only():
+    a = [furniture("침대", 0, 0), furniture("의자", 4, 4)]
+    b = [furniture("의자", 4, 4, rotation=1), furniture("침대", 0, 0)]
+    moved = [furniture("침대", 0, 1), furniture("의자", 4, 4)]
+
+    def fingerprint(layout, level):
+        return layout_fingerprint(layout, DOOR, ROOM_WIDTH, ROOM_HEIGHT, level)
+
+    assert fingerprint(a, LEVEL_FACTS) == fingerprint(b, LEVEL_FACTS)
+    assert fingerprint(a, LEVEL_EXACT) != fingerprint(b, LEVEL_EXACT)
+    assert fingerprint(a, LEVEL_FACTS) != fingerprint(moved, LEVEL_FACTS)
+
+def test_key_taken_up_front_survives_reset(tmp_path):
+    cache = EvaluationResultCache(level=LEVEL_FACTS, disk_dir=str(tmp_path))
+    placed_furniture = [furniture("침대", 0, 0)]
+    facts = DesignFacts.from_layout(placed_furniture, ROOM_WIDTH, ROOM_HEIGHT)
+    key = cache.key(placed_furniture, DOOR, ROOM_WIDTH, ROOM_HEIGHT, "의뢰서", ["침대"], design_facts=facts)
+
+    # 평가가 끝나기 전에 게임이 초기화됨
+    placed_furniture.clear()
+    facts.clear()
+    cache.put(key, {"score": 4.0, "description": "묘사", "feedback": "좋아요"})
+
+    again = [furniture("침대", 0, 0)]
+    assert cache.get(cache.key(again, DOOR, ROOM_WIDTH, ROOM_HEIGHT, "의뢰서", ["침대"])) == {
+        "score": 4.0, "description": "묘사", "feedback": "좋아요"
+    }
+    empty_key = cache.key([], DOOR, ROOM_WIDTH, ROOM_HEIGHT, "의뢰서", ["침대"], design_facts=facts)
+    assert cache.get(empty_key) is None
+
+def test_fallback_results_are_not_stored(tmp_path):
+    cache = EvaluationResultCache(disk_dir=str(tmp_path))
+    key = cache.key([furniture("침대", 0, 0)], DOOR, ROOM_WIDTH, ROOM_HEIGHT, "의뢰서", [])
+    cache.put(key, {"score": 2.0, "description": "묘사", "feedback": "", "fallback": True})
+    assert cache.get(key) is None